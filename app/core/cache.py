@@ -0,0 +1,132 @@
+"""Cachés en memoria del proceso para datos calientes de autenticación."""
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+from uuid import UUID
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "1024"))
+REVOKED_JTI_CACHE_MAX_SIZE = int(os.getenv("REVOKED_JTI_CACHE_MAX_SIZE", "100000"))
+
+
+class TTLCache:
+    """LRU acotado con expiración por entrada y contadores de aciertos/fallos.
+
+    Es seguro entre hilos: los handlers síncronos de FastAPI se ejecutan en un
+    threadpool y comparten la misma instancia.
+    """
+
+    def __init__(
+        self, max_size: int, ttl_seconds: float, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class PrincipalCache:
+    """Caché de usuarios autenticados indexada por ``(user_id, versión)``.
+
+    Cada usuario tiene una versión local que se incrementa al invalidarlo, de
+    modo que una lectura concurrente iniciada antes de la invalidación nunca
+    puede volver a publicar datos obsoletos bajo la clave vigente. La caché es
+    local a cada worker: en despliegues con varios procesos el TTL acota la
+    ventana en la que otro worker puede servir datos desactualizados.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._entries = TTLCache(max_size, ttl_seconds)
+        self._versions: dict[UUID, int] = {}
+        self._lock = Lock()
+
+    def version(self, user_id: UUID) -> int:
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def get(self, user_id: UUID) -> Optional[dict[str, Any]]:
+        return self._entries.get((user_id, self.version(user_id)))
+
+    def set(self, user_id: UUID, data: dict[str, Any], version: int) -> None:
+        self._entries.set((user_id, version), data)
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            version = self._versions.get(user_id, 0)
+            self._versions[user_id] = version + 1
+        self._entries.pop((user_id, version))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._entries.stats()
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_MAX_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
+# jti de refresh tokens revocados recientemente en este proceso. Permite
+# rechazar reintentos de un token ya rotado sin consultar la base de datos;
+# la fuente de verdad sigue siendo la columna ``refresh_tokens.revoked``.
+revoked_jti_cache = TTLCache(REVOKED_JTI_CACHE_MAX_SIZE, ttl_seconds=0)
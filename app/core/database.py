@@ -1,13 +1,32 @@
 # app/core/database.py
 
+import logging
 import os
-from typing import Generator
+import random
+import re
+import sys
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+from threading import Lock
+from typing import Any, Generator, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
 
+from app.utils.metrics import LatencyHistogram
+
+try:  # las sesiones asíncronas ejecutan el SQL en un greenlet hijo
+    from greenlet import getcurrent as _current_greenlet
+except ImportError:  # pragma: no cover - greenlet es opcional en algunas plataformas
+    _current_greenlet = None
+
 load_dotenv()
 
 DB_HOST = os.getenv("DB_HOST")
@@ -23,10 +42,377 @@ if not DATABASE_URL:
     else:
         DATABASE_URL = "sqlite:///./app.db"
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+
+def async_database_url(url: str) -> str:
+    """Traduce la URL síncrona al driver asíncrono equivalente."""
+
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+psycopg://" + url[len("postgresql://"):]
+    # ``postgresql+psycopg`` (psycopg 3) ya soporta modo asíncrono.
+    return url
+
+
+# Con DB_ASYNC activo los routers de timesheets, reportes y auth atienden las
+# peticiones con ``AsyncSession`` en lugar de ocupar un hilo del threadpool.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in {"1", "true", "yes"}
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+# Réplicas de lectura (URLs separadas por comas) y su política de uso.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "10"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in {"1", "true", "yes"}
+
+# psycopg 3 prepara en el servidor las sentencias ejecutadas este número de
+# veces por conexión. "none" lo desactiva (necesario tras PgBouncer en modo
+# transacción, donde las sentencias preparadas no sobreviven entre peticiones).
+_prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower()
+DB_PREPARE_THRESHOLD: Optional[int] = None if _prepare_threshold in {"", "none", "off"} else int(_prepare_threshold)
+
+# Sentencias más lentas que este umbral se registran en el logger
+# ``app.sql.slow`` ("0"/"off" lo desactiva). En Postgres, una muestra de ellas
+# (solo SELECT) se reejecuta con ``EXPLAIN (ANALYZE, BUFFERS)`` y el plan se
+# guarda en un fichero rotativo, como mucho una vez por sentencia y cooldown.
+_slow_query_ms = os.getenv("DB_SLOW_QUERY_MS", "500").strip().lower()
+DB_SLOW_QUERY_MS: Optional[float] = None if _slow_query_ms in {"", "0", "none", "off"} else float(_slow_query_ms)
+DB_SLOW_QUERY_EXPLAIN = os.getenv("DB_SLOW_QUERY_EXPLAIN", "false").lower() in {"1", "true", "yes"}
+DB_SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("DB_SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+DB_SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS = float(os.getenv("DB_SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS", "600"))
+DB_SLOW_QUERY_EXPLAIN_FILE = os.getenv("DB_SLOW_QUERY_EXPLAIN_FILE", "logs/slow_query_plans.log")
+DB_SLOW_QUERY_EXPLAIN_MAX_BYTES = int(os.getenv("DB_SLOW_QUERY_EXPLAIN_MAX_BYTES", str(10 * 1024 * 1024)))
+DB_SLOW_QUERY_EXPLAIN_BACKUPS = int(os.getenv("DB_SLOW_QUERY_EXPLAIN_BACKUPS", "5"))
+
+
+class PoolMonitor:
+    """Contadores del pool de conexiones alimentados por eventos de SQLAlchemy."""
+
+    def __init__(self) -> None:
+        self.acquire_wait = LatencyHistogram()
+        self._lock = Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, target: Engine) -> None:
+        event.listen(target, "connect", lambda *args: self._increment("connects"))
+        event.listen(target, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(target, "invalidate", lambda *args: self._increment("invalidations"))
+
+    def stats(self, target: Engine) -> dict[str, Any]:
+        pool = target.pool
+        with self._lock:
+            counters = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+            }
+        if isinstance(pool, QueuePool):
+            counters.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=DB_MAX_OVERFLOW,
+                timeout_seconds=DB_POOL_TIMEOUT,
+            )
+        return {"pool": type(pool).__name__, **counters, "acquire_wait": self.acquire_wait.snapshot()}
+
+
+pool_monitor = PoolMonitor()
+
+
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_CALLER_PACKAGES = ("app.crud", "app.services", "app.routers")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL en una línea y con las listas ``IN (?, ?, ...)`` colapsadas a ``(?...)``."""
+
+    return _PLACEHOLDER_LIST.sub("(?...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def parameter_shapes(parameters: Any, executemany: bool = False) -> Any:
+    """Tipos de los parámetros ligados, nunca sus valores (pueden contener datos personales)."""
+
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shapes(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def calling_function() -> Optional[str]:
+    """Primera función de ``app.crud`` (o services/routers) en la pila que ejecutó la sentencia.
+
+    ``AsyncSession`` ejecuta el SQL en un greenlet cuyo marco inicial no enlaza
+    con el del llamador, así que se continúa por la pila del greenlet padre.
+    """
+
+    frame = sys._getframe(1)
+    greenlet = _current_greenlet() if _current_greenlet else None
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_CALLER_PACKAGES):
+            caller = f"{module}.{frame.f_code.co_name}"
+            if module.startswith("app.crud"):
+                return caller
+            fallback = fallback or caller
+        frame = frame.f_back
+        if frame is None and greenlet is not None:
+            greenlet = greenlet.parent
+            frame = greenlet.gr_frame if greenlet is not None else None
+    return fallback
+
+
+class SlowQueryLog:
+    """Registro de sentencias lentas con captura opcional de su plan en Postgres."""
+
+    def __init__(
+        self,
+        threshold_ms: Optional[float] = DB_SLOW_QUERY_MS,
+        *,
+        explain: bool = DB_SLOW_QUERY_EXPLAIN,
+        sample_rate: float = DB_SLOW_QUERY_EXPLAIN_SAMPLE,
+        cooldown_seconds: float = DB_SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS,
+        plan_file: str = DB_SLOW_QUERY_EXPLAIN_FILE,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.sample_rate = sample_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.plan_file = plan_file
+        self.logger = logging.getLogger("app.sql.slow")
+        self._plan_logger: Optional[logging.Logger] = None
+        self._explained_at: dict[str, float] = {}
+        self._lock = Lock()
+        self.slow = 0
+        self.explained = 0
+        self.explain_errors = 0
+        self._callers: Counter[str] = Counter()
+
+    def attach(self, target: Engine) -> None:
+        if self.threshold_ms is None:
+            return
+        event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(target, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context) -> None:
+        # Una sentencia que falla no llega a ``after_cursor_execute``: se descarta su
+        # inicio para no emparejar las siguientes de la conexión con el equivocado.
+        conn = exception_context.connection
+        starts = conn.info.get("slow_query_start") if conn is not None else None
+        if starts:
+            starts.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        if self.threshold_ms is None or elapsed_ms < self.threshold_ms:
+            return
+        self.record(conn, cursor, statement, parameters, executemany, elapsed_ms)
+
+    def record(self, conn, cursor, statement: str, parameters: Any, executemany: bool, elapsed_ms: float) -> None:
+        normalized = normalize_sql(statement)
+        caller = calling_function() or "?"
+        with self._lock:
+            self.slow += 1
+            self._callers[caller] += 1
+        fields = {
+            "duration_ms": round(elapsed_ms, 2),
+            "caller": caller,
+            "statement": normalized,
+            "parameters": parameter_shapes(parameters, executemany),
+        }
+        self.logger.warning(
+            "slow query %.1f ms caller=%s sql=%s", elapsed_ms, caller, normalized, extra={"slow_query": fields}
+        )
+        if self._should_explain(conn, normalized, executemany):
+            self._explain(cursor, statement, parameters, fields)
+
+    def _should_explain(self, conn, normalized: str, executemany: bool) -> bool:
+        if not self.explain or executemany or conn.dialect.name != "postgresql":
+            return False
+        # ANALYZE ejecuta la sentencia de nuevo: solo lecturas.
+        head = normalized.lstrip("( ").split(" ", 1)[0].upper()
+        if head not in {"SELECT", "WITH"} or re.search(r"\b(INSERT|UPDATE|DELETE)\b", normalized, re.I):
+            return False
+        if random.random() >= self.sample_rate:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained_at.get(normalized, float("-inf")) < self.cooldown_seconds:
+                return False
+            self._explained_at[normalized] = now
+        return True
+
+    def _explain(self, cursor, statement: str, parameters: Any, fields: dict[str, Any]) -> None:
+        # Cursor DBAPI de la misma conexión y transacción: no dispara eventos del engine.
+        # El SAVEPOINT aísla el fallo (p. ej. ``statement_timeout`` al repetir la
+        # sentencia) para que no deje abortada la transacción de la petición.
+        try:
+            explain_cursor = cursor.connection.cursor()
+            try:
+                explain_cursor.execute("SAVEPOINT slow_query_explain")
+                try:
+                    explain_cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+                    plan = "\n".join(str(row[0]) for row in explain_cursor.fetchall())
+                except Exception:
+                    explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                    raise
+                finally:
+                    explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            finally:
+                explain_cursor.close()
+        except Exception:  # noqa: BLE001 - capturar el plan nunca debe romper la petición
+            with self._lock:
+                self.explain_errors += 1
+            self.logger.debug("no se pudo capturar el plan de la sentencia lenta", exc_info=True)
+            return
+        with self._lock:
+            self.explained += 1
+        self._plans().info(
+            "%s | %.1f ms | %s\n%s\n%s\n",
+            time.strftime("%Y-%m-%dT%H:%M:%S"),
+            fields["duration_ms"],
+            fields["caller"],
+            fields["statement"],
+            plan,
+        )
+
+    def _plans(self) -> logging.Logger:
+        with self._lock:
+            if self._plan_logger is None:
+                directory = os.path.dirname(self.plan_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                handler = RotatingFileHandler(
+                    self.plan_file,
+                    maxBytes=DB_SLOW_QUERY_EXPLAIN_MAX_BYTES,
+                    backupCount=DB_SLOW_QUERY_EXPLAIN_BACKUPS,
+                    encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                plan_logger = logging.getLogger("app.sql.slow.plans")
+                plan_logger.addHandler(handler)
+                plan_logger.setLevel(logging.INFO)
+                plan_logger.propagate = False
+                self._plan_logger = plan_logger
+            return self._plan_logger
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "explain": self.explain,
+                "slow": self.slow,
+                "explained": self.explained,
+                "explain_errors": self.explain_errors,
+                "top_callers": dict(self._callers.most_common(10)),
+            }
+
+
+slow_query_log = SlowQueryLog()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` que mide cuánto espera cada petición para obtener conexión."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_monitor._increment("timeouts")
+            raise
+        finally:
+            pool_monitor.acquire_wait.observe(time.perf_counter() - started)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Variante de ``InstrumentedQueuePool`` para el engine asíncrono."""
+
+
+def engine_options(url: str = DATABASE_URL, *, pooled: bool = True, asynchronous: bool = False) -> dict[str, Any]:
+    """Argumentos de ``create_engine`` compartidos por la app y Alembic.
+
+    Con ``pooled=False`` (migraciones) se omiten los límites del pool, que el
+    llamador sustituye por ``NullPool``. ``asynchronous`` selecciona la clase
+    de pool compatible con ``create_async_engine``. Con psycopg 3 se fija el
+    umbral de sentencias preparadas (``DB_PREPARE_THRESHOLD``).
+    """
+
+    connect_args: dict[str, Any] = {}
+    if url.startswith("sqlite"):
+        connect_args["check_same_thread"] = False
+    elif url.startswith("postgresql+psycopg://"):
+        connect_args["prepare_threshold"] = DB_PREPARE_THRESHOLD
+
+    options: dict[str, Any] = {"connect_args": connect_args, "pool_pre_ping": DB_POOL_PRE_PING}
+    if pooled and not url.startswith("sqlite"):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
 
 # Único engine/sesión centralizado para toda la app.
-engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
+engine = create_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL))
+pool_monitor.attach(engine)
+slow_query_log.attach(engine)
+
+_async_engine: Optional[AsyncEngine] = None
+_async_engine_lock = Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """Engine asíncrono, creado al primer uso para no exigir el driver si no se usa."""
+
+    global _async_engine
+    with _async_engine_lock:
+        if _async_engine is None:
+            _async_engine = create_async_engine(
+                ASYNC_DATABASE_URL, echo=False, **engine_options(ASYNC_DATABASE_URL, asynchronous=True)
+            )
+            pool_monitor.attach(_async_engine.sync_engine)
+            slow_query_log.attach(_async_engine.sync_engine)
+        return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    with _async_engine_lock:
+        async_engine, _async_engine = _async_engine, None
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 def init_db() -> None:
@@ -1,12 +1,54 @@
 """Dependencias comunes de la aplicación."""
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from fastapi import Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.database import engine
+from app.core import replicas, unit_of_work
+from app.core.database import engine, get_async_engine
+from app.core.unit_of_work import DB_UNIT_OF_WORK
 
 
 def get_session() -> Generator[Session, None, None]:
-    """Sesión de base de datos para inyección de dependencias."""
+    """Sesión de base de datos para inyección de dependencias.
+
+    Con ``DB_UNIT_OF_WORK`` los CRUD solo hacen flush y aquí se confirma una
+    única vez, después del endpoint y antes de enviar la respuesta.
+    """
     with Session(engine) as session:
+        if DB_UNIT_OF_WORK:
+            unit_of_work.begin(session)
+        yield session
+        unit_of_work.complete(session)
+
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """Sesión de solo lectura, servida por una réplica cuando es posible."""
+    prefer_primary = getattr(request.state, "prefer_primary", False)
+    with replicas.ReadOnlySession(replicas.replica_router.choose(prefer_primary=prefer_primary)) as session:
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Sesión asíncrona para los routers que se ejecutan con ``DB_ASYNC``.
+
+    ``expire_on_commit=False`` evita que leer un atributo tras un commit
+    dispare una recarga implícita, que fuera de ``run_sync`` no es posible.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        if DB_UNIT_OF_WORK:
+            unit_of_work.begin(session.sync_session)
+        yield session
+        await unit_of_work.complete_async(session)
+
+
+async def get_async_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Equivalente asíncrono de ``get_read_session``."""
+    prefer_primary = getattr(request.state, "prefer_primary", False)
+    async with AsyncSession(
+        replicas.replica_router.choose_async(prefer_primary=prefer_primary),
+        sync_session_class=replicas.ReadOnlySession,
+        expire_on_commit=False,
+    ) as session:
         yield session
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import FastAPI, Request, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -39,6 +40,21 @@ class AuthorizationException(BusinessRuleException):
         super().__init__(message, status_code=status_code, details=details)
 
 
+class ServiceUnavailableException(BusinessRuleException):
+    """Excepción para recursos internos saturados; el cliente puede reintentar."""
+
+    def __init__(self, message: str, *, details: Any | None = None) -> None:
+        super().__init__(message, status_code=status.HTTP_503_SERVICE_UNAVAILABLE, details=details)
+
+
+class TooManyRequestsException(BusinessRuleException):
+    """Excepción para clientes que superan un límite de frecuencia."""
+
+    def __init__(self, message: str, *, retry_after: int, details: Any | None = None) -> None:
+        super().__init__(message, status_code=status.HTTP_429_TOO_MANY_REQUESTS, details=details)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
 # Helpers
 
 
@@ -64,6 +80,7 @@ async def business_rule_exception_handler(request: Request, exc: BusinessRuleExc
     return JSONResponse(
         status_code=exc.status_code,
         content=_format_error_response(request, exc.status_code, exc.message, exc.details),
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -95,7 +112,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             request,
             status.HTTP_422_UNPROCESSABLE_ENTITY,
             "Input inválido",
-            details=exc.errors(),
+            # ``ctx`` puede incluir la excepción de un validador: se codifica como JSON.
+            details=jsonable_encoder(exc.errors()),
         ),
     )
 
@@ -119,6 +137,8 @@ def register_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(BusinessRuleException, business_rule_exception_handler)
     app.add_exception_handler(NotFoundException, business_rule_exception_handler)
     app.add_exception_handler(AuthorizationException, business_rule_exception_handler)
+    app.add_exception_handler(ServiceUnavailableException, business_rule_exception_handler)
+    app.add_exception_handler(TooManyRequestsException, business_rule_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(Exception, unexpected_exception_handler)
@@ -0,0 +1,223 @@
+"""Hashing de contraseñas PBKDF2 ejecutado en un pool de workers acotado.
+
+El cálculo de PBKDF2 es deliberadamente costoso; ejecutarlo dentro del worker
+que atiende la petición permite que una ráfaga de logins deje sin CPU al
+resto de endpoints. Aquí se delega a un executor dedicado con una cola de
+espera limitada: cuando está saturado se responde 503 de inmediato en lugar
+de acumular peticiones.
+
+Formato de hash almacenado: ``pbkdf2_sha256$<iteraciones>$<salt>$<digest>``.
+Los hashes heredados ``<salt>$<digest>`` se siguen aceptando con el coste
+original (100.000 iteraciones) y se regeneran en el siguiente login exitoso.
+El coste se ajusta por entorno con ``PASSWORD_HASH_ITERATIONS``; para
+calibrarlo en el hardware de despliegue::
+
+    python -m app.core.hashing --target-ms 250
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.errors import ServiceUnavailableException
+from app.utils.metrics import LatencyHistogram
+
+T = TypeVar("T")
+
+HASH_ALGORITHM = "pbkdf2_sha256"
+LEGACY_ITERATIONS = 100_000
+MIN_ITERATIONS = 1_000
+
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", str(LEGACY_ITERATIONS)))
+
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _parse_hash(hashed_password: str) -> Optional[tuple[str, int, str, str]]:
+    parts = hashed_password.split("$")
+    if len(parts) == 2:
+        salt, digest = parts
+        return HASH_ALGORITHM, LEGACY_ITERATIONS, salt, digest
+    if len(parts) == 4 and parts[0] == HASH_ALGORITHM:
+        algorithm, iterations, salt, digest = parts
+        try:
+            return algorithm, int(iterations), salt, digest
+        except ValueError:
+            return None
+    return None
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return _b64encode(hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations))
+
+
+def hash_password(password: str, iterations: Optional[int] = None) -> str:
+    cost = iterations or PASSWORD_HASH_ITERATIONS
+    salt = secrets.token_hex(16)
+    return f"{HASH_ALGORITHM}${cost}${salt}${_pbkdf2(password, salt, cost)}"
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    parsed = _parse_hash(hashed_password)
+    if parsed is None:
+        return False
+
+    _, iterations, salt, stored_hash = parsed
+    return hmac.compare_digest(_pbkdf2(plain_password, salt, iterations), stored_hash)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indica si el hash usa un formato heredado o un coste distinto al configurado."""
+
+    parsed = _parse_hash(hashed_password)
+    if parsed is None or not hashed_password.startswith(f"{HASH_ALGORITHM}$"):
+        return True
+    return parsed[1] != PASSWORD_HASH_ITERATIONS
+
+
+def calibrate_iterations(target_seconds: float, *, sample_iterations: int = 20_000) -> int:
+    """Estima las iteraciones necesarias para que una verificación tarde ``target_seconds``."""
+
+    salt = secrets.token_hex(16)
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        _pbkdf2("calibration-password", salt, sample_iterations)
+        timings.append(time.perf_counter() - started)
+
+    median = sorted(timings)[len(timings) // 2]
+    estimated = int(sample_iterations * target_seconds / max(median, 1e-9))
+    return max(MIN_ITERATIONS, round(estimated, -3))
+
+
+class HashingPool:
+    """Executor acotado para operaciones de hashing de contraseñas.
+
+    ``kind`` puede ser ``"thread"`` (por defecto; ``hashlib`` libera el GIL
+    durante PBKDF2) o ``"process"``. Con ``workers=0`` las operaciones se
+    ejecutan en línea, útil en tests. El límite de admisión es
+    ``workers + max_queue`` operaciones simultáneas entre ejecución y espera.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int) -> None:
+        if kind not in {"thread", "process"}:
+            raise ValueError(f"Tipo de executor no soportado: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._slots = BoundedSemaphore(max(1, workers + max_queue))
+        self._executor: Optional[Executor] = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.latency: dict[str, LatencyHistogram] = {}
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    def _histogram(self, operation: str) -> LatencyHistogram:
+        with self._lock:
+            return self.latency.setdefault(operation, LatencyHistogram())
+
+    def _admit(self, operation: str) -> float:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ServiceUnavailableException(
+                "El servicio de autenticación está saturado, reintenta en unos segundos",
+                details={"operation": operation},
+            )
+
+        with self._lock:
+            self._in_flight += 1
+        return time.perf_counter()
+
+    def _release(self, operation: str, started: float) -> None:
+        self._histogram(operation).observe(time.perf_counter() - started)
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        started = self._admit(operation)
+        try:
+            if self.workers <= 0:
+                return func(*args)
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            self._release(operation, started)
+
+    async def run_async(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        """Como ``run`` pero esperando el resultado sin bloquear el event loop."""
+
+        started = self._admit(operation)
+        try:
+            if self.workers <= 0:
+                return func(*args)
+            return await asyncio.wrap_future(self._get_executor().submit(func, *args))
+        finally:
+            self._release(operation, started)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            operations = dict(self.latency)
+            in_flight = self._in_flight
+            rejected = self.rejected
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "rejected": rejected,
+            "latency": {name: histogram.snapshot() for name, histogram in operations.items()},
+        }
+
+
+hashing_pool = HashingPool(PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Calibra PASSWORD_HASH_ITERATIONS para este hardware.")
+    parser.add_argument(
+        "--target-ms", type=float, default=250.0, help="Latencia objetivo de una verificación en milisegundos"
+    )
+    args = parser.parse_args(argv)
+
+    iterations = calibrate_iterations(args.target_ms / 1000)
+    started = time.perf_counter()
+    check_password("calibration-password", hash_password("calibration-password", iterations))
+    elapsed_ms = (time.perf_counter() - started) * 1000 / 2
+    print(f"PASSWORD_HASH_ITERATIONS={iterations}  # ~{elapsed_ms:.0f} ms por operación")
+
+
+if __name__ == "__main__":
+    main()
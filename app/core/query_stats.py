@@ -0,0 +1,199 @@
+"""Contador de sentencias SQL por petición y detector de N+1.
+
+Un listener sobre ``Engine`` (todas las instancias: primario, réplicas y el
+``sync_engine`` del engine asíncrono) anota cada sentencia en el
+:class:`RequestQueryStats` de la petición en curso, que viaja en un
+``ContextVar``; fuera de una petición el listener no hace nada.
+
+Una misma sentencia (mismo SQL, parámetros distintos) ejecutada
+``SQL_N_PLUS_ONE_THRESHOLD`` veces o más en una petición se marca como
+candidata a N+1: suele ser una relación con lazy loading recorrida en un
+bucle. Los ``executemany`` no cuentan, ya van en lote.
+
+Configuración:
+
+* ``SQL_QUERY_STATS_ENABLED``: instala o no la instrumentación.
+* ``SQL_QUERY_STATS_HEADERS``: añade ``X-DB-Queries``, ``X-DB-Time-Ms`` y
+  ``X-DB-N-Plus-One`` a las respuestas.
+* ``SQL_QUERY_STATS_LOG``: ``all`` (una línea por petición), ``n_plus_one``
+  (solo peticiones con candidatas, por defecto) u ``off``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import LatencyHistogram
+
+SQL_QUERY_STATS_ENABLED = os.getenv("SQL_QUERY_STATS_ENABLED", "true").lower() in {"1", "true", "yes"}
+SQL_QUERY_STATS_HEADERS = os.getenv("SQL_QUERY_STATS_HEADERS", "true").lower() in {"1", "true", "yes"}
+SQL_QUERY_STATS_LOG = os.getenv("SQL_QUERY_STATS_LOG", "n_plus_one").lower()
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "3"))
+
+logger = logging.getLogger("app.sql")
+
+_STATEMENT_PREVIEW = 200
+_MAX_TRACKED_CANDIDATES = 50
+
+
+class RequestQueryStats:
+    """Sentencias y tiempo de base de datos acumulados durante una petición."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float, executemany: bool = False) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if not executemany:
+            self.statements[statement] += 1
+
+    def n_plus_one(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    stats = _current.get()
+    starts = conn.info.get("query_stats_start")
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop(), executemany)
+
+
+def _handle_error(exception_context: Any) -> None:
+    # La sentencia fallida no pasa por ``after_cursor_execute``: se descarta su inicio.
+    conn = exception_context.connection
+    starts = conn.info.get("query_stats_start") if conn is not None else None
+    if _current.get() is not None and starts:
+        starts.pop()
+
+
+class QueryStatsMonitor:
+    """Agregado por proceso de las estadísticas por petición, expuesto en ``/metrics``."""
+
+    def __init__(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.db_time = LatencyHistogram()
+        self._lock = Lock()
+        self.installed = False
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.n_plus_one_requests = 0
+        self._candidates: Counter[str] = Counter()
+
+    def install(self) -> None:
+        """Registra los listeners sobre todos los engines (idempotente)."""
+
+        if self.installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        self.installed = True
+
+    def observe(self, method: str, path: str, stats: RequestQueryStats) -> list[tuple[str, int]]:
+        candidates = stats.n_plus_one(self.threshold)
+        self.db_time.observe(stats.seconds)
+        with self._lock:
+            self.requests += 1
+            self.queries += stats.count
+            self.max_queries = max(self.max_queries, stats.count)
+            if candidates:
+                self.n_plus_one_requests += 1
+                for statement, _ in candidates:
+                    key = f"{method} {path} :: {statement[:_STATEMENT_PREVIEW]}"
+                    if key in self._candidates or len(self._candidates) < _MAX_TRACKED_CANDIDATES:
+                        self._candidates[key] += 1
+        return candidates
+
+    def reset(self) -> None:
+        self.db_time.reset()
+        with self._lock:
+            self.requests = self.queries = self.max_queries = self.n_plus_one_requests = 0
+            self._candidates.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.installed,
+                "n_plus_one_threshold": self.threshold,
+                "requests": self.requests,
+                "queries": self.queries,
+                "avg_queries_per_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+                "max_queries_per_request": self.max_queries,
+                "n_plus_one_requests": self.n_plus_one_requests,
+                "n_plus_one_candidates": dict(self._candidates.most_common(10)),
+                "db_time": self.db_time.snapshot(),
+            }
+
+
+query_stats_monitor = QueryStatsMonitor()
+
+
+async def query_stats_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Mide las sentencias SQL de cada petición y las publica en cabeceras y logs."""
+
+    if not query_stats_monitor.installed:
+        return await call_next(request)
+
+    stats = RequestQueryStats()
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    # Plantilla de ruta (``/timesheets/{timesheet_id}``) para agrupar candidatas.
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    candidates = query_stats_monitor.observe(request.method, path, stats)
+    db_ms = round(stats.seconds * 1000, 2)
+
+    if SQL_QUERY_STATS_HEADERS:
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{db_ms:.2f}"
+        response.headers["X-DB-N-Plus-One"] = str(len(candidates))
+
+    if SQL_QUERY_STATS_LOG == "all" or (SQL_QUERY_STATS_LOG == "n_plus_one" and candidates):
+        fields = {
+            "method": request.method,
+            "path": path,
+            "status": response.status_code,
+            "queries": stats.count,
+            "db_ms": db_ms,
+            "n_plus_one": [
+                {"statement": statement[:_STATEMENT_PREVIEW], "count": times} for statement, times in candidates
+            ],
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items() if key != "n_plus_one")
+        if candidates:
+            logger.warning("sql %s n_plus_one=%d", message, len(candidates), extra={"sql": fields})
+        else:
+            logger.info("sql %s", message, extra={"sql": fields})
+    return response
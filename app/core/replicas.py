@@ -0,0 +1,295 @@
+"""Enrutado de lecturas a réplicas con fallback al primario.
+
+Las rutas de listado, detalle y reportes piden una sesión de solo lectura
+(``get_read_session``). Se sirve desde una réplica sana salvo que:
+
+* no haya réplicas configuradas (``DATABASE_REPLICA_URLS``);
+* el usuario haya escrito hace menos de ``READ_YOUR_WRITES_SECONDS``, para
+  que vea sus propios cambios aunque la réplica aún no los tenga;
+* ninguna réplica esté sana o todas superen ``REPLICA_MAX_LAG_SECONDS``.
+
+La salud y el retraso de cada réplica se miden en un hilo de fondo cada
+``REPLICA_CHECK_INTERVAL_SECONDS``, por lo que elegir engine nunca hace I/O.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+
+from app.core.database import (
+    DATABASE_REPLICA_URLS,
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_CHECK_INTERVAL_SECONDS,
+    REPLICA_MAX_LAG_SECONDS,
+    async_database_url,
+    engine,
+    engine_options,
+    get_async_engine,
+    slow_query_log,
+)
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = "primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def measure_lag(connection: Connection) -> float:
+    """Retraso de replicación en segundos (0 en motores sin replicación)."""
+
+    if connection.dialect.name == "postgresql":
+        return float(connection.execute(_POSTGRES_LAG_SQL).scalar() or 0)
+    connection.execute(text("SELECT 1"))
+    return 0.0
+
+
+class ReadOnlySession(Session):
+    """Sesión para lecturas: rechaza commits y, en Postgres, abre transacciones READ ONLY."""
+
+    def commit(self) -> None:
+        raise RuntimeError("La sesión de lectura no admite commit")
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _begin_read_only(session: Session, transaction: Any, connection: Connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+class _Replica:
+    def __init__(self, index: int, replica_engine: Engine) -> None:
+        self.index = index
+        self.engine = replica_engine
+        self.async_engine: Optional[AsyncEngine] = None
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class ReplicaRouter:
+    """Elige el engine de cada lectura entre el primario y las réplicas."""
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: list[Engine],
+        *,
+        max_lag_seconds: float,
+        read_your_writes_seconds: float,
+        lag_probe: Callable[[Connection], float] = measure_lag,
+        async_primary: Callable[[], AsyncEngine] = get_async_engine,
+    ) -> None:
+        self.primary = primary
+        self.async_primary = async_primary
+        self.max_lag_seconds = max_lag_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.lag_probe = lag_probe
+        self._replicas = [_Replica(index, replica) for index, replica in enumerate(replicas)]
+        self._recent_writes: dict[str, float] = {}
+        self._lock = Lock()
+        self._next = 0
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self.routed = {"primary": 0, "replica": 0}
+        for replica in self._replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: _Replica) -> Callable[[Any], None]:
+        def mark_unhealthy(context: Any) -> None:
+            if context.is_disconnect:
+                with self._lock:
+                    replica.healthy = False
+                    replica.error = str(context.original_exception)
+
+        return mark_unhealthy
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    # Read-your-writes
+
+    def mark_write(self, subject: Optional[str]) -> float:
+        """Registra una escritura y devuelve hasta cuándo leer del primario."""
+
+        until = time.time() + self.read_your_writes_seconds
+        if subject:
+            with self._lock:
+                self._recent_writes[subject] = until
+        return until
+
+    def recently_wrote(self, subject: Optional[str]) -> bool:
+        if not subject:
+            return False
+        with self._lock:
+            until = self._recent_writes.get(subject)
+            if until is not None and until <= time.time():
+                del self._recent_writes[subject]
+                until = None
+        return until is not None
+
+    # Salud de réplicas
+
+    def refresh(self) -> None:
+        for replica in self._replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    lag = self.lag_probe(connection)
+                error = None
+            except Exception as exc:  # noqa: BLE001 - cualquier fallo deja la réplica fuera
+                lag, error = None, str(exc)
+                logger.warning("Réplica %d no disponible: %s", replica.index, exc)
+            with self._lock:
+                replica.lag_seconds = lag
+                replica.error = error
+                replica.healthy = error is None
+                replica.checked_at = time.time()
+
+        with self._lock:
+            now = time.time()
+            self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.refresh()
+
+    def start(self, interval: float = REPLICA_CHECK_INTERVAL_SECONDS) -> None:
+        if not self._replicas or self._thread is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+        self._thread = Thread(target=self._loop, args=(interval,), name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    # Selección
+
+    def _select(self, prefer_primary: bool) -> Optional[_Replica]:
+        with self._lock:
+            if not prefer_primary and self._replicas:
+                for offset in range(len(self._replicas)):
+                    replica = self._replicas[(self._next + offset) % len(self._replicas)]
+                    if replica.healthy and (replica.lag_seconds or 0) <= self.max_lag_seconds:
+                        self._next = (replica.index + 1) % len(self._replicas)
+                        self.routed["replica"] += 1
+                        return replica
+            self.routed["primary"] += 1
+            return None
+
+    def choose(self, *, prefer_primary: bool = False) -> Engine:
+        replica = self._select(prefer_primary)
+        return replica.engine if replica else self.primary
+
+    def choose_async(self, *, prefer_primary: bool = False) -> AsyncEngine:
+        replica = self._select(prefer_primary)
+        if replica is None:
+            return self.async_primary()
+        with self._lock:
+            if replica.async_engine is None:
+                url = async_database_url(replica.engine.url.render_as_string(hide_password=False))
+                replica.async_engine = create_async_engine(url, **engine_options(url, asynchronous=True))
+                slow_query_log.attach(replica.async_engine.sync_engine)
+            return replica.async_engine
+
+    async def dispose_async(self) -> None:
+        for replica in self._replicas:
+            async_engine, replica.async_engine = replica.async_engine, None
+            if async_engine is not None:
+                await async_engine.dispose()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_lag_seconds": self.max_lag_seconds,
+                "read_your_writes_seconds": self.read_your_writes_seconds,
+                "routed": dict(self.routed),
+                "replicas": [
+                    {
+                        "index": replica.index,
+                        "healthy": replica.healthy,
+                        "lag_seconds": replica.lag_seconds,
+                        "checked_at": replica.checked_at,
+                        "error": replica.error,
+                    }
+                    for replica in self._replicas
+                ],
+            }
+
+
+replica_engines = [create_engine(url, echo=False, **engine_options(url)) for url in DATABASE_REPLICA_URLS]
+for replica_engine in replica_engines:
+    slow_query_log.attach(replica_engine)
+
+replica_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    read_your_writes_seconds=READ_YOUR_WRITES_SECONDS,
+)
+
+
+def _bearer_subject(request: Request) -> Optional[str]:
+    from app.core.security import decode_token  # noqa: WPS433 - evita import circular
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token, expected_type="access").get("sub")
+    except Exception:  # noqa: BLE001 - la autenticación real la valida la dependencia
+        return None
+
+
+async def read_your_writes_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Envía al primario las lecturas de quien acaba de escribir.
+
+    Se marca tanto en memoria (por usuario del token) como con una cookie, de
+    modo que la ventana se respeta aunque la siguiente petición la atienda
+    otro worker.
+    """
+
+    router = replica_router
+    if not router.enabled:
+        return await call_next(request)
+
+    subject = _bearer_subject(request)
+    try:
+        cookie_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        cookie_until = 0.0
+    request.state.prefer_primary = router.recently_wrote(subject) or cookie_until > time.time()
+
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        until = router.mark_write(subject)
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            f"{until:.3f}",
+            max_age=max(1, math.ceil(router.read_your_writes_seconds)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
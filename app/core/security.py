@@ -6,20 +6,23 @@ import hashlib
 import hmac
 import json
 import os
-import secrets
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import timedelta
 from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
-from app.core.dependencies import get_session
+from app.core.cache import TTLCache, principal_cache
+from app.core.dependencies import get_async_session, get_session
 from app.core.errors import AuthorizationException
-from app.models import User
-from app.schemas import TokenData
+from app.core.hashing import check_password, hash_password, hashing_pool
+from app.models import User, UserStatus
+from app.schemas import Principal, TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -27,6 +30,16 @@ SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+STATELESS_AUTH = os.getenv("STATELESS_AUTH", "false").lower() in {"1", "true", "yes"}
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# Clave HMAC preparada una sola vez; cada firma parte de una copia del estado.
+_SIGNING_HMAC = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+
+# Tokens ya verificados -> payload decodificado. La expiración se vuelve a
+# comprobar en cada acierto, por lo que un token vencido nunca se acepta.
+token_cache = TTLCache(TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_TTL_SECONDS)
 
 
 def _b64encode(data: bytes) -> str:
@@ -41,47 +54,58 @@ def _b64decode(data: str) -> bytes:
 def _sign(data: bytes) -> str:
     if ALGORITHM != "HS256":  # pragma: no cover - placeholder para futuros algoritmos
         raise AuthorizationException("Algoritmo de firma no soportado")
-    signature = hmac.new(SECRET_KEY.encode(), data, hashlib.sha256).digest()
-    return _b64encode(signature)
+    signer = _SIGNING_HMAC.copy()
+    signer.update(data)
+    return _b64encode(signer.digest())
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        salt, stored_hash = hashed_password.split("$", 1)
-    except ValueError:
-        return False
+_HEADER_B64 = _b64encode(json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode())
 
-    new_hash = hashlib.pbkdf2_hmac("sha256", plain_password.encode(), salt.encode(), 100_000)
-    return hmac.compare_digest(_b64encode(new_hash), stored_hash)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return hashing_pool.run("verify", check_password, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    salt = secrets.token_hex(16)
-    hashed = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), 100_000)
-    return f"{salt}${_b64encode(hashed)}"
+    return hashing_pool.run("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run_async("verify", check_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_pool.run_async("hash", hash_password, password)
 
 
 def create_token(
-    *, subject: str, expires_delta: timedelta, token_type: str, jti: str | None = None
+    *,
+    subject: str,
+    expires_delta: timedelta,
+    token_type: str,
+    jti: str | None = None,
+    claims: dict | None = None,
 ) -> str:
-    expire_time = datetime.now(timezone.utc) + expires_delta
-    header = {"alg": ALGORITHM, "typ": "JWT"}
-    payload = {"sub": subject, "exp": int(expire_time.timestamp()), "type": token_type}
+    payload = {"sub": subject, "exp": int(time.time() + expires_delta.total_seconds()), "type": token_type}
     if jti:
         payload["jti"] = jti
+    if claims:
+        payload.update(claims)
 
-    header_b64 = _b64encode(json.dumps(header, separators=(",", ":")).encode())
     payload_b64 = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
-    signing_input = f"{header_b64}.{payload_b64}".encode()
-    signature_b64 = _sign(signing_input)
-    return f"{header_b64}.{payload_b64}.{signature_b64}"
+    signing_input = f"{_HEADER_B64}.{payload_b64}"
+    signature_b64 = _sign(signing_input.encode())
+    return f"{signing_input}.{signature_b64}"
 
 
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(
+    subject: str, expires_delta: Optional[timedelta] = None, claims: dict | None = None
+) -> str:
     return create_token(
         subject=subject,
         expires_delta=expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
         token_type="access",
+        claims=claims,
     )
 
 
@@ -94,7 +118,7 @@ def create_refresh_token(subject: str, jti: str, expires_delta: Optional[timedel
     )
 
 
-def decode_token(token: str, *, expected_type: str | None = None) -> dict:
+def _verify_token(token: str) -> dict:
     try:
         header_b64, payload_b64, signature_b64 = token.split(".")
     except ValueError as exc:
@@ -106,51 +130,221 @@ def decode_token(token: str, *, expected_type: str | None = None) -> dict:
         raise AuthorizationException("Firma del token inválida")
 
     try:
-        payload = json.loads(_b64decode(payload_b64))
+        return json.loads(_b64decode(payload_b64))
     except json.JSONDecodeError as exc:
         raise AuthorizationException("Payload del token inválido") from exc
 
+
+def decode_token(token: str, *, expected_type: str | None = None) -> dict:
+    now = time.time()
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = _verify_token(token)
+        exp = payload.get("exp")
+        if exp is None or exp >= now:
+            ttl = TOKEN_CACHE_TTL_SECONDS if exp is None else min(TOKEN_CACHE_TTL_SECONDS, exp - now)
+            token_cache.set(token, payload, ttl_seconds=ttl)
+
     exp = payload.get("exp")
-    if exp is not None and datetime.fromtimestamp(exp, tz=timezone.utc) < datetime.now(timezone.utc):
+    if exp is not None and exp < now:
         raise AuthorizationException("Token expirado")
 
     if expected_type and payload.get("type") != expected_type:
         raise AuthorizationException("Tipo de token inválido")
 
-    return payload
+    return dict(payload)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
-) -> User:
-    credentials_exception = AuthorizationException("No se pudieron validar las credenciales")
+def _snapshot_principal(user: User) -> dict:
+    data = user.model_dump()
+    data["status"] = user.status.model_dump() if user.status else None
+    return data
 
+
+def _restore_principal(data: dict) -> User:
+    """Reconstruye un ``User`` transitorio (sin sesión) desde la caché."""
+    status_data = data.get("status")
+    user = User(**{key: value for key, value in data.items() if key != "status"})
+    if status_data is not None:
+        user.status = UserStatus(**status_data)
+    return user
+
+
+def _credentials_exception() -> AuthorizationException:
+    return AuthorizationException("No se pudieron validar las credenciales")
+
+
+def _decode_access_token(token: str) -> tuple[dict, UUID]:
     try:
         payload = decode_token(token, expected_type="access")
         subject: Optional[str] = payload.get("sub")
         if subject is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenData(sub=subject, token_type="access", jti=payload.get("jti"))
     except AuthorizationException:
-        raise credentials_exception
+        raise _credentials_exception()
 
     try:
-        user_id = UUID(subject)
+        return payload, UUID(token_data.sub)
     except ValueError:
-        raise credentials_exception
+        raise _credentials_exception()
+
 
+def _fetch_principal(session: Session, user_id: UUID) -> Optional[User]:
+    version = principal_cache.version(user_id)
     user = crud.get_user(session, user_id)
+    if user:
+        principal_cache.set(user_id, _snapshot_principal(user), version)
+    return user
+
+
+async def _fetch_principal_async(session: AsyncSession, user_id: UUID) -> Optional[User]:
+    version = principal_cache.version(user_id)
+    user = await crud.get_user_async(session, user_id)
+    if user:
+        principal_cache.set(user_id, _snapshot_principal(user), version)
+    return user
+
+
+def get_cached_user(session: Session, user_id: UUID) -> Optional[User]:
+    """Devuelve el usuario desde la caché de principals o, si no está, desde la base."""
+    cached = principal_cache.get(user_id)
+    return _restore_principal(cached) if cached is not None else _fetch_principal(session, user_id)
+
+
+async def get_cached_user_async(session: AsyncSession, user_id: UUID) -> Optional[User]:
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return _restore_principal(cached)
+    return await _fetch_principal_async(session, user_id)
+
+
+def _current_token_version(session: Session, user_id: UUID) -> Optional[int]:
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return cached["token_version"]
+    user = _fetch_principal(session, user_id)
+    return user.token_version if user else None
+
+
+async def _current_token_version_async(session: AsyncSession, user_id: UUID) -> Optional[int]:
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return cached["token_version"]
+    user = await _fetch_principal_async(session, user_id)
+    return user.token_version if user else None
+
+
+def access_token_claims(user: User) -> dict:
+    """Claims de autorización embebidos en el access token.
+
+    Solo son válidos mientras ``ver`` coincida con ``token_version``, que se
+    incrementa al cambiar el rol, el estado o la cuenta del usuario.
+    """
+    return {
+        "role": user.role,
+        "acc": str(user.account_uuid) if user.account_uuid else None,
+        "ver": user.token_version,
+    }
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
+) -> User:
+    payload, user_id = _decode_access_token(token)
+
+    user = get_cached_user(session, user_id)
+    if not user:
+        raise _credentials_exception()
+
+    token_version = payload.get("ver")
+    if token_version is not None and token_version != user.token_version:
+        raise _credentials_exception()
+    return user
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
+) -> User | Principal:
+    """Identidad autenticada para guards de autorización.
+
+    Con ``STATELESS_AUTH`` activo se construye a partir de los claims del token
+    (rol, cuenta y versión) y solo se verifica que la versión siga vigente,
+    normalmente sin tocar la base de datos. En caso contrario, o para tokens
+    emitidos sin esos claims, se carga el ``User`` completo.
+    """
+
+    if not STATELESS_AUTH:
+        return get_current_user(token, session)
+
+    payload, user_id = _decode_access_token(token)
+    role = payload.get("role")
+    token_version = payload.get("ver")
+    if role is None or token_version is None:
+        return get_current_user(token, session)
+
+    if _current_token_version(session, user_id) != token_version:
+        raise _credentials_exception()
+
+    return Principal(id=user_id, role=role, account_uuid=payload.get("acc"), token_version=token_version)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_async_session)
+) -> User:
+    payload, user_id = _decode_access_token(token)
+
+    user = await get_cached_user_async(session, user_id)
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    token_version = payload.get("ver")
+    if token_version is not None and token_version != user.token_version:
+        raise _credentials_exception()
     return user
 
 
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_async_session)
+) -> User | Principal:
+    """Equivalente de ``get_current_principal`` para los routers asíncronos."""
+
+    if not STATELESS_AUTH:
+        return await get_current_user_async(token, session)
+
+    payload, user_id = _decode_access_token(token)
+    role = payload.get("role")
+    token_version = payload.get("ver")
+    if role is None or token_version is None:
+        return await get_current_user_async(token, session)
+
+    if await _current_token_version_async(session, user_id) != token_version:
+        raise _credentials_exception()
+
+    return Principal(id=user_id, role=role, account_uuid=payload.get("acc"), token_version=token_version)
+
+
+def _check_role(current_user: User | Principal, allowed_roles: tuple[str, ...]) -> User | Principal:
+    if current_user.role not in allowed_roles:
+        raise AuthorizationException("No tienes permisos suficientes", status_code=status.HTTP_403_FORBIDDEN)
+    return current_user
+
+
 def role_required(*allowed_roles: str):
     """Dependencia para validar que el usuario tenga uno de los roles permitidos."""
 
-    def _require_role(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in allowed_roles:
-            raise AuthorizationException("No tienes permisos suficientes", status_code=status.HTTP_403_FORBIDDEN)
-        return current_user
+    def _require_role(current_user: User | Principal = Depends(get_current_principal)) -> User | Principal:
+        return _check_role(current_user, allowed_roles)
+
+    return _require_role
+
+
+def role_required_async(*allowed_roles: str):
+    """Como ``role_required`` pero resolviendo la identidad con ``AsyncSession``."""
+
+    async def _require_role(
+        current_user: User | Principal = Depends(get_current_principal_async),
+    ) -> User | Principal:
+        return _check_role(current_user, allowed_roles)
 
     return _require_role
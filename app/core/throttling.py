@@ -0,0 +1,215 @@
+"""Limitación de intentos de login mediante token buckets.
+
+Cada intento consume un token del bucket de la IP de origen y otro del bucket
+del email. Si alguno está vacío el intento se rechaza con 429 antes de
+consultar la base de datos o calcular PBKDF2, de modo que una ráfaga de
+credential stuffing no consume el presupuesto de CPU del resto de la API.
+
+El estado se guarda en un store intercambiable:
+
+* ``memory`` (por defecto): local al proceso, acotado en número de claves.
+* ``database``: tabla ``login_throttle_buckets`` compartida entre workers;
+  cada intento es una única transacción corta con bloqueo de fila.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.core.errors import TooManyRequestsException
+from app.models import LoginThrottleBucket
+
+LOGIN_THROTTLE_ENABLED = os.getenv("LOGIN_THROTTLE_ENABLED", "true").lower() in {"1", "true", "yes"}
+LOGIN_THROTTLE_STORE = os.getenv("LOGIN_THROTTLE_STORE", "memory")
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+LOGIN_THROTTLE_EMAIL_BURST = float(os.getenv("LOGIN_THROTTLE_EMAIL_BURST", "5"))
+LOGIN_THROTTLE_EMAIL_PER_MINUTE = float(os.getenv("LOGIN_THROTTLE_EMAIL_PER_MINUTE", "5"))
+LOGIN_THROTTLE_IP_BURST = float(os.getenv("LOGIN_THROTTLE_IP_BURST", "20"))
+LOGIN_THROTTLE_IP_PER_MINUTE = float(os.getenv("LOGIN_THROTTLE_IP_PER_MINUTE", "30"))
+
+
+class BucketRule:
+    """Capacidad de ráfaga y ritmo de recarga (tokens por segundo) de un bucket."""
+
+    def __init__(self, capacity: float, per_minute: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = per_minute / 60
+
+    def refill(self, tokens: float, elapsed: float) -> float:
+        return min(self.capacity, tokens + max(elapsed, 0.0) * self.refill_per_second)
+
+    def retry_after(self, tokens: float) -> float:
+        if self.refill_per_second <= 0:
+            return math.inf
+        return (1 - tokens) / self.refill_per_second
+
+
+class MemoryBucketStore:
+    """Buckets locales al proceso en un LRU acotado a ``max_keys`` claves."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def consume(self, key: str, rule: BucketRule) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rule.capacity, now))
+            tokens = rule.refill(tokens, now - updated_at)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else rule.retry_after(tokens)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class DatabaseBucketStore:
+    """Buckets compartidos en la tabla ``login_throttle_buckets``.
+
+    Usa conexiones propias del engine (no la sesión de la petición) y reloj de
+    pared para que todos los workers vean el mismo estado.
+    """
+
+    name = "database"
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+        self._table = LoginThrottleBucket.__table__
+
+    def _consume_once(self, key: str, rule: BucketRule) -> tuple[bool, float]:
+        table = self._table
+        now = time.time()
+        with self._engine.begin() as connection:
+            row = connection.execute(
+                select(table.c.tokens, table.c.updated_at).where(table.c.key == key).with_for_update()
+            ).first()
+            tokens = rule.capacity if row is None else rule.refill(row.tokens, now - row.updated_at)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if row is None:
+                connection.execute(table.insert().values(key=key, tokens=tokens, updated_at=now))
+            else:
+                connection.execute(
+                    table.update().where(table.c.key == key).values(tokens=tokens, updated_at=now)
+                )
+        return allowed, 0.0 if allowed else rule.retry_after(tokens)
+
+    def consume(self, key: str, rule: BucketRule) -> tuple[bool, float]:
+        try:
+            return self._consume_once(key, rule)
+        except IntegrityError:
+            # Otro worker creó el bucket a la vez; ya existe y puede bloquearse.
+            return self._consume_once(key, rule)
+
+    def clear(self) -> None:
+        with self._engine.begin() as connection:
+            connection.execute(self._table.delete())
+
+
+class LoginThrottle:
+    """Control de admisión de ``/auth/login`` por IP y por email."""
+
+    def __init__(
+        self,
+        store: MemoryBucketStore | DatabaseBucketStore,
+        *,
+        email_rule: BucketRule,
+        ip_rule: BucketRule,
+        enabled: bool = True,
+    ) -> None:
+        self.store = store
+        self.email_rule = email_rule
+        self.ip_rule = ip_rule
+        self.enabled = enabled
+        self._lock = Lock()
+        self.allowed = 0
+        self.rejected = {"ip": 0, "email": 0}
+
+    def check(self, email: str, client_ip: Optional[str]) -> None:
+        if not self.enabled:
+            return
+
+        buckets = (("ip", client_ip, self.ip_rule), ("email", _email_key(email), self.email_rule))
+        for scope, value, rule in buckets:
+            if not value:
+                continue
+            allowed, retry_after = self.store.consume(f"{scope}:{value}", rule)
+            if not allowed:
+                with self._lock:
+                    self.rejected[scope] += 1
+                seconds = max(1, math.ceil(min(retry_after, 3600)))
+                raise TooManyRequestsException(
+                    "Demasiados intentos de inicio de sesión, reintenta más tarde",
+                    retry_after=seconds,
+                    details={"retry_after": seconds},
+                )
+
+        with self._lock:
+            self.allowed += 1
+
+    def reset(self) -> None:
+        self.store.clear()
+        with self._lock:
+            self.allowed = 0
+            self.rejected = {"ip": 0, "email": 0}
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            allowed = self.allowed
+            rejected = dict(self.rejected)
+        return {
+            "enabled": self.enabled,
+            "store": self.store.name,
+            "allowed": allowed,
+            "rejected": rejected,
+            "rejected_total": sum(rejected.values()),
+        }
+
+
+def _email_key(email: str) -> str:
+    """Huella de longitud fija del email normalizado.
+
+    ``username`` llega sin límite de longitud desde el formulario OAuth2; sin
+    acotarlo, la clave desbordaría ``login_throttle_buckets.key`` en Postgres.
+    """
+
+    normalized = email.strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest() if normalized else ""
+
+
+def _build_store(kind: str) -> MemoryBucketStore | DatabaseBucketStore:
+    if kind == "memory":
+        return MemoryBucketStore(LOGIN_THROTTLE_MAX_KEYS)
+    if kind == "database":
+        from app.core.database import engine
+
+        return DatabaseBucketStore(engine)
+    raise ValueError(f"Store de throttling no soportado: {kind}")
+
+
+login_throttle = LoginThrottle(
+    _build_store(LOGIN_THROTTLE_STORE),
+    email_rule=BucketRule(LOGIN_THROTTLE_EMAIL_BURST, LOGIN_THROTTLE_EMAIL_PER_MINUTE),
+    ip_rule=BucketRule(LOGIN_THROTTLE_IP_BURST, LOGIN_THROTTLE_IP_PER_MINUTE),
+    enabled=LOGIN_THROTTLE_ENABLED,
+)
@@ -0,0 +1,86 @@
+"""Unidad de trabajo por petición: las funciones CRUD hacen flush y la petición confirma una vez.
+
+``get_session``/``get_async_session`` marcan la sesión con :func:`begin`. A
+partir de ahí :func:`persist` solo hace ``flush`` y la dependencia llama a
+:func:`complete` al terminar el endpoint, antes de enviar la respuesta: un
+único ``COMMIT`` y ninguna relectura. Si el endpoint lanza una excepción no
+se confirma nada.
+
+Sin ``refresh`` no hay relectura de los valores que genera el servidor
+(``created_at``, ``updated_at``...): los modelos que los tienen declaran
+``__mapper_args__ = {"eager_defaults": True}`` para que vuelvan por
+``RETURNING`` en el propio ``INSERT``/``UPDATE``.
+
+Fuera de una unidad de trabajo (scripts, tareas de mantenimiento, tests que
+abren ``Session(engine)``) :func:`persist` conserva el comportamiento
+anterior: ``commit`` seguido de ``refresh``.
+
+Los efectos que solo deben ocurrir si los datos se confirman (invalidar
+cachés) se registran con :func:`after_commit`.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+DB_UNIT_OF_WORK = os.getenv("DB_UNIT_OF_WORK", "true").lower() in {"1", "true", "yes"}
+
+_ACTIVE = "unit_of_work"
+_PENDING = "unit_of_work_pending"
+_CALLBACKS = "unit_of_work_after_commit"
+
+
+def begin(session: Session) -> None:
+    session.info[_ACTIVE] = True
+
+
+def active(session: Session) -> bool:
+    return bool(session.info.get(_ACTIVE))
+
+
+def persist(session: Session, *instances: Any) -> None:
+    """Envía los cambios pendientes: ``flush`` en una unidad de trabajo, ``commit`` fuera de ella."""
+
+    if active(session):
+        session.flush()
+        session.info[_PENDING] = True
+        return
+    session.commit()
+    for instance in instances:
+        session.refresh(instance)
+
+
+def after_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Ejecuta ``callback`` cuando se confirme la unidad de trabajo (inmediatamente fuera de ella)."""
+
+    if active(session):
+        session.info.setdefault(_CALLBACKS, []).append(callback)
+    else:
+        callback()
+
+
+def complete(session: Session) -> None:
+    if session.info.pop(_PENDING, False):
+        session.commit()
+
+
+async def complete_async(session: AsyncSession) -> None:
+    if session.info.pop(_PENDING, False):
+        await session.commit()
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_CALLBACKS, []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit(session: Session, previous_transaction: Any) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_CALLBACKS, None)
+        session.info.pop(_PENDING, None)
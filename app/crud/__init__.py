@@ -20,35 +20,68 @@ from app.crud.projects import (  # noqa: F401
     get_project_by_code,
     list_members,
     list_projects as list_projects_v2,
+    project_memberships,
     remove_member,
     update_project as update_project_v2,
 )
 from app.crud.reports import (  # noqa: F401
     aggregate_hours_by_project,
+    aggregate_hours_by_project_async,
     aggregate_hours_by_user,
+    aggregate_hours_by_user_async,
     aggregate_user_projects,
+    aggregate_user_projects_async,
     summarize_hours_by_status,
+    summarize_hours_by_status_async,
+)
+from app.crud.auth import (  # noqa: F401
+    create_refresh_token,
+    delete_stale_refresh_tokens,
+    get_refresh_token_by_jti,
+    revoke_all_refresh_tokens,
+    revoke_refresh_token,
+    rotate_refresh_token,
 )
-from app.crud.auth import create_refresh_token, get_refresh_token_by_jti, revoke_refresh_token
 from app.crud.timesheets import (  # noqa: F401
+    apply_item_changes,
     create_item,
+    create_item_validated,
     create_timesheet,
+    daily_item_hours,
     delete_item,
     delete_timesheet,
     find_overlapping_timesheet,
     get_item,
+    get_item_async,
     get_timesheet,
+    get_timesheet_async,
+    get_timesheet_header,
+    get_timesheet_header_async,
+    get_timesheet_statuses,
+    get_timesheet_with_items,
+    is_overlap_violation,
     list_items,
+    list_items_async,
     list_timesheets,
+    list_timesheets_async,
+    list_timesheets_with_totals,
+    list_timesheets_with_totals_async,
+    lock_daily_total,
+    lock_daily_totals,
     update_item,
+    transition_timesheet,
+    transition_timesheets,
     update_timesheet,
 )
 from app.crud.users import (  # noqa: F401
+    bump_token_version,
     create as create_user,
     create_profile,
     delete as delete_user,
     get as get_user,
+    get_async as get_user_async,
     get_by_email,
+    get_by_email_async,
     get_by_user_id,
     get_profile,
     list_all as list_users,
@@ -76,31 +109,60 @@ __all__ = [
     "get_project_v2",
     "list_members",
     "list_projects_v2",
+    "project_memberships",
     "remove_member",
     "update_project_v2",
     "aggregate_hours_by_project",
+    "aggregate_hours_by_project_async",
     "aggregate_hours_by_user",
+    "aggregate_hours_by_user_async",
     "aggregate_user_projects",
+    "aggregate_user_projects_async",
     "summarize_hours_by_status",
+    "summarize_hours_by_status_async",
     "create_refresh_token",
+    "delete_stale_refresh_tokens",
     "get_refresh_token_by_jti",
+    "revoke_all_refresh_tokens",
     "revoke_refresh_token",
+    "rotate_refresh_token",
+    "apply_item_changes",
     "create_item",
+    "create_item_validated",
     "create_timesheet",
+    "daily_item_hours",
     "delete_item",
     "delete_timesheet",
     "find_overlapping_timesheet",
     "get_item",
+    "get_item_async",
     "get_timesheet",
+    "get_timesheet_async",
+    "get_timesheet_header",
+    "get_timesheet_header_async",
+    "get_timesheet_statuses",
+    "get_timesheet_with_items",
+    "is_overlap_violation",
     "list_items",
+    "list_items_async",
     "list_timesheets",
+    "list_timesheets_async",
+    "list_timesheets_with_totals",
+    "list_timesheets_with_totals_async",
+    "lock_daily_total",
+    "lock_daily_totals",
     "update_item",
+    "transition_timesheet",
+    "transition_timesheets",
     "update_timesheet",
+    "bump_token_version",
     "create_user",
     "create_profile",
     "delete_user",
     "get_user",
+    "get_user_async",
     "get_by_email",
+    "get_by_email_async",
     "get_by_user_id",
     "get_profile",
     "list_users",
@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import status
 from sqlmodel import Session, select
 
+from app.core import unit_of_work
 from app.core.errors import BusinessRuleException
 from app.crud.projects import get_project_by_code
 from app.models import Account, Project
@@ -34,8 +35,7 @@ def create_account(session: Session, account_in: AccountCreate) -> Account:
         )
     account = Account(**account_in.model_dump())
     session.add(account)
-    session.commit()
-    session.refresh(account)
+    unit_of_work.persist(session, account)
     return account
 
 
@@ -52,14 +52,13 @@ def update_account(session: Session, account: Account, account_in: AccountUpdate
     for field, value in update_data.items():
         setattr(account, field, value)
     session.add(account)
-    session.commit()
-    session.refresh(account)
+    unit_of_work.persist(session, account)
     return account
 
 
 def delete_account(session: Session, account: Account) -> None:
     session.delete(account)
-    session.commit()
+    unit_of_work.persist(session)
 
 
 # Project operations
@@ -81,8 +80,7 @@ def create_project(session: Session, project_in: ProjectCreate) -> Project:
         )
     project = Project(**project_in.model_dump())
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    unit_of_work.persist(session, project)
     return project
 
 
@@ -99,11 +97,10 @@ def update_project(session: Session, project: Project, project_in: ProjectUpdate
     for field, value in update_data.items():
         setattr(project, field, value)
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    unit_of_work.persist(session, project)
     return project
 
 
 def delete_project(session: Session, project: Project) -> None:
     session.delete(project)
-    session.commit()
+    unit_of_work.persist(session)
@@ -2,16 +2,17 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import delete, update
 from sqlmodel import Session, select
 
+from app.core import unit_of_work
 from app.models import RefreshToken
 
 
 def create_refresh_token(session: Session, user_id: UUID, jti: str, expires_at: datetime) -> RefreshToken:
     token = RefreshToken(user_id=user_id, jti=jti, expires_at=expires_at)
     session.add(token)
-    session.commit()
-    session.refresh(token)
+    unit_of_work.persist(session, token)
     return token
 
 
@@ -23,6 +24,75 @@ def revoke_refresh_token(session: Session, token: RefreshToken) -> RefreshToken:
     token.revoked = True
     token.revoked_at = datetime.utcnow()
     session.add(token)
-    session.commit()
-    session.refresh(token)
+    unit_of_work.persist(session, token)
     return token
+
+
+def revoke_all_refresh_tokens(session: Session, user_id: UUID) -> int:
+    statement = (
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked.is_(False))
+        .values(revoked=True, revoked_at=datetime.utcnow())
+    )
+    result = session.execute(statement)
+    unit_of_work.persist(session)
+    return result.rowcount
+
+
+def rotate_refresh_token(
+    session: Session, jti: str, user_id: UUID, new_jti: str, new_expires_at: datetime
+) -> Optional[RefreshToken]:
+    """Revoca ``jti`` e inserta su reemplazo en una única transacción.
+
+    El UPDATE solo afecta a un token vigente, no revocado y del mismo usuario,
+    por lo que dos rotaciones concurrentes del mismo ``jti`` no pueden tener
+    éxito a la vez. Devuelve ``None`` (sin escribir nada) si no era rotable.
+    """
+
+    now = datetime.utcnow()
+    statement = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at >= now,
+        )
+        .values(revoked=True, revoked_at=now)
+    )
+    if session.get_bind().dialect.update_returning:
+        rotated = session.execute(statement.returning(RefreshToken.id)).first() is not None
+    else:
+        rotated = session.execute(statement).rowcount == 1
+
+    if not rotated:
+        # Nada que deshacer en una unidad de trabajo: el llamador lanza el error
+        # y la petición termina sin confirmar. Fuera de ella se libera el bloqueo.
+        if not unit_of_work.active(session):
+            session.rollback()
+        return None
+
+    token = RefreshToken(user_id=user_id, jti=new_jti, expires_at=new_expires_at)
+    session.add(token)
+    unit_of_work.persist(session)
+    return token
+
+
+def delete_stale_refresh_tokens(session: Session, now: datetime, batch_size: int) -> int:
+    """Elimina un lote de refresh tokens expirados o revocados y confirma la transacción.
+
+    Expirados y revocados se buscan por separado para que cada consulta use su
+    índice (``ix_refresh_tokens_expires_at`` y el parcial ``ix_refresh_tokens_revoked``).
+    """
+    ids = list(session.exec(select(RefreshToken.id).where(RefreshToken.expires_at < now).limit(batch_size)).all())
+    if len(ids) < batch_size:
+        ids += session.exec(
+            select(RefreshToken.id)
+            .where(RefreshToken.revoked, RefreshToken.expires_at >= now)
+            .limit(batch_size - len(ids))
+        ).all()
+    if not ids:
+        return 0
+    session.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+    unit_of_work.persist(session)
+    return len(ids)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional
 from uuid import UUID
 
 from fastapi import status
 from sqlalchemy import func
 from sqlmodel import Session, select
 
+from app.core import unit_of_work
 from app.core.errors import BusinessRuleException
+from app.crud import statements
 from app.models import Project, User, UserProjectMembership
 from app.schemas.project import ProjectCreate, ProjectMemberCreate, ProjectUpdate
 
@@ -53,8 +55,7 @@ def create_project(session: Session, project_in: ProjectCreate) -> Project:
         )
     project = Project(**project_in.model_dump())
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    unit_of_work.persist(session, project)
     return project
 
 
@@ -71,26 +72,40 @@ def update_project(session: Session, project: Project, project_in: ProjectUpdate
     for field, value in update_data.items():
         setattr(project, field, value)
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    unit_of_work.persist(session, project)
     return project
 
 
 def delete_project(session: Session, project: Project) -> None:
     session.delete(project)
-    session.commit()
+    unit_of_work.persist(session)
 
 
 def add_member(session: Session, project: Project, membership_in: ProjectMemberCreate) -> UserProjectMembership:
     membership = UserProjectMembership(**membership_in.model_dump(), project_id=project.id)
     session.add(membership)
-    session.commit()
-    session.refresh(membership)
+    unit_of_work.persist(session, membership)
     return membership
 
 
 def get_membership(session: Session, project_id: UUID, user_id: UUID) -> Optional[UserProjectMembership]:
-    return session.get(UserProjectMembership, (user_id, project_id))
+    return session.exec(statements.MEMBERSHIP, params={"project_id": project_id, "user_id": user_id}).first()
+
+
+def project_memberships(session: Session, user_id: UUID, project_ids: Iterable[UUID]) -> dict[UUID, bool]:
+    """Proyectos existentes de ``project_ids`` y si ``user_id`` es miembro de cada uno, en una consulta."""
+    ids = set(project_ids)
+    if not ids:
+        return {}
+    statement = (
+        select(Project.id, UserProjectMembership.user_id.is_not(None))
+        .outerjoin(
+            UserProjectMembership,
+            (UserProjectMembership.project_id == Project.id) & (UserProjectMembership.user_id == user_id),
+        )
+        .where(Project.id.in_(ids))
+    )
+    return {project_id: bool(is_member) for project_id, is_member in session.exec(statement)}
 
 
 def list_members(session: Session, project_id: UUID) -> List[tuple[UserProjectMembership, User]]:
@@ -104,4 +119,4 @@ def list_members(session: Session, project_id: UUID) -> List[tuple[UserProjectMe
 
 def remove_member(session: Session, membership: UserProjectMembership) -> None:
     session.delete(membership)
-    session.commit()
+    unit_of_work.persist(session)
@@ -5,6 +5,7 @@ from uuid import UUID
 from sqlalchemy import func
 from sqlalchemy.orm import aliased
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Project, TimesheetHeader, TimesheetItem, User
 from app.models.timesheet import TimesheetStatus
@@ -17,9 +18,7 @@ ALLOWED_STATUSES = [
 ]
 
 
-def aggregate_hours_by_user(
-    session: Session, period_start: date, period_end: date, user_id: Optional[UUID] = None
-):
+def _hours_by_user_statement(period_start: date, period_end: date, user_id: Optional[UUID] = None):
     statement = (
         select(
             TimesheetHeader.user_id.label("user_id"),
@@ -41,15 +40,11 @@ def aggregate_hours_by_user(
     if user_id:
         statement = statement.where(TimesheetHeader.user_id == user_id)
 
-    return session.exec(statement).all()
+    return statement
 
 
-def aggregate_hours_by_project(
-    session: Session,
-    project_id: UUID,
-    period_start: date,
-    period_end: date,
-    user_id: Optional[UUID] = None,
+def _hours_by_project_statement(
+    project_id: UUID, period_start: date, period_end: date, user_id: Optional[UUID] = None
 ):
     project_alias = aliased(Project)
     statement = (
@@ -74,12 +69,10 @@ def aggregate_hours_by_project(
     if user_id:
         statement = statement.where(TimesheetHeader.user_id == user_id)
 
-    return session.exec(statement).all()
+    return statement
 
 
-def aggregate_user_projects(
-    session: Session, user_id: UUID, period_start: date, period_end: date
-):
+def _user_projects_statement(user_id: UUID, period_start: date, period_end: date):
     project_alias = aliased(Project)
     statement = (
         select(
@@ -101,10 +94,10 @@ def aggregate_user_projects(
         .order_by(func.sum(TimesheetItem.hours).desc())
     )
 
-    return session.exec(statement).all()
+    return statement
 
 
-def summarize_hours_by_status(session: Session, period_start: date, period_end: date):
+def _hours_by_status_statement(period_start: date, period_end: date):
     statement = (
         select(
             TimesheetHeader.status.label("status"),
@@ -120,4 +113,56 @@ def summarize_hours_by_status(session: Session, period_start: date, period_end:
         .group_by(TimesheetHeader.status)
     )
 
-    return session.exec(statement).all()
+    return statement
+
+
+def aggregate_hours_by_user(
+    session: Session, period_start: date, period_end: date, user_id: Optional[UUID] = None
+):
+    return session.exec(_hours_by_user_statement(period_start, period_end, user_id)).all()
+
+
+def aggregate_hours_by_project(
+    session: Session,
+    project_id: UUID,
+    period_start: date,
+    period_end: date,
+    user_id: Optional[UUID] = None,
+):
+    return session.exec(_hours_by_project_statement(project_id, period_start, period_end, user_id)).all()
+
+
+def aggregate_user_projects(
+    session: Session, user_id: UUID, period_start: date, period_end: date
+):
+    return session.exec(_user_projects_statement(user_id, period_start, period_end)).all()
+
+
+def summarize_hours_by_status(session: Session, period_start: date, period_end: date):
+    return session.exec(_hours_by_status_statement(period_start, period_end)).all()
+
+
+async def aggregate_hours_by_user_async(
+    session: AsyncSession, period_start: date, period_end: date, user_id: Optional[UUID] = None
+):
+    return (await session.exec(_hours_by_user_statement(period_start, period_end, user_id))).all()
+
+
+async def aggregate_hours_by_project_async(
+    session: AsyncSession,
+    project_id: UUID,
+    period_start: date,
+    period_end: date,
+    user_id: Optional[UUID] = None,
+):
+    return (await session.exec(_hours_by_project_statement(project_id, period_start, period_end, user_id))).all()
+
+
+async def aggregate_user_projects_async(
+    session: AsyncSession, user_id: UUID, period_start: date, period_end: date
+):
+    return (await session.exec(_user_projects_statement(user_id, period_start, period_end))).all()
+
+
+async def summarize_hours_by_status_async(session: AsyncSession, period_start: date, period_end: date):
+    return (await session.exec(_hours_by_status_statement(period_start, period_end))).all()
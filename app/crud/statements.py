@@ -0,0 +1,201 @@
+"""Registro de sentencias parametrizadas de las consultas calientes.
+
+Cada sentencia se construye una sola vez al importar el módulo, con
+``bindparam`` en lugar de valores, y se ejecuta pasando los parámetros::
+
+    session.exec(statements.TIMESHEET_BY_ID, params={"timesheet_id": timesheet_id})
+
+Al ser siempre el mismo objeto, su clave de caché queda memorizada y el SQL
+compilado se reutiliza desde la caché del engine: por petición no se
+reconstruye el ``select(...)`` ni se recorre el árbol para calcular la clave.
+Las variantes opcionales (``exclude_id``) son sentencias separadas.
+
+Se evita ``lambda_stmt`` a propósito: con entidades ORM la lambda se vuelve a
+resolver (copiando la sentencia) en cada ejecución y resulta más lenta que
+construir el ``select`` a mano.
+"""
+from __future__ import annotations
+
+from sqlalchemy import Boolean, and_, bindparam, exists, func, insert, literal, or_, text, true, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import select
+
+from app.models import Project, TimesheetHeader, TimesheetItem, User, UserProjectMembership
+from app.models.timesheet import TimesheetStatus
+
+TIMESHEET_BY_ID = (
+    select(TimesheetHeader)
+    .where(TimesheetHeader.id == bindparam("timesheet_id"))
+    .options(selectinload(TimesheetHeader.items))
+)
+
+# Cabecera e ítems en una sola consulta (JOIN), para comparar la cuadrícula semanal.
+TIMESHEET_WITH_ITEMS_BY_ID = (
+    select(TimesheetHeader)
+    .where(TimesheetHeader.id == bindparam("timesheet_id"))
+    .options(joinedload(TimesheetHeader.items))
+)
+
+# Sin ítems: para escrituras que bloquean antes de leerlos.
+TIMESHEET_HEADER_BY_ID = select(TimesheetHeader).where(TimesheetHeader.id == bindparam("timesheet_id"))
+
+# Transición compare-and-swap: solo cambia si el parte sigue en ``from_status``
+# (y, en la variante con dueño, si es de ``owner_id``); RETURNING trae la fila nueva.
+TIMESHEET_TRANSITION = (
+    update(TimesheetHeader)
+    .where(TimesheetHeader.id == bindparam("timesheet_id"), TimesheetHeader.status == bindparam("from_status"))
+    .values(status=bindparam("to_status"))
+    .returning(TimesheetHeader)
+    .execution_options(synchronize_session=False, populate_existing=True)
+)
+TIMESHEET_TRANSITION_OWNED = TIMESHEET_TRANSITION.where(TimesheetHeader.user_id == bindparam("owner_id"))
+
+_OVERLAPS = (
+    TimesheetHeader.user_id == bindparam("user_id"),
+    TimesheetHeader.period_start <= bindparam("period_end"),
+    TimesheetHeader.period_end >= bindparam("period_start"),
+)
+OVERLAPPING_TIMESHEET = select(TimesheetHeader).where(*_OVERLAPS).limit(1)
+OVERLAPPING_TIMESHEET_EXCLUDING = (
+    select(TimesheetHeader).where(*_OVERLAPS, TimesheetHeader.id != bindparam("exclude_id")).limit(1)
+)
+
+MEMBERSHIP = select(UserProjectMembership).where(
+    UserProjectMembership.user_id == bindparam("user_id"),
+    UserProjectMembership.project_id == bindparam("project_id"),
+)
+
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+USER_BY_EMAIL_WITH_STATUS = USER_BY_EMAIL.options(selectinload(User.status))
+
+_DAY_ITEMS = (
+    TimesheetItem.header_id == bindparam("header_id"),
+    TimesheetItem.date == bindparam("item_date"),
+)
+DAILY_ITEM_HOURS = select(func.coalesce(func.sum(TimesheetItem.hours), 0)).where(*_DAY_ITEMS)
+DAILY_ITEM_HOURS_EXCLUDING = select(func.coalesce(func.sum(TimesheetItem.hours), 0)).where(
+    *_DAY_ITEMS, TimesheetItem.id != bindparam("exclude_id")
+)
+
+# Bloqueos que serializan las escrituras de ítems antes de leer el total
+# diario (``crud.lock_daily_total``). El advisory lock de Postgres se libera al
+# terminar la transacción y solo bloquea el mismo (parte, día): dos hashes de
+# parte que colisionen solo esperan de más, nunca validan mal.
+DAILY_TOTAL_ADVISORY_LOCK = text(
+    "SELECT pg_advisory_xact_lock(hashtext(CAST(:header_id AS text)), :item_date - DATE '2000-01-01')"
+).bindparams(
+    bindparam("header_id", type_=TimesheetHeader.__table__.c.id.type),
+    bindparam("item_date", type_=TimesheetItem.__table__.c.date.type),
+)
+# Varios días en una sola sentencia, en orden para no crear interbloqueos.
+DAILY_TOTALS_ADVISORY_LOCK = text(
+    "SELECT pg_advisory_xact_lock(hashtext(CAST(:header_id AS text)), day - DATE '2000-01-01') "
+    "FROM unnest(:item_dates) AS day ORDER BY day"
+).bindparams(
+    bindparam("header_id", type_=TimesheetHeader.__table__.c.id.type),
+    bindparam("item_dates", type_=ARRAY(TimesheetItem.__table__.c.date.type)),
+)
+HEADER_FOR_UPDATE = select(TimesheetHeader.id).where(TimesheetHeader.id == bindparam("header_id")).with_for_update()
+# SQLite tiene un único bloqueo de escritura por base: una escritura nula lo
+# toma antes de leer la suma y lo retiene hasta el COMMIT.
+HEADER_WRITE_LOCK_SQLITE = text("UPDATE timesheet_header SET status = status WHERE id = :header_id").bindparams(
+    bindparam("header_id", type_=TimesheetHeader.__table__.c.id.type)
+)
+# Variantes del alta rápida, que bloquea antes de validar el parte: solo toman
+# el bloqueo si el parte existe y es del usuario.
+DAILY_TOTAL_ADVISORY_LOCK_OWNED = text(
+    "SELECT pg_advisory_xact_lock(hashtext(CAST(:header_id AS text)), :item_date - DATE '2000-01-01') "
+    "FROM timesheet_header WHERE id = :header_id AND user_id = :owner_id"
+).bindparams(
+    bindparam("header_id", type_=TimesheetHeader.__table__.c.id.type),
+    bindparam("item_date", type_=TimesheetItem.__table__.c.date.type),
+    bindparam("owner_id", type_=TimesheetHeader.__table__.c.user_id.type),
+)
+HEADER_FOR_UPDATE_OWNED = HEADER_FOR_UPDATE.where(TimesheetHeader.user_id == bindparam("owner_id"))
+HEADER_WRITE_LOCK_SQLITE_OWNED = text(
+    "UPDATE timesheet_header SET status = status WHERE id = :header_id AND user_id = :owner_id"
+).bindparams(
+    bindparam("header_id", type_=TimesheetHeader.__table__.c.id.type),
+    bindparam("owner_id", type_=TimesheetHeader.__table__.c.user_id.type),
+)
+
+
+# Alta validada de ítems (``services.timesheets.create_timesheet_item``).
+#
+# ``ITEM_INSERT_CHECKS`` devuelve siempre una fila con todo lo que validan las
+# reglas de negocio: estado y dueño del parte, existencia del proyecto,
+# pertenencia, límites del periodo y horas ya cargadas ese día. El INSERT
+# solo inserta si todas se cumplen.
+#
+# * Postgres (``VALIDATED_ITEM_INSERT``): CTE con el INSERT ... SELECT ...
+#   RETURNING unida a las comprobaciones; un único viaje devuelve el ítem o el
+#   motivo del rechazo.
+# * SQLite no admite DML en CTE (``VALIDATED_ITEM_INSERT_SQLITE``): INSERT ...
+#   SELECT ... RETURNING sobre las comprobaciones; si no inserta nada se
+#   ejecuta ``ITEM_INSERT_CHECKS`` para saber por qué.
+
+_header = TimesheetHeader.__table__
+_item = TimesheetItem.__table__
+_membership = UserProjectMembership.__table__
+
+_ITEM_HEADER_ID = bindparam("header_id", type_=_item.c.header_id.type)
+_ITEM_PROJECT_ID = bindparam("project_id", type_=_item.c.project_id.type)
+_ITEM_DATE = bindparam("item_date", type_=_item.c.date.type)
+_ITEM_HOURS = bindparam("hours", type_=_item.c.hours.type)
+_USER_ID = bindparam("user_id", type_=_header.c.user_id.type)
+_IS_ADMIN = bindparam("is_admin", type_=Boolean())
+
+_ITEM_VALUES = {
+    "id": bindparam("item_id", type_=_item.c.id.type),
+    "header_id": _ITEM_HEADER_ID,
+    "project_id": _ITEM_PROJECT_ID,
+    "date": _ITEM_DATE,
+    "description": bindparam("description", type_=_item.c.description.type),
+    "hours": _ITEM_HOURS,
+}
+
+_one_row = select(literal(1).label("one")).subquery("one_row")
+
+ITEM_INSERT_CHECKS = select(
+    _header.c.id.label("found_header_id"),
+    _header.c.user_id.label("owner_id"),
+    _header.c.status.label("header_status"),
+    _header.c.period_start,
+    _header.c.period_end,
+    exists().where(Project.id == _ITEM_PROJECT_ID).label("project_found"),
+    exists()
+    .where(_membership.c.user_id == _USER_ID, _membership.c.project_id == _ITEM_PROJECT_ID)
+    .label("is_member"),
+    select(func.coalesce(func.sum(_item.c.hours), 0))
+    .where(_item.c.header_id == _ITEM_HEADER_ID, _item.c.date == _ITEM_DATE)
+    .scalar_subquery()
+    .label("day_total"),
+).select_from(_one_row.outerjoin(_header, _header.c.id == _ITEM_HEADER_ID))
+
+
+def _validated_item_insert(checks):
+    allowed = and_(
+        checks.c.header_status == TimesheetStatus.DRAFT.value,
+        or_(_IS_ADMIN, checks.c.owner_id == _USER_ID),
+        checks.c.project_found,
+        or_(_IS_ADMIN, checks.c.is_member),
+        checks.c.period_start <= _ITEM_DATE,
+        checks.c.period_end >= _ITEM_DATE,
+        _ITEM_HOURS > 0,
+        _ITEM_HOURS <= 24,
+        checks.c.day_total + _ITEM_HOURS <= 24,
+    )
+    return (
+        insert(_item)
+        .from_select(list(_ITEM_VALUES), select(*_ITEM_VALUES.values()).select_from(checks).where(allowed))
+        .returning(*_item.c)
+    )
+
+
+_item_checks = ITEM_INSERT_CHECKS.cte("item_checks")
+_inserted_item = _validated_item_insert(_item_checks).cte("inserted_item")
+VALIDATED_ITEM_INSERT = select(_item_checks, _inserted_item).select_from(
+    _item_checks.outerjoin(_inserted_item, true())
+)
+VALIDATED_ITEM_INSERT_SQLITE = _validated_item_insert(ITEM_INSERT_CHECKS.subquery("item_checks"))
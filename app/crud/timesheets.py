@@ -1,51 +1,154 @@
 from datetime import date
-from typing import List, Optional
-from uuid import UUID
+from typing import Any, Iterable, List, Optional
+from uuid import UUID, uuid4
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, exists, func, insert, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, make_transient_to_detached
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import TimesheetHeader, TimesheetItem
-from app.models.timesheet import TimesheetStatus
+from app.core import unit_of_work
+from app.crud import statements
+from app.models import Project, TimesheetHeader, TimesheetItem
+from app.models.timesheet import TIMESHEET_OVERLAP_CONSTRAINT, TimesheetStatus
 from app.schemas import TimesheetCreate, TimesheetItemCreate, TimesheetItemUpdate, TimesheetUpdate
 
 
 # Timesheet headers
 
-def list_timesheets(session: Session, user_id: Optional[UUID] = None) -> List[TimesheetHeader]:
+def _list_timesheets_statement(
+    user_id: Optional[UUID] = None,
+    *,
+    status: Optional[TimesheetStatus] = None,
+    period_from: Optional[date] = None,
+    period_to: Optional[date] = None,
+    project_id: Optional[UUID] = None,
+    account_id: Optional[UUID] = None,
+    after: Optional[tuple[date, UUID]] = None,
+    limit: Optional[int] = None,
+):
+    """Partes ordenados por ``(period_start, id)``, a partir de la clave ``after``.
+
+    El periodo selecciona los partes que se solapan con él; proyecto y cuenta,
+    los que tienen algún ítem imputado a ellos.
+    """
     statement = select(TimesheetHeader)
     if user_id:
         statement = statement.where(TimesheetHeader.user_id == user_id)
-    return list(session.exec(statement))
+    if status:
+        statement = statement.where(TimesheetHeader.status == status.value)
+    if period_from:
+        statement = statement.where(TimesheetHeader.period_end >= period_from)
+    if period_to:
+        statement = statement.where(TimesheetHeader.period_start <= period_to)
+    if project_id or account_id:
+        items = exists().where(TimesheetItem.header_id == TimesheetHeader.id)
+        if project_id:
+            items = items.where(TimesheetItem.project_id == project_id)
+        if account_id:
+            items = items.where(
+                TimesheetItem.project_id.in_(select(Project.id).where(Project.account_uuid == account_id))
+            )
+        statement = statement.where(items)
+    if after:
+        statement = statement.where(tuple_(TimesheetHeader.period_start, TimesheetHeader.id) > tuple_(*after))
+    statement = statement.order_by(TimesheetHeader.period_start, TimesheetHeader.id)
+    if limit:
+        statement = statement.limit(limit)
+    return statement
+
+
+def list_timesheets(session: Session, user_id: Optional[UUID] = None, **filters: Any) -> List[TimesheetHeader]:
+    return list(session.exec(_list_timesheets_statement(user_id, **filters)))
+
+
+async def list_timesheets_async(
+    session: AsyncSession, user_id: Optional[UUID] = None, **filters: Any
+) -> List[TimesheetHeader]:
+    return list(await session.exec(_list_timesheets_statement(user_id, **filters)))
+
+
+def _list_timesheets_with_totals_statement(user_id: Optional[UUID] = None, **filters: Any):
+    """La página de partes con sus ítems agregados por (día, proyecto) en un LEFT JOIN agrupado.
+
+    La página (con su ``LIMIT``) va en una subconsulta para que el límite
+    cuente partes y no filas del JOIN. Cada parte devuelve una fila por celda
+    (día, proyecto) con horas e ítems; los partes sin ítems, una fila con
+    ``NULL``. Nunca se carga la relación ``TimesheetHeader.items``.
+    """
+    page = _list_timesheets_statement(user_id, **filters).subquery()
+    header = aliased(TimesheetHeader, page)
+    return (
+        select(
+            header,
+            TimesheetItem.date,
+            TimesheetItem.project_id,
+            func.sum(TimesheetItem.hours).label("hours"),
+            func.count(TimesheetItem.id).label("items"),
+        )
+        .outerjoin(TimesheetItem, TimesheetItem.header_id == header.id)
+        .group_by(*page.c, TimesheetItem.date, TimesheetItem.project_id)
+        .order_by(header.period_start, header.id, TimesheetItem.date)
+    )
+
+
+def list_timesheets_with_totals(session: Session, user_id: Optional[UUID] = None, **filters: Any) -> List[Row]:
+    return list(session.exec(_list_timesheets_with_totals_statement(user_id, **filters)))
+
+
+async def list_timesheets_with_totals_async(
+    session: AsyncSession, user_id: Optional[UUID] = None, **filters: Any
+) -> List[Row]:
+    return list(await session.exec(_list_timesheets_with_totals_statement(user_id, **filters)))
 
 
 def get_timesheet(session: Session, timesheet_id: UUID) -> Optional[TimesheetHeader]:
-    statement = (
-        select(TimesheetHeader)
-        .where(TimesheetHeader.id == timesheet_id)
-        .options(selectinload(TimesheetHeader.items))
+    return session.exec(statements.TIMESHEET_BY_ID, params={"timesheet_id": timesheet_id}).first()
+
+
+def get_timesheet_with_items(session: Session, timesheet_id: UUID) -> Optional[TimesheetHeader]:
+    return (
+        session.exec(statements.TIMESHEET_WITH_ITEMS_BY_ID, params={"timesheet_id": timesheet_id}).unique().first()
     )
-    return session.exec(statement).first()
+
+
+def get_timesheet_header(session: Session, timesheet_id: UUID) -> Optional[TimesheetHeader]:
+    return session.exec(statements.TIMESHEET_HEADER_BY_ID, params={"timesheet_id": timesheet_id}).first()
+
+
+async def get_timesheet_async(session: AsyncSession, timesheet_id: UUID) -> Optional[TimesheetHeader]:
+    return (await session.exec(statements.TIMESHEET_BY_ID, params={"timesheet_id": timesheet_id})).first()
+
+
+async def get_timesheet_header_async(session: AsyncSession, timesheet_id: UUID) -> Optional[TimesheetHeader]:
+    return (await session.exec(statements.TIMESHEET_HEADER_BY_ID, params={"timesheet_id": timesheet_id})).first()
 
 
 def find_overlapping_timesheet(
     session: Session, user_id: UUID, period_start: date, period_end: date, exclude_id: Optional[UUID] = None
 ) -> Optional[TimesheetHeader]:
-    statement = select(TimesheetHeader).where(
-        TimesheetHeader.user_id == user_id,
-        TimesheetHeader.period_start <= period_end,
-        TimesheetHeader.period_end >= period_start,
-    )
+    params = {"user_id": user_id, "period_start": period_start, "period_end": period_end}
+    statement = statements.OVERLAPPING_TIMESHEET
     if exclude_id:
-        statement = statement.where(TimesheetHeader.id != exclude_id)
-    return session.exec(statement).first()
+        statement, params["exclude_id"] = statements.OVERLAPPING_TIMESHEET_EXCLUDING, exclude_id
+    return session.exec(statement, params=params).first()
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    """``True`` si el error viene de la exclusión de periodos (Postgres) o de su trigger (SQLite)."""
+
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None and getattr(diag, "constraint_name", None):
+        return diag.constraint_name == TIMESHEET_OVERLAP_CONSTRAINT
+    return TIMESHEET_OVERLAP_CONSTRAINT in str(exc.orig)
 
 
 def create_timesheet(session: Session, user_id: UUID, timesheet_in: TimesheetCreate) -> TimesheetHeader:
     timesheet = TimesheetHeader(user_id=user_id, status=TimesheetStatus.DRAFT, **timesheet_in.model_dump())
     session.add(timesheet)
-    session.commit()
-    session.refresh(timesheet)
+    unit_of_work.persist(session, timesheet)
     return timesheet
 
 
@@ -56,47 +159,268 @@ def update_timesheet(
     for field, value in update_data.items():
         setattr(timesheet, field, value)
     session.add(timesheet)
-    session.commit()
-    session.refresh(timesheet)
+    unit_of_work.persist(session, timesheet)
     return timesheet
 
 
 def delete_timesheet(session: Session, timesheet: TimesheetHeader) -> None:
     session.delete(timesheet)
-    session.commit()
+    unit_of_work.persist(session)
+
+
+def transition_timesheet(
+    session: Session,
+    timesheet_id: UUID,
+    from_status: TimesheetStatus,
+    to_status: TimesheetStatus,
+    owner_id: Optional[UUID] = None,
+) -> Optional[TimesheetHeader]:
+    """Cambia el estado de un parte si sigue en ``from_status``; ``None`` si no cambió."""
+    statement = statements.TIMESHEET_TRANSITION if owner_id is None else statements.TIMESHEET_TRANSITION_OWNED
+    params = {"timesheet_id": timesheet_id, "from_status": from_status.value, "to_status": to_status.value}
+    if owner_id is not None:
+        params["owner_id"] = owner_id
+    timesheet = session.scalars(statement, params).first()
+    if timesheet is not None:
+        unit_of_work.persist(session, timesheet)
+    return timesheet
+
+
+def transition_timesheets(
+    session: Session,
+    from_status: TimesheetStatus,
+    to_status: TimesheetStatus,
+    *,
+    timesheet_ids: Optional[Iterable[UUID]] = None,
+    user_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+) -> list[UUID]:
+    """Cambia de estado, en una sola sentencia, los partes que cumplen los criterios.
+
+    ``UPDATE ... WHERE status = :from_status ... RETURNING id``: solo pasan los
+    partes que siguen en ``from_status`` al ejecutarse, sin leerlos antes. El
+    periodo selecciona los partes que se solapan con él.
+    """
+    statement = update(TimesheetHeader).where(TimesheetHeader.status == from_status.value)
+    if timesheet_ids is not None:
+        statement = statement.where(TimesheetHeader.id.in_(list(timesheet_ids)))
+    if user_id:
+        statement = statement.where(TimesheetHeader.user_id == user_id)
+    if period_start:
+        statement = statement.where(TimesheetHeader.period_end >= period_start)
+    if period_end:
+        statement = statement.where(TimesheetHeader.period_start <= period_end)
+    if project_id:
+        statement = statement.where(
+            exists().where(TimesheetItem.header_id == TimesheetHeader.id, TimesheetItem.project_id == project_id)
+        )
+    statement = (
+        statement.values(status=to_status.value)
+        .returning(TimesheetHeader.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    transitioned = list(session.scalars(statement))
+    unit_of_work.persist(session)
+    return transitioned
+
+
+def get_timesheet_statuses(session: Session, timesheet_ids: Iterable[UUID]) -> dict[UUID, str]:
+    rows = session.exec(
+        select(TimesheetHeader.id, TimesheetHeader.status).where(TimesheetHeader.id.in_(list(timesheet_ids)))
+    )
+    return {timesheet_id: timesheet_status for timesheet_id, timesheet_status in rows}
 
 
 # Timesheet items
 
-def list_items(session: Session, header_id: Optional[UUID] = None) -> List[TimesheetItem]:
+def _list_items_statement(
+    header_id: Optional[UUID] = None,
+    *,
+    project_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[tuple[date, UUID]] = None,
+    limit: Optional[int] = None,
+):
+    """Ítems ordenados por ``(date, id)``, a partir de la clave ``after``."""
     statement = select(TimesheetItem)
     if header_id:
         statement = statement.where(TimesheetItem.header_id == header_id)
-    return list(session.exec(statement))
+    if project_id:
+        statement = statement.where(TimesheetItem.project_id == project_id)
+    if date_from:
+        statement = statement.where(TimesheetItem.date >= date_from)
+    if date_to:
+        statement = statement.where(TimesheetItem.date <= date_to)
+    if after:
+        statement = statement.where(tuple_(TimesheetItem.date, TimesheetItem.id) > tuple_(*after))
+    statement = statement.order_by(TimesheetItem.date, TimesheetItem.id)
+    if limit:
+        statement = statement.limit(limit)
+    return statement
+
+
+def list_items(session: Session, header_id: Optional[UUID] = None, **filters: Any) -> List[TimesheetItem]:
+    return list(session.exec(_list_items_statement(header_id, **filters)))
+
+
+async def list_items_async(
+    session: AsyncSession, header_id: Optional[UUID] = None, **filters: Any
+) -> List[TimesheetItem]:
+    return list(await session.exec(_list_items_statement(header_id, **filters)))
 
 
 def get_item(session: Session, item_uuid: UUID) -> Optional[TimesheetItem]:
     return session.get(TimesheetItem, item_uuid)
 
 
+async def get_item_async(session: AsyncSession, item_uuid: UUID) -> Optional[TimesheetItem]:
+    return await session.get(TimesheetItem, item_uuid)
+
+
+def daily_item_hours(
+    session: Session, header_id: UUID, item_date: date, exclude_id: Optional[UUID] = None
+) -> float:
+    """Suma de horas cargadas en ``item_date`` dentro del parte."""
+    params = {"header_id": header_id, "item_date": item_date}
+    statement = statements.DAILY_ITEM_HOURS
+    if exclude_id:
+        statement, params["exclude_id"] = statements.DAILY_ITEM_HOURS_EXCLUDING, exclude_id
+    return float(session.exec(statement, params=params).one() or 0)
+
+
+def lock_daily_total(
+    session: Session, header_id: UUID, item_date: date, mode: str = "advisory", owner_id: Optional[UUID] = None
+) -> None:
+    """Serializa hasta el fin de la transacción las escrituras de ítems del parte en ``item_date``.
+
+    ``mode``: ``advisory`` (Postgres: advisory lock por parte y día),
+    ``header`` (Postgres: ``SELECT ... FOR UPDATE`` del parte, serializa todo
+    el parte) u ``off``. En SQLite cualquier modo distinto de ``off`` toma el
+    bloqueo de escritura de la base. Requiere READ COMMITTED: la lectura
+    posterior del total debe ver lo confirmado mientras se esperaba.
+
+    Con ``owner_id`` el bloqueo solo se toma si el parte existe y es de ese
+    usuario, para quien bloquea antes de validar el parte.
+    """
+    if mode == "off":
+        return
+    params = {"header_id": header_id, "item_date": item_date}
+    owned = owner_id is not None
+    if owned:
+        params["owner_id"] = owner_id
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        if mode == "advisory":
+            statement = statements.DAILY_TOTAL_ADVISORY_LOCK_OWNED if owned else statements.DAILY_TOTAL_ADVISORY_LOCK
+        else:
+            statement = statements.HEADER_FOR_UPDATE_OWNED if owned else statements.HEADER_FOR_UPDATE
+        session.execute(statement, params)
+    elif dialect == "sqlite":
+        statement = statements.HEADER_WRITE_LOCK_SQLITE_OWNED if owned else statements.HEADER_WRITE_LOCK_SQLITE
+        session.execute(statement, params)
+
+
+def lock_daily_totals(
+    session: Session, header_id: UUID, item_dates: Iterable[date], mode: str = "advisory"
+) -> None:
+    """Como :func:`lock_daily_total` para varios días del parte, en una sola sentencia."""
+    days = sorted(set(item_dates))
+    if mode == "off" or not days:
+        return
+    if len(days) == 1 or session.get_bind().dialect.name != "postgresql" or mode != "advisory":
+        lock_daily_total(session, header_id, days[0], mode)
+        return
+    session.execute(statements.DAILY_TOTALS_ADVISORY_LOCK, {"header_id": header_id, "item_dates": days})
+
+
+def apply_item_changes(
+    session: Session,
+    header_id: UUID,
+    creates: list[dict[str, Any]],
+    updates: list[dict[str, Any]],
+    deletes: list[UUID],
+) -> tuple[list[TimesheetItem], list[TimesheetItem]]:
+    """Aplica un lote ya validado con una sentencia por tipo de cambio.
+
+    ``creates`` y ``updates`` son diccionarios con ``id`` y los campos del ítem.
+    Devuelve los ítems creados (por RETURNING) y los actualizados (releídos
+    en una consulta para traer ``updated_at``).
+    """
+    if deletes:
+        session.execute(delete(TimesheetItem).where(TimesheetItem.id.in_(deletes)))
+    updated: list[TimesheetItem] = []
+    if updates:
+        session.execute(update(TimesheetItem), updates)
+        updated = list(
+            session.exec(
+                select(TimesheetItem)
+                .where(TimesheetItem.id.in_([values["id"] for values in updates]))
+                .execution_options(populate_existing=True)
+            )
+        )
+    created: list[TimesheetItem] = []
+    if creates:
+        rows = [{**values, "header_id": header_id} for values in creates]
+        created = list(session.scalars(insert(TimesheetItem).returning(TimesheetItem), rows))
+    unit_of_work.persist(session)
+    return created, updated
+
+
 def create_item(session: Session, header_id: UUID, item_in: TimesheetItemCreate) -> TimesheetItem:
     item = TimesheetItem(header_id=header_id, **item_in.model_dump())
     session.add(item)
-    session.commit()
-    session.refresh(item)
+    unit_of_work.persist(session, item)
     return item
 
 
+def create_item_validated(
+    session: Session, header_id: UUID, user_id: UUID, is_admin: bool, item_in: TimesheetItemCreate
+) -> tuple[Optional[TimesheetItem], Optional[Row[Any]]]:
+    """Inserta el ítem solo si pasa todas las reglas de negocio, en una sola sentencia.
+
+    Devuelve ``(ítem, None)`` si se insertó o ``(None, comprobaciones)`` si no,
+    para que el servicio traduzca la primera regla incumplida a su error.
+    """
+    params = {
+        "item_id": uuid4(),
+        "header_id": header_id,
+        "user_id": user_id,
+        "is_admin": is_admin,
+        "project_id": item_in.project_id,
+        "item_date": item_in.date,
+        "description": item_in.description,
+        "hours": item_in.hours,
+    }
+    if session.get_bind().dialect.name == "postgresql":
+        row = session.execute(statements.VALIDATED_ITEM_INSERT, params).one()
+        if row.id is None:
+            return None, row
+    else:
+        row = session.execute(statements.VALIDATED_ITEM_INSERT_SQLITE, params).first()
+        if row is None:
+            return None, session.execute(statements.ITEM_INSERT_CHECKS, params).one()
+
+    # El RETURNING trae la fila completa: se incorpora a la sesión sin releerla.
+    values = row._mapping
+    item = TimesheetItem(**{name: values[name] for name in TimesheetItem.__table__.c.keys()})
+    make_transient_to_detached(item)
+    session.add(item)
+    unit_of_work.persist(session)
+    return item, None
+
+
 def update_item(session: Session, item: TimesheetItem, item_in: TimesheetItemCreate | TimesheetItemUpdate) -> TimesheetItem:
     update_data = item_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(item, field, value)
     session.add(item)
-    session.commit()
-    session.refresh(item)
+    unit_of_work.persist(session, item)
     return item
 
 
 def delete_item(session: Session, item: TimesheetItem) -> None:
     session.delete(item)
-    session.commit()
+    unit_of_work.persist(session)
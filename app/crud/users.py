@@ -2,9 +2,14 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import status
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import unit_of_work
+from app.core.cache import principal_cache
 from app.core.errors import BusinessRuleException
+from app.crud import statements
 from app.models import User, UserProfile
 from app.schemas import UserCreate, UserProfileUpdate, UserUpdate
 
@@ -17,8 +22,17 @@ def get(session: Session, user_id: UUID) -> Optional[User]:
     return session.get(User, user_id)
 
 
+async def get_async(session: AsyncSession, user_id: UUID) -> Optional[User]:
+    # ``status`` se carga en la misma consulta: fuera de ``run_sync`` no hay lazy loading.
+    return await session.get(User, user_id, options=[selectinload(User.status)])
+
+
 def get_by_email(session: Session, email: str) -> Optional[User]:
-    return session.exec(select(User).where(User.email == email)).first()
+    return session.exec(statements.USER_BY_EMAIL, params={"email": email}).first()
+
+
+async def get_by_email_async(session: AsyncSession, email: str) -> Optional[User]:
+    return (await session.exec(statements.USER_BY_EMAIL_WITH_STATUS, params={"email": email})).first()
 
 
 def get_by_user_id(session: Session, user_id: str) -> Optional[User]:
@@ -40,8 +54,7 @@ def create(session: Session, user_in: UserCreate, hashed_password: str) -> User:
         )
     user = User(**user_in.model_dump(exclude={"password"}), hashed_password=hashed_password)
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    unit_of_work.persist(session, user)
     return user
 
 
@@ -64,19 +77,37 @@ def update(session: Session, user: User, user_in: UserUpdate, hashed_password: s
                 status_code=status.HTTP_400_BAD_REQUEST,
                 details={"user_id": update_data["user_id"]},
             )
+    authorization_changed = any(
+        field in update_data and update_data[field] != getattr(user, field) for field in ("role", "status_id", "account_uuid")
+    )
+    if authorization_changed:
+        user.token_version += 1
     for field, value in update_data.items():
         setattr(user, field, value)
     if hashed_password:
         user.hashed_password = hashed_password
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    unit_of_work.persist(session, user)
+    user_uuid = user.id
+    unit_of_work.after_commit(session, lambda: principal_cache.invalidate(user_uuid))
+    return user
+
+
+def bump_token_version(session: Session, user: User) -> User:
+    """Invalida todos los access tokens emitidos hasta ahora para el usuario."""
+    user.token_version += 1
+    session.add(user)
+    unit_of_work.persist(session, user)
+    user_uuid = user.id
+    unit_of_work.after_commit(session, lambda: principal_cache.invalidate(user_uuid))
     return user
 
 
 def delete(session: Session, user: User) -> None:
+    user_uuid = user.id
     session.delete(user)
-    session.commit()
+    unit_of_work.persist(session)
+    unit_of_work.after_commit(session, lambda: principal_cache.invalidate(user_uuid))
 
 
 def get_profile(session: Session, user_uuid: UUID) -> Optional[UserProfile]:
@@ -86,8 +117,7 @@ def get_profile(session: Session, user_uuid: UUID) -> Optional[UserProfile]:
 def create_profile(session: Session, user_uuid: UUID) -> UserProfile:
     profile = UserProfile(user_uuid=user_uuid)
     session.add(profile)
-    session.commit()
-    session.refresh(profile)
+    unit_of_work.persist(session, profile)
     return profile
 
 
@@ -96,6 +126,5 @@ def update_profile(session: Session, profile: UserProfile, profile_in: UserProfi
     for field, value in update_data.items():
         setattr(profile, field, value)
     session.add(profile)
-    session.commit()
-    session.refresh(profile)
+    unit_of_work.persist(session, profile)
     return profile
@@ -1,11 +1,15 @@
 from fastapi import FastAPI
 
-from app.core.database import init_db
+from app.core.database import dispose_async_engine, init_db
 from app.core.errors import register_exception_handlers
+from app.core import query_stats, replicas
+from app.core.hashing import hashing_pool
+from app.services.maintenance import refresh_token_purger
 from app.utils.logging import setup_logging
 from app.routers import (
     accounts_router,
     auth_router,
+    metrics_router,
     profile_router,
     projects_router,
     reports_router,
@@ -24,12 +28,35 @@ app = FastAPI(
 
 # Registrar manejadores globales
 register_exception_handlers(app)
+app.middleware("http")(replicas.read_your_writes_middleware)
+
+# Contador de sentencias SQL por petición (cabeceras X-DB-*, logs y /metrics)
+if query_stats.SQL_QUERY_STATS_ENABLED:
+    query_stats.query_stats_monitor.install()
+app.middleware("http")(query_stats.query_stats_middleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
-    """Validar conexión y registrar metadata para migraciones."""
+    """Validar conexión, registrar metadata y programar el mantenimiento."""
     init_db()
+    refresh_token_purger.start()
+    replicas.replica_router.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    """Liberar los workers de hashing y detener las tareas de fondo."""
+    refresh_token_purger.stop()
+    replicas.replica_router.stop()
+    hashing_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_async() -> None:
+    """Cerrar las conexiones del engine asíncrono, si llegó a crearse."""
+    await replicas.replica_router.dispose_async()
+    await dispose_async_engine()
 
 
 @app.get("/")
@@ -44,3 +71,4 @@ app.include_router(accounts_router)
 app.include_router(projects_router)
 app.include_router(reports_router)
 app.include_router(timesheets_router)
+app.include_router(metrics_router)
@@ -1,4 +1,5 @@
 from app.models.account import Account, Project, ProjectStatus
+from app.models.login_throttle import LoginThrottleBucket
 from app.models.refresh_token import RefreshToken
 from app.models.timesheet import TimesheetHeader, TimesheetItem, TimesheetStatus
 from app.models.user import User, UserStatus
@@ -7,6 +8,7 @@ from app.models.project_membership import UserProjectMembership
 
 __all__ = [
     "Account",
+    "LoginThrottleBucket",
     "Project",
     "ProjectStatus",
     "RefreshToken",
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 
 class Account(SQLModel, table=True):
     __tablename__ = "accounts"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     account_id: str = Field(sa_column=Column(String(25), unique=True, nullable=False, index=True))
@@ -37,6 +38,7 @@ class ProjectStatus(SQLModel, table=True):
 
 class Project(SQLModel, table=True):
     __tablename__ = "projects"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     code: str = Field(sa_column=Column(String(16), unique=True, nullable=False, index=True))
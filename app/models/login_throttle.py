@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Float, String
+from sqlmodel import Field, SQLModel
+
+
+class LoginThrottleBucket(SQLModel, table=True):
+    """Estado compartido de un token bucket de login (``LOGIN_THROTTLE_STORE=database``)."""
+
+    __tablename__ = "login_throttle_buckets"
+
+    key: str = Field(sa_column=Column(String(400), primary_key=True))
+    tokens: float = Field(sa_column=Column(Float, nullable=False))
+    updated_at: float = Field(sa_column=Column(Float, nullable=False))
@@ -1,7 +1,7 @@
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:  # pragma: no cover - solo para type hints
@@ -18,3 +18,6 @@ class UserProjectMembership(SQLModel, table=True):
 
     user: Optional["User"] = Relationship(back_populates="project_memberships")
     project: Optional["Project"] = Relationship(back_populates="memberships")
+
+    # La clave primaria empieza por user_id; las consultas por proyecto necesitan su propio índice.
+    __table_args__ = (Index("ix_user_project_membership_project_id", "project_id", "user_id"),)
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, String, text
+from sqlalchemy import Column, DateTime, Index, String, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -11,11 +11,21 @@ if TYPE_CHECKING:
 
 class RefreshToken(SQLModel, table=True):
     __tablename__ = "refresh_tokens"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Purga de tokens revocados sin recorrer la tabla.
+        Index(
+            "ix_refresh_tokens_revoked",
+            "expires_at",
+            postgresql_where=text("revoked"),
+            sqlite_where=text("revoked = 1"),
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     jti: str = Field(sa_column=Column(String(64), unique=True, nullable=False, index=True))
-    user_id: UUID = Field(nullable=False, foreign_key="users.id")
-    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=False), nullable=False))
+    user_id: UUID = Field(nullable=False, foreign_key="users.id", index=True)
+    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=False), nullable=False, index=True))
     revoked: bool = Field(default=False, nullable=False)
     revoked_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=False)))
     created_at: datetime = Field(
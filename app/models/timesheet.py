@@ -3,7 +3,8 @@ from enum import Enum
 from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import CheckConstraint, Column, Date, DateTime, Numeric, String, text
+from sqlalchemy import DDL, CheckConstraint, Column, Date, DateTime, Index, Numeric, String, event, func, literal, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -11,6 +12,11 @@ if TYPE_CHECKING:
     from app.models.user import User
 
 
+# Nombre de la restricción (y del mensaje de los triggers de SQLite) que impide
+# solapar periodos de un mismo usuario; ``crud.is_overlap_violation`` lo busca.
+TIMESHEET_OVERLAP_CONSTRAINT = "ex_timesheet_header_no_overlap"
+
+
 class TimesheetStatus(str, Enum):
     DRAFT = "Draft"
     SUBMITTED = "Submitted"
@@ -20,6 +26,7 @@ class TimesheetStatus(str, Enum):
 
 class TimesheetHeader(SQLModel, table=True):
     __tablename__ = "timesheet_header"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     user_id: UUID = Field(foreign_key="users.id")
@@ -46,11 +53,69 @@ class TimesheetHeader(SQLModel, table=True):
 
     __table_args__ = (
         CheckConstraint("period_start <= period_end", name="ck_timesheet_period_valid"),
+        # Listado por usuario y detección de solapes (user_id + periodo).
+        Index("ix_timesheet_header_user_period", "user_id", "period_start", "period_end"),
+        # Paginación por clave (period_start, id) del listado global de admins.
+        Index("ix_timesheet_header_period_id", "period_start", "id"),
+        # Cola de aprobación: solo los partes enviados.
+        Index(
+            "ix_timesheet_header_submitted",
+            "period_start",
+            "user_id",
+            postgresql_where=text("status = 'Submitted'"),
+            sqlite_where=text("status = 'Submitted'"),
+        ),
+    )
+
+
+_header_table = TimesheetHeader.__table__
+
+# Postgres: exclusión GiST sobre (user_id, daterange cerrado). btree_gist aporta
+# la igualdad de UUID dentro del índice GiST.
+_header_table.append_constraint(
+    ExcludeConstraint(
+        (_header_table.c.user_id, "="),
+        (func.daterange(_header_table.c.period_start, _header_table.c.period_end, literal("[]")), "&&"),
+        name=TIMESHEET_OVERLAP_CONSTRAINT,
+        using="gist",
+    ).ddl_if(dialect="postgresql")
+)
+event.listen(
+    _header_table,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+# SQLite no tiene restricciones de exclusión: triggers equivalentes. SQLite
+# serializa las escrituras, así que la comprobación no tiene carreras.
+TIMESHEET_OVERLAP_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tr_timesheet_header_no_overlap_insert
+    BEFORE INSERT ON timesheet_header
+    WHEN EXISTS (
+        SELECT 1 FROM timesheet_header
+        WHERE user_id = NEW.user_id AND period_start <= NEW.period_end AND period_end >= NEW.period_start
+    )
+    BEGIN SELECT RAISE(ABORT, '{TIMESHEET_OVERLAP_CONSTRAINT}'); END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tr_timesheet_header_no_overlap_update
+    BEFORE UPDATE OF user_id, period_start, period_end ON timesheet_header
+    WHEN EXISTS (
+        SELECT 1 FROM timesheet_header
+        WHERE id != OLD.id AND user_id = NEW.user_id
+          AND period_start <= NEW.period_end AND period_end >= NEW.period_start
     )
+    BEGIN SELECT RAISE(ABORT, '{TIMESHEET_OVERLAP_CONSTRAINT}'); END
+    """,
+]
+for _trigger in TIMESHEET_OVERLAP_TRIGGERS:
+    event.listen(_header_table, "after_create", DDL(_trigger).execute_if(dialect="sqlite"))
 
 
 class TimesheetItem(SQLModel, table=True):
     __tablename__ = "timesheet_item"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     header_id: UUID = Field(foreign_key="timesheet_header.id")
@@ -75,4 +140,10 @@ class TimesheetItem(SQLModel, table=True):
 
     __table_args__ = (
         CheckConstraint("hours > 0 AND hours <= 24", name="ck_timesheet_item_hours_range"),
+        # Total diario y listado de ítems de un parte; en Postgres cubre la suma de horas.
+        Index("ix_timesheet_item_header_date", "header_id", "date", postgresql_include=["hours"]),
+        # Reporte por proyecto en un rango de fechas.
+        Index("ix_timesheet_item_project_date", "project_id", "date", postgresql_include=["header_id", "hours"]),
+        # Reportes globales por rango de fechas (por usuario y por estado).
+        Index("ix_timesheet_item_date", "date", postgresql_include=["header_id", "hours"]),
     )
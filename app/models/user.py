@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, String, text
+from sqlalchemy import Column, DateTime, Integer, String, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.project_membership import UserProjectMembership
@@ -27,6 +27,7 @@ class UserStatus(SQLModel, table=True):
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     user_id: str = Field(sa_column=Column(String(25), unique=True, nullable=False, index=True))
@@ -40,6 +41,10 @@ class User(SQLModel, table=True):
     )
     hashed_password: str = Field(sa_column=Column(String(255), nullable=False))
     status_id: int = Field(default=1, foreign_key="user_status.id")
+    token_version: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default=text("0")),
+    )
     created_at: Optional[datetime] = Field(
         default=None, sa_column=Column(DateTime(timezone=False), server_default=text("CURRENT_TIMESTAMP"))
     )
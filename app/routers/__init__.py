@@ -1,14 +1,22 @@
+from app.core.database import DB_ASYNC
 from app.routers.accounts import router as accounts_router
 from app.routers.auth import router as auth_router
+from app.routers.metrics import router as metrics_router
 from app.routers.profile import router as profile_router
 from app.routers.projects import router as projects_router
 from app.routers.reports import router as reports_router
 from app.routers.timesheets import router as timesheets_router
 from app.routers.users import router as users_router
 
+if DB_ASYNC:
+    from app.routers.auth_async import router as auth_router  # noqa: F811
+    from app.routers.reports_async import router as reports_router  # noqa: F811
+    from app.routers.timesheets_async import router as timesheets_router  # noqa: F811
+
 __all__ = [
     "accounts_router",
     "auth_router",
+    "metrics_router",
     "profile_router",
     "projects_router",
     "reports_router",
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
 
 from app.core.dependencies import get_session
-from app.core.security import get_current_user
+from app.core.security import get_current_principal, get_current_user
+from app.core.throttling import login_throttle
 from app.schemas import ErrorResponse, Token, TokenRefreshRequest, UserRead
 from app.services import auth as auth_service
 
@@ -15,11 +16,19 @@ auth_error_responses = {
     422: {"model": ErrorResponse, "description": "Entrada inválida"},
 }
 
+login_error_responses = {
+    **auth_error_responses,
+    429: {"model": ErrorResponse, "description": "Demasiados intentos"},
+}
+
 
-@router.post("/login", response_model=Token, responses=auth_error_responses)
+@router.post("/login", response_model=Token, responses=login_error_responses)
 def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: Session = Depends(get_session),
 ) -> Token:
+    login_throttle.check(form_data.username, request.client.host if request.client else None)
     return auth_service.login(session, form_data.username, form_data.password)
 
 
@@ -33,6 +42,11 @@ def logout(payload: TokenRefreshRequest, session: Session = Depends(get_session)
     auth_service.revoke_token(session, payload.refresh_token)
 
 
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT, responses=auth_error_responses)
+def logout_all(current_user=Depends(get_current_principal), session: Session = Depends(get_session)) -> None:
+    auth_service.logout_everywhere(session, current_user.id)
+
+
 @router.get("/me", response_model=UserRead, responses=auth_error_responses)
 def read_users_me(current_user=Depends(get_current_user)) -> UserRead:
     return UserRead.model_validate(current_user)
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.dependencies import get_async_session
+from app.core.security import get_current_principal_async, get_current_user_async
+from app.core.throttling import login_throttle
+from app.routers.auth import auth_error_responses, login_error_responses
+from app.schemas import Token, TokenRefreshRequest, UserRead
+from app.services import auth as auth_service
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/login", response_model=Token, responses=login_error_responses)
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+) -> Token:
+    client_ip = request.client.host if request.client else None
+    if login_throttle.store.name == "memory":
+        login_throttle.check(form_data.username, client_ip)
+    else:
+        await run_in_threadpool(login_throttle.check, form_data.username, client_ip)
+    return await auth_service.login_async(session, form_data.username, form_data.password)
+
+
+@router.post("/refresh", response_model=Token, responses=auth_error_responses)
+async def refresh_tokens(
+    payload: TokenRefreshRequest, session: AsyncSession = Depends(get_async_session)
+) -> Token:
+    return await auth_service.refresh_session_async(session, payload.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, responses=auth_error_responses)
+async def logout(payload: TokenRefreshRequest, session: AsyncSession = Depends(get_async_session)) -> None:
+    await auth_service.revoke_token_async(session, payload.refresh_token)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT, responses=auth_error_responses)
+async def logout_all(
+    current_user=Depends(get_current_principal_async), session: AsyncSession = Depends(get_async_session)
+) -> None:
+    await auth_service.logout_everywhere_async(session, current_user.id)
+
+
+@router.get("/me", response_model=UserRead, responses=auth_error_responses)
+async def read_users_me(current_user=Depends(get_current_user_async)) -> UserRead:
+    return UserRead.model_validate(current_user)
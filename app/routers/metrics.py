@@ -0,0 +1,41 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.core.cache import principal_cache, revoked_jti_cache
+from app.core import query_stats, replicas
+from app.core.database import engine, pool_monitor, slow_query_log
+from app.core.hashing import hashing_pool
+from app.core.security import role_required, token_cache
+from app.core.throttling import login_throttle
+from app.schemas import ErrorResponse
+from app.services.maintenance import refresh_token_purger
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(role_required("admin"))],
+)
+
+
+metrics_error_responses = {
+    401: {"model": ErrorResponse, "description": "No autenticado"},
+    403: {"model": ErrorResponse, "description": "No autorizado"},
+}
+
+
+@router.get("/", responses=metrics_error_responses)
+def read_metrics() -> dict[str, Any]:
+    """Contadores internos del proceso para observar cachés y recursos compartidos."""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": hashing_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "revoked_jti_cache": revoked_jti_cache.stats(),
+        "refresh_token_purge": refresh_token_purger.stats(),
+        "login_throttle": login_throttle.stats(),
+        "database_pool": pool_monitor.stats(engine),
+        "read_replicas": replicas.replica_router.stats(),
+        "sql_queries": query_stats.query_stats_monitor.stats(),
+        "slow_queries": slow_query_log.stats(),
+    }
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlmodel import Session
 
 from app.core.dependencies import get_session
-from app.core.security import get_current_user, role_required
+from app.core.security import get_current_principal, role_required
 from app.models import User
 from app.schemas import (
     ErrorResponse,
@@ -40,7 +40,7 @@ project_error_responses = {
 def create_project(
     project_in: ProjectCreate,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> ProjectRead:
     project = project_service.create_project(session, current_user, project_in)
     return ProjectRead.model_validate(project)
@@ -52,7 +52,7 @@ def list_projects(
     offset: int = Query(0, ge=0),
     ordering: Optional[str] = Query("-created_at"),
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> ProjectListResponse:
     projects, total = project_service.list_projects(
         session, current_user, limit, offset, ordering
@@ -69,7 +69,7 @@ def list_projects(
 def get_project(
     project_id: UUID,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> ProjectRead:
     project = project_service.get_project(session, current_user, project_id)
     return ProjectRead.model_validate(project)
@@ -80,7 +80,7 @@ def update_project(
     project_id: UUID,
     project_in: ProjectUpdate,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> ProjectRead:
     updated = project_service.update_project(session, current_user, project_id, project_in)
     return ProjectRead.model_validate(updated)
@@ -92,7 +92,7 @@ def update_project(
 def delete_project(
     project_id: UUID,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> None:
     project_service.delete_project(session, current_user, project_id)
 
@@ -106,7 +106,7 @@ def add_member(
     project_id: UUID,
     member_in: ProjectMemberCreate,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> dict[str, str]:
     project_service.add_member(session, current_user, project_id, member_in)
     return {"detail": "User added"}
@@ -116,7 +116,7 @@ def add_member(
 def list_members(
     project_id: UUID,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> ProjectMemberList:
     memberships = project_service.list_members(session, current_user, project_id)
     results = [
@@ -140,7 +140,7 @@ def remove_member(
     project_id: UUID,
     user_id: UUID,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
 ) -> dict[str, str]:
     project_service.remove_member(session, current_user, project_id, user_id)
     return {"detail": "User removed"}
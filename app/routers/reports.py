@@ -3,9 +3,9 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlmodel import Session
 
-from app.core.dependencies import get_session
+from app.core.dependencies import get_read_session
 from app.core.validators import validate_date_range, validate_project_id, validate_user_id
-from app.core.security import get_current_user, role_required
+from app.core.security import get_current_principal, role_required
 from app.models import User
 from app.schemas import (
     DateRange,
@@ -38,7 +38,7 @@ common_error_responses = {
 )
 def get_user_hours(
     date_range: DateRange = Depends(validate_date_range),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> list[UserHoursReport]:
     return report_service.get_user_hours_report(
@@ -54,7 +54,7 @@ def get_user_hours(
 def get_project_hours(
     project_id: UUID = Depends(validate_project_id),
     date_range: DateRange = Depends(validate_date_range),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> list[ProjectHoursReport]:
     return report_service.get_project_hours_report(
@@ -70,8 +70,8 @@ def get_project_hours(
 def get_user_project_hours(
     user_id: UUID = Depends(validate_user_id),
     date_range: DateRange = Depends(validate_date_range),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_principal),
 ) -> list[UserProjectHoursReport]:
     return report_service.get_user_projects_report(
         session, user_id, date_range.period_start, date_range.period_end, current_user
@@ -85,7 +85,7 @@ def get_user_project_hours(
 )
 def get_summary(
     date_range: DateRange = Depends(validate_date_range),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(role_required("admin")),
 ) -> SummaryReport:
     return report_service.get_status_summary(
@@ -0,0 +1,85 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.dependencies import get_async_read_session
+from app.core.security import get_current_principal_async, role_required_async
+from app.core.validators import validate_date_range, validate_project_id, validate_user_id
+from app.models import User
+from app.routers.reports import common_error_responses
+from app.schemas import (
+    DateRange,
+    ProjectHoursReport,
+    SummaryReport,
+    UserHoursReport,
+    UserProjectHoursReport,
+)
+from app.services import reports as report_service
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+)
+
+
+@router.get(
+    "/user-hours",
+    response_model=list[UserHoursReport],
+    responses=common_error_responses,
+)
+async def get_user_hours(
+    date_range: DateRange = Depends(validate_date_range),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> list[UserHoursReport]:
+    return await report_service.get_user_hours_report_async(
+        session, date_range.period_start, date_range.period_end, current_user
+    )
+
+
+@router.get(
+    "/project-hours/{project_id}",
+    response_model=list[ProjectHoursReport],
+    responses=common_error_responses,
+)
+async def get_project_hours(
+    project_id: UUID = Depends(validate_project_id),
+    date_range: DateRange = Depends(validate_date_range),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> list[ProjectHoursReport]:
+    return await report_service.get_project_hours_report_async(
+        session, project_id, date_range.period_start, date_range.period_end, current_user
+    )
+
+
+@router.get(
+    "/user/{user_id}/projects",
+    response_model=list[UserProjectHoursReport],
+    responses=common_error_responses,
+)
+async def get_user_project_hours(
+    user_id: UUID = Depends(validate_user_id),
+    date_range: DateRange = Depends(validate_date_range),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(get_current_principal_async),
+) -> list[UserProjectHoursReport]:
+    return await report_service.get_user_projects_report_async(
+        session, user_id, date_range.period_start, date_range.period_end, current_user
+    )
+
+
+@router.get(
+    "/summary",
+    response_model=SummaryReport,
+    responses=common_error_responses,
+)
+async def get_summary(
+    date_range: DateRange = Depends(validate_date_range),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin")),
+) -> SummaryReport:
+    return await report_service.get_status_summary_async(
+        session, date_range.period_start, date_range.period_end, current_user
+    )
@@ -1,21 +1,30 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlmodel import Session
 
-from app.core.dependencies import get_session
+from app.core.dependencies import get_read_session, get_session
 from app.core.validators import validate_item_id, validate_timesheet_id
 from app.core.security import role_required
 from app.models import User
 from app.services import timesheets as timesheet_service
 from app.schemas import (
     ErrorResponse,
+    TimesheetBulkTransition,
+    TimesheetBulkTransitionResponse,
     TimesheetCreate,
+    TimesheetGrid,
+    TimesheetGridResponse,
+    TimesheetItemBatch,
+    TimesheetItemBatchResponse,
     TimesheetItemCreate,
+    TimesheetItemListFilters,
     TimesheetItemRead,
     TimesheetItemUpdate,
     TimesheetActionResponse,
+    TimesheetListFilters,
+    TimesheetListRead,
     TimesheetRead,
     TimesheetUpdate,
 )
@@ -35,6 +44,14 @@ timesheet_error_responses = {
 }
 
 
+def set_next_cursor(request: Request, response: Response, cursor: Optional[str]) -> None:
+    """Publica el cursor de la página siguiente en ``X-Next-Cursor`` y en ``Link``."""
+
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
+
+
 @router.post("/", response_model=TimesheetRead, status_code=201, responses=timesheet_error_responses)
 def create_timesheet(
     timesheet_in: TimesheetCreate,
@@ -45,18 +62,34 @@ def create_timesheet(
     return TimesheetRead.model_validate(timesheet)
 
 
-@router.get("/", response_model=List[TimesheetRead], responses=timesheet_error_responses)
+@router.get("/", response_model=List[TimesheetListRead], responses=timesheet_error_responses)
 def list_timesheets(
-    session: Session = Depends(get_session), current_user: User = Depends(role_required("admin", "user"))
-) -> List[TimesheetRead]:
-    timesheets = timesheet_service.list_timesheets(session, current_user)
-    return [TimesheetRead.model_validate(timesheet) for timesheet in timesheets]
+    request: Request,
+    response: Response,
+    filters: TimesheetListFilters = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Query(timesheet_service.TIMESHEET_PAGE_SIZE, ge=1, le=timesheet_service.TIMESHEET_MAX_PAGE_SIZE),
+    include_totals: bool = False,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(role_required("admin", "user")),
+) -> List[TimesheetListRead]:
+    if include_totals:
+        summaries, next_cursor = timesheet_service.page_timesheet_summaries(
+            session, current_user, filters, cursor, limit
+        )
+    else:
+        timesheets, next_cursor = timesheet_service.page_timesheets(
+            session, current_user, filters, cursor, limit
+        )
+        summaries = [TimesheetListRead.model_validate(timesheet) for timesheet in timesheets]
+    set_next_cursor(request, response, next_cursor)
+    return summaries
 
 
 @router.get("/{timesheet_id}", response_model=TimesheetRead, responses=timesheet_error_responses)
 def get_timesheet(
     timesheet_id: UUID = Depends(validate_timesheet_id),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> TimesheetRead:
     timesheet = timesheet_service.get_timesheet(session, timesheet_id, current_user)
@@ -65,8 +98,8 @@ def get_timesheet(
 
 @router.put("/{timesheet_id}", response_model=TimesheetRead, responses=timesheet_error_responses)
 def update_timesheet(
-    timesheet_id: UUID = Depends(validate_timesheet_id),
     timesheet_in: TimesheetUpdate,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> TimesheetRead:
@@ -86,10 +119,11 @@ def delete_timesheet(
 @router.post("/{timesheet_id}/submit", response_model=TimesheetActionResponse, responses=timesheet_error_responses)
 def submit_timesheet(
     timesheet_id: UUID = Depends(validate_timesheet_id),
+    include_items: bool = False,
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> TimesheetActionResponse:
-    return timesheet_service.submit_timesheet(session, timesheet_id, current_user)
+    return timesheet_service.submit_timesheet(session, timesheet_id, current_user, include_items)
 
 
 @router.post(
@@ -99,89 +133,134 @@ def submit_timesheet(
 )
 def approve_timesheet(
     timesheet_id: UUID = Depends(validate_timesheet_id),
+    include_items: bool = False,
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin")),
 ) -> TimesheetActionResponse:
-    return timesheet_service.approve_timesheet(session, timesheet_id, current_user)
+    return timesheet_service.approve_timesheet(session, timesheet_id, current_user, include_items)
 
 
 @router.post("/{timesheet_id}/reject", response_model=TimesheetActionResponse, responses=timesheet_error_responses)
 def reject_timesheet(
     timesheet_id: UUID = Depends(validate_timesheet_id),
+    include_items: bool = False,
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin")),
 ) -> TimesheetActionResponse:
-    return timesheet_service.reject_timesheet(session, timesheet_id, current_user)
+    return timesheet_service.reject_timesheet(session, timesheet_id, current_user, include_items)
+
+
+@router.post(
+    "/bulk-transition", response_model=TimesheetBulkTransitionResponse, responses=timesheet_error_responses
+)
+def bulk_transition_timesheets(
+    request: TimesheetBulkTransition,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(role_required("admin")),
+) -> TimesheetBulkTransitionResponse:
+    return timesheet_service.bulk_transition_timesheets(session, request, current_user)
 
 
 @router.post(
-    "/{header_id}/items",
+    "/{timesheet_id}/items",
     response_model=TimesheetItemRead,
     status_code=status.HTTP_201_CREATED,
     responses=timesheet_error_responses,
 )
 def create_timesheet_item(
-    header_id: UUID = Depends(validate_timesheet_id),
     item_in: TimesheetItemCreate,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> TimesheetItemRead:
-    item = timesheet_service.create_timesheet_item(session, header_id, item_in, current_user)
+    item = timesheet_service.create_timesheet_item(session, timesheet_id, item_in, current_user)
     return TimesheetItemRead.model_validate(item)
 
 
+@router.put("/{timesheet_id}/grid", response_model=TimesheetGridResponse, responses=timesheet_error_responses)
+def save_timesheet_grid(
+    grid: TimesheetGrid,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(role_required("admin", "user")),
+) -> TimesheetGridResponse:
+    return timesheet_service.save_timesheet_grid(session, timesheet_id, grid, current_user)
+
+
+@router.post(
+    "/{timesheet_id}/items/batch",
+    response_model=TimesheetItemBatchResponse,
+    responses=timesheet_error_responses,
+)
+def apply_timesheet_item_batch(
+    batch: TimesheetItemBatch,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(role_required("admin", "user")),
+) -> TimesheetItemBatchResponse:
+    return timesheet_service.apply_timesheet_item_batch(session, timesheet_id, batch, current_user)
+
+
 @router.get(
-    "/{header_id}/items",
+    "/{timesheet_id}/items",
     response_model=List[TimesheetItemRead],
     responses=timesheet_error_responses,
 )
 def list_timesheet_items(
-    header_id: UUID = Depends(validate_timesheet_id),
-    session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    filters: TimesheetItemListFilters = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Query(timesheet_service.TIMESHEET_PAGE_SIZE, ge=1, le=timesheet_service.TIMESHEET_MAX_PAGE_SIZE),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> List[TimesheetItemRead]:
-    items = timesheet_service.list_timesheet_items(session, header_id, current_user)
+    items, next_cursor = timesheet_service.page_timesheet_items(
+        session, timesheet_id, current_user, filters, cursor, limit
+    )
+    set_next_cursor(request, response, next_cursor)
     return [TimesheetItemRead.model_validate(item) for item in items]
 
 
 @router.get(
-    "/{header_id}/items/{item_id}", response_model=TimesheetItemRead, responses=timesheet_error_responses
+    "/{timesheet_id}/items/{item_id}", response_model=TimesheetItemRead, responses=timesheet_error_responses
 )
 def get_timesheet_item(
-    header_id: UUID = Depends(validate_timesheet_id),
+    timesheet_id: UUID = Depends(validate_timesheet_id),
     item_id: UUID = Depends(validate_item_id),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> TimesheetItemRead:
-    item = timesheet_service.get_timesheet_item(session, header_id, item_id, current_user)
+    item = timesheet_service.get_timesheet_item(session, timesheet_id, item_id, current_user)
     return TimesheetItemRead.model_validate(item)
 
 
 @router.put(
-    "/{header_id}/items/{item_id}",
+    "/{timesheet_id}/items/{item_id}",
     response_model=TimesheetItemRead,
     responses=timesheet_error_responses,
 )
 def update_timesheet_item(
-    header_id: UUID = Depends(validate_timesheet_id),
-    item_id: UUID = Depends(validate_item_id),
     item_in: TimesheetItemUpdate,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    item_id: UUID = Depends(validate_item_id),
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> TimesheetItemRead:
-    item = timesheet_service.update_timesheet_item(session, header_id, item_id, item_in, current_user)
+    item = timesheet_service.update_timesheet_item(session, timesheet_id, item_id, item_in, current_user)
     return TimesheetItemRead.model_validate(item)
 
 
 @router.delete(
-    "/{header_id}/items/{item_id}",
+    "/{timesheet_id}/items/{item_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     responses=timesheet_error_responses,
 )
 def delete_timesheet_item(
-    header_id: UUID = Depends(validate_timesheet_id),
+    timesheet_id: UUID = Depends(validate_timesheet_id),
     item_id: UUID = Depends(validate_item_id),
     session: Session = Depends(get_session),
     current_user: User = Depends(role_required("admin", "user")),
 ) -> None:
-    timesheet_service.delete_timesheet_item(session, header_id, item_id, current_user)
+    timesheet_service.delete_timesheet_item(session, timesheet_id, item_id, current_user)
@@ -0,0 +1,253 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.dependencies import get_async_read_session, get_async_session
+from app.core.security import role_required_async
+from app.core.validators import validate_item_id, validate_timesheet_id
+from app.models import User
+from app.routers.timesheets import set_next_cursor, timesheet_error_responses
+from app.schemas import (
+    TimesheetActionResponse,
+    TimesheetBulkTransition,
+    TimesheetBulkTransitionResponse,
+    TimesheetCreate,
+    TimesheetGrid,
+    TimesheetGridResponse,
+    TimesheetItemBatch,
+    TimesheetItemBatchResponse,
+    TimesheetItemCreate,
+    TimesheetItemListFilters,
+    TimesheetItemRead,
+    TimesheetItemUpdate,
+    TimesheetListFilters,
+    TimesheetListRead,
+    TimesheetRead,
+    TimesheetUpdate,
+)
+from app.services import timesheets as timesheet_service
+
+router = APIRouter(
+    prefix="/timesheets",
+    tags=["timesheets"],
+)
+
+
+@router.post("/", response_model=TimesheetRead, status_code=201, responses=timesheet_error_responses)
+async def create_timesheet(
+    timesheet_in: TimesheetCreate,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetRead:
+    timesheet = await timesheet_service.create_timesheet_async(session, current_user, timesheet_in)
+    return TimesheetRead.model_validate(timesheet)
+
+
+@router.get("/", response_model=List[TimesheetListRead], responses=timesheet_error_responses)
+async def list_timesheets(
+    request: Request,
+    response: Response,
+    filters: TimesheetListFilters = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Query(timesheet_service.TIMESHEET_PAGE_SIZE, ge=1, le=timesheet_service.TIMESHEET_MAX_PAGE_SIZE),
+    include_totals: bool = False,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> List[TimesheetListRead]:
+    if include_totals:
+        summaries, next_cursor = await timesheet_service.page_timesheet_summaries_async(
+            session, current_user, filters, cursor, limit
+        )
+    else:
+        timesheets, next_cursor = await timesheet_service.page_timesheets_async(
+            session, current_user, filters, cursor, limit
+        )
+        summaries = [TimesheetListRead.model_validate(timesheet) for timesheet in timesheets]
+    set_next_cursor(request, response, next_cursor)
+    return summaries
+
+
+@router.get("/{timesheet_id}", response_model=TimesheetRead, responses=timesheet_error_responses)
+async def get_timesheet(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetRead:
+    timesheet = await timesheet_service.get_timesheet_async(session, timesheet_id, current_user)
+    return TimesheetRead.model_validate(timesheet)
+
+
+@router.put("/{timesheet_id}", response_model=TimesheetRead, responses=timesheet_error_responses)
+async def update_timesheet(
+    timesheet_in: TimesheetUpdate,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetRead:
+    updated_timesheet = await timesheet_service.update_timesheet_async(
+        session, timesheet_id, timesheet_in, current_user
+    )
+    return TimesheetRead.model_validate(updated_timesheet)
+
+
+@router.delete("/{timesheet_id}", status_code=status.HTTP_204_NO_CONTENT, responses=timesheet_error_responses)
+async def delete_timesheet(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> None:
+    await timesheet_service.delete_timesheet_async(session, timesheet_id, current_user)
+
+
+@router.post("/{timesheet_id}/submit", response_model=TimesheetActionResponse, responses=timesheet_error_responses)
+async def submit_timesheet(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    include_items: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetActionResponse:
+    return await timesheet_service.submit_timesheet_async(session, timesheet_id, current_user, include_items)
+
+
+@router.post(
+    "/{timesheet_id}/approve",
+    response_model=TimesheetActionResponse,
+    responses=timesheet_error_responses,
+)
+async def approve_timesheet(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    include_items: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin")),
+) -> TimesheetActionResponse:
+    return await timesheet_service.approve_timesheet_async(session, timesheet_id, current_user, include_items)
+
+
+@router.post("/{timesheet_id}/reject", response_model=TimesheetActionResponse, responses=timesheet_error_responses)
+async def reject_timesheet(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    include_items: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin")),
+) -> TimesheetActionResponse:
+    return await timesheet_service.reject_timesheet_async(session, timesheet_id, current_user, include_items)
+
+
+@router.post(
+    "/bulk-transition", response_model=TimesheetBulkTransitionResponse, responses=timesheet_error_responses
+)
+async def bulk_transition_timesheets(
+    request: TimesheetBulkTransition,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin")),
+) -> TimesheetBulkTransitionResponse:
+    return await timesheet_service.bulk_transition_timesheets_async(session, request, current_user)
+
+
+@router.post(
+    "/{timesheet_id}/items",
+    response_model=TimesheetItemRead,
+    status_code=status.HTTP_201_CREATED,
+    responses=timesheet_error_responses,
+)
+async def create_timesheet_item(
+    item_in: TimesheetItemCreate,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetItemRead:
+    item = await timesheet_service.create_timesheet_item_async(session, timesheet_id, item_in, current_user)
+    return TimesheetItemRead.model_validate(item)
+
+
+@router.put("/{timesheet_id}/grid", response_model=TimesheetGridResponse, responses=timesheet_error_responses)
+async def save_timesheet_grid(
+    grid: TimesheetGrid,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetGridResponse:
+    return await timesheet_service.save_timesheet_grid_async(session, timesheet_id, grid, current_user)
+
+
+@router.post(
+    "/{timesheet_id}/items/batch",
+    response_model=TimesheetItemBatchResponse,
+    responses=timesheet_error_responses,
+)
+async def apply_timesheet_item_batch(
+    batch: TimesheetItemBatch,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetItemBatchResponse:
+    return await timesheet_service.apply_timesheet_item_batch_async(session, timesheet_id, batch, current_user)
+
+
+@router.get(
+    "/{timesheet_id}/items",
+    response_model=List[TimesheetItemRead],
+    responses=timesheet_error_responses,
+)
+async def list_timesheet_items(
+    request: Request,
+    response: Response,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    filters: TimesheetItemListFilters = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Query(timesheet_service.TIMESHEET_PAGE_SIZE, ge=1, le=timesheet_service.TIMESHEET_MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> List[TimesheetItemRead]:
+    items, next_cursor = await timesheet_service.page_timesheet_items_async(
+        session, timesheet_id, current_user, filters, cursor, limit
+    )
+    set_next_cursor(request, response, next_cursor)
+    return [TimesheetItemRead.model_validate(item) for item in items]
+
+
+@router.get(
+    "/{timesheet_id}/items/{item_id}", response_model=TimesheetItemRead, responses=timesheet_error_responses
+)
+async def get_timesheet_item(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    item_id: UUID = Depends(validate_item_id),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetItemRead:
+    item = await timesheet_service.get_timesheet_item_async(session, timesheet_id, item_id, current_user)
+    return TimesheetItemRead.model_validate(item)
+
+
+@router.put(
+    "/{timesheet_id}/items/{item_id}",
+    response_model=TimesheetItemRead,
+    responses=timesheet_error_responses,
+)
+async def update_timesheet_item(
+    item_in: TimesheetItemUpdate,
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    item_id: UUID = Depends(validate_item_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> TimesheetItemRead:
+    item = await timesheet_service.update_timesheet_item_async(
+        session, timesheet_id, item_id, item_in, current_user
+    )
+    return TimesheetItemRead.model_validate(item)
+
+
+@router.delete(
+    "/{timesheet_id}/items/{item_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=timesheet_error_responses,
+)
+async def delete_timesheet_item(
+    timesheet_id: UUID = Depends(validate_timesheet_id),
+    item_id: UUID = Depends(validate_item_id),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(role_required_async("admin", "user")),
+) -> None:
+    await timesheet_service.delete_timesheet_item_async(session, timesheet_id, item_id, current_user)
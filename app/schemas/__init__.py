@@ -1,5 +1,5 @@
 from app.schemas.account import AccountCreate, AccountRead, AccountUpdate
-from app.schemas.auth import Token, TokenData, TokenRefreshRequest
+from app.schemas.auth import Principal, Token, TokenData, TokenRefreshRequest
 from app.schemas.project import (
     ProjectListResponse,
     ProjectMemberCreate,
@@ -10,13 +10,27 @@ from app.schemas.project import (
     ProjectRead,
 )
 from app.schemas.timesheet import (
+    TimesheetBulkSkipped,
+    TimesheetBulkTransition,
+    TimesheetBulkTransitionResponse,
     TimesheetCreate,
+    TimesheetGrid,
+    TimesheetGridResponse,
+    TimesheetGridRow,
+    TimesheetItemBatch,
+    TimesheetItemBatchResponse,
     TimesheetItemCreate,
+    TimesheetItemListFilters,
+    TimesheetItemOperation,
+    TimesheetItemOperationResult,
     TimesheetItemRead,
     TimesheetItemUpdate,
     TimesheetDetail,
+    TimesheetListFilters,
+    TimesheetListRead,
     TimesheetActionResponse,
     TimesheetRead,
+    TimesheetTotals,
     TimesheetUpdate,
 )
 from app.schemas.report import (
@@ -34,19 +48,34 @@ __all__ = [
     "AccountCreate",
     "AccountRead",
     "AccountUpdate",
+    "TimesheetBulkSkipped",
+    "TimesheetBulkTransition",
+    "TimesheetBulkTransitionResponse",
     "TimesheetCreate",
+    "TimesheetGrid",
+    "TimesheetGridResponse",
+    "TimesheetGridRow",
+    "TimesheetItemBatch",
+    "TimesheetItemBatchResponse",
     "TimesheetItemCreate",
+    "TimesheetItemListFilters",
+    "TimesheetItemOperation",
+    "TimesheetItemOperationResult",
     "TimesheetItemRead",
     "TimesheetItemUpdate",
     "TimesheetDetail",
+    "TimesheetListFilters",
+    "TimesheetListRead",
     "TimesheetActionResponse",
     "TimesheetRead",
+    "TimesheetTotals",
     "TimesheetUpdate",
     "ProjectHoursReport",
     "StatusSummary",
     "SummaryReport",
     "UserHoursReport",
     "UserProjectHoursReport",
+    "Principal",
     "Token",
     "TokenData",
     "TokenRefreshRequest",
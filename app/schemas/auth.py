@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -15,5 +17,16 @@ class TokenData(BaseModel):
     jti: str | None = None
 
 
+class Principal(BaseModel):
+    """Identidad autenticada construida solo con los claims del access token."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: UUID
+    role: str
+    account_uuid: UUID | None = None
+    token_version: int = 0
+
+
 class TokenRefreshRequest(BaseModel):
     refresh_token: str
@@ -1,8 +1,9 @@
+import datetime as dt
 from datetime import date, datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.models.timesheet import TimesheetStatus
 
@@ -36,6 +37,94 @@ class TimesheetItemRead(TimesheetItemBase):
     updated_at: Optional[datetime] = None
 
 
+class TimesheetItemOperation(BaseModel):
+    """Una operación de ``POST /timesheets/{id}/items/batch``."""
+
+    op: Literal["create", "update", "delete"]
+    item_id: Optional[UUID] = None
+    project_id: Optional[UUID] = None
+    # ``dt.date``: el campo ``date`` con valor por defecto ocultaría el tipo.
+    date: Optional[dt.date] = None
+    description: Optional[str] = None
+    hours: Optional[float] = None
+
+    @model_validator(mode="after")
+    def validate_fields(self) -> "TimesheetItemOperation":
+        if self.op == "create":
+            if self.item_id is not None:
+                raise ValueError("Las altas no llevan item_id")
+            missing = [field for field in ("project_id", "date", "description", "hours") if getattr(self, field) is None]
+            if missing:
+                raise ValueError(f"Faltan campos para el alta: {', '.join(missing)}")
+        elif self.item_id is None:
+            raise ValueError("Las modificaciones y bajas requieren item_id")
+        return self
+
+
+class TimesheetItemBatch(BaseModel):
+    operations: list[TimesheetItemOperation] = Field(min_length=1, max_length=500)
+
+
+class TimesheetItemOperationResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    item_id: UUID
+    item: Optional[TimesheetItemRead] = None
+
+
+class TimesheetItemBatchResponse(BaseModel):
+    success: bool
+    results: list[TimesheetItemOperationResult]
+
+
+class TimesheetGridRow(BaseModel):
+    """Fila de la cuadrícula semanal: horas de un proyecto por día."""
+
+    project_id: UUID
+    description: Optional[str] = None
+    hours: dict[date, float] = Field(default_factory=dict)
+
+
+class TimesheetGrid(BaseModel):
+    """Cuadrícula completa de ``PUT /timesheets/{id}/grid``.
+
+    Sustituye a los ítems guardados: las celdas ausentes o a cero se borran.
+    """
+
+    rows: list[TimesheetGridRow] = Field(max_length=100)
+
+    @model_validator(mode="after")
+    def validate_rows(self) -> "TimesheetGrid":
+        project_ids = [row.project_id for row in self.rows]
+        if len(project_ids) != len(set(project_ids)):
+            raise ValueError("Cada proyecto debe aparecer una sola vez en la cuadrícula")
+        return self
+
+
+class TimesheetGridResponse(BaseModel):
+    created: int
+    updated: int
+    deleted: int
+    items: list[TimesheetItemRead]
+
+
+class TimesheetListFilters(BaseModel):
+    """Filtros de ``GET /timesheets/``; el periodo selecciona los partes que se solapan con él."""
+
+    status: Optional[TimesheetStatus] = None
+    user_id: Optional[UUID] = None
+    project_id: Optional[UUID] = None
+    account_id: Optional[UUID] = None
+    period_from: Optional[date] = None
+    period_to: Optional[date] = None
+
+
+class TimesheetItemListFilters(BaseModel):
+    project_id: Optional[UUID] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+
 class TimesheetBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -55,6 +144,19 @@ class TimesheetRead(TimesheetBase):
     updated_at: Optional[datetime] = None
 
 
+class TimesheetTotals(BaseModel):
+    total_hours: float = 0
+    item_count: int = 0
+    daily_totals: dict[date, float] = Field(default_factory=dict)
+    project_ids: list[UUID] = Field(default_factory=list)
+
+
+class TimesheetListRead(TimesheetRead):
+    """Parte del listado; ``totals`` solo viene con ``include_totals=true``."""
+
+    totals: Optional[TimesheetTotals] = None
+
+
 class TimesheetUpdate(BaseModel):
     period_start: Optional[date] = None
     period_end: Optional[date] = None
@@ -77,3 +179,35 @@ class TimesheetDetail(BaseModel):
 class TimesheetActionResponse(BaseModel):
     success: bool
     timesheet: TimesheetDetail
+
+
+class TimesheetBulkTransition(BaseModel):
+    """Aprobación o rechazo masivo: por ids, por filtro o ambos (se combinan con AND)."""
+
+    action: Literal["approve", "reject"]
+    timesheet_ids: Optional[list[UUID]] = Field(default=None, min_length=1, max_length=5000)
+    user_id: Optional[UUID] = None
+    project_id: Optional[UUID] = None
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+
+    @model_validator(mode="after")
+    def validate_criteria(self) -> "TimesheetBulkTransition":
+        criteria = (self.timesheet_ids, self.user_id, self.project_id, self.period_start, self.period_end)
+        if all(value is None for value in criteria):
+            raise ValueError("Indica timesheet_ids o al menos un filtro (user_id, project_id, periodo)")
+        if self.period_start and self.period_end and self.period_start > self.period_end:
+            raise ValueError("period_start debe ser anterior o igual a period_end")
+        return self
+
+
+class TimesheetBulkSkipped(BaseModel):
+    id: UUID
+    reason: Literal["not_found", "not_submitted", "filtered_out"]
+    status: Optional[TimesheetStatus] = None
+
+
+class TimesheetBulkTransitionResponse(BaseModel):
+    status: TimesheetStatus
+    transitioned: list[UUID]
+    skipped: list[TimesheetBulkSkipped] = Field(default_factory=list)
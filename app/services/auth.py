@@ -1,19 +1,29 @@
+import time
 from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
+from app.core.cache import revoked_jti_cache
 from app.core.errors import AuthorizationException
+from app.core.hashing import needs_rehash
 from app.core.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS,
+    access_token_claims,
     create_access_token,
     create_refresh_token,
     decode_token,
+    get_cached_user,
+    get_password_hash,
+    get_password_hash_async,
     verify_password,
+    verify_password_async,
 )
-from app.schemas import Token
+from app.models import User
+from app.schemas import Token, UserUpdate
 
 
 def authenticate_user(session: Session, email: str, password: str):
@@ -22,24 +32,69 @@ def authenticate_user(session: Session, email: str, password: str):
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if needs_rehash(user.hashed_password):
+        user = crud.update_user(session, user, UserUpdate(), hashed_password=get_password_hash(password))
     return user
 
 
-def _build_tokens(session: Session, user_id: UUID) -> Token:
+async def authenticate_user_async(session: AsyncSession, email: str, password: str):
+    user = await crud.get_by_email_async(session, email)
+    if not user or not user.hashed_password:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    if needs_rehash(user.hashed_password):
+        hashed_password = await get_password_hash_async(password)
+        user = await session.run_sync(crud.update_user, user, UserUpdate(), hashed_password=hashed_password)
+    return user
+
+
+def _issue_tokens(user: User, refresh_jti: str) -> Token:
     access_token = create_access_token(
-        subject=str(user_id), expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        subject=str(user.id),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        claims=access_token_claims(user),
     )
-    refresh_jti = uuid4().hex
-    refresh_expires = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    crud.create_refresh_token(session, user_id=user_id, jti=refresh_jti, expires_at=refresh_expires)
     refresh_token = create_refresh_token(
-        subject=str(user_id),
+        subject=str(user.id),
         jti=refresh_jti,
         expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
     )
     return Token(access_token=access_token, refresh_token=refresh_token)
 
 
+def _new_refresh_jti() -> tuple[str, datetime]:
+    return uuid4().hex, datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def _build_tokens(session: Session, user: User) -> Token:
+    refresh_jti, refresh_expires = _new_refresh_jti()
+    crud.create_refresh_token(session, user_id=user.id, jti=refresh_jti, expires_at=refresh_expires)
+    return _issue_tokens(user, refresh_jti)
+
+
+def _remember_revoked(payload: dict) -> None:
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        revoked_jti_cache.set(payload["jti"], True, ttl_seconds=remaining)
+
+
+def _raise_refresh_error(session: Session, jti: str, payload: dict) -> None:
+    """Determina por qué un refresh token no pudo rotarse (solo en la ruta de error)."""
+    stored_token = crud.get_refresh_token_by_jti(session, jti)
+    if not stored_token:
+        raise AuthorizationException("Token de refresco no reconocido")
+
+    if stored_token.revoked:
+        _remember_revoked(payload)
+        raise AuthorizationException("Token de refresco revocado")
+
+    if stored_token.expires_at < datetime.utcnow():
+        raise AuthorizationException("Token de refresco expirado")
+
+    raise AuthorizationException("Token de refresco no coincide con el usuario")
+
+
 def login(session: Session, email: str, password: str) -> Token:
     user = authenticate_user(session, email, password)
     if not user:
@@ -47,7 +102,17 @@ def login(session: Session, email: str, password: str) -> Token:
             "Credenciales incorrectas",
             details={"auth_scheme": "Bearer"},
         )
-    return _build_tokens(session, user.id)
+    return _build_tokens(session, user)
+
+
+async def login_async(session: AsyncSession, email: str, password: str) -> Token:
+    user = await authenticate_user_async(session, email, password)
+    if not user:
+        raise AuthorizationException(
+            "Credenciales incorrectas",
+            details={"auth_scheme": "Bearer"},
+        )
+    return await session.run_sync(_build_tokens, user)
 
 
 def refresh_session(session: Session, refresh_token: str) -> Token:
@@ -56,21 +121,24 @@ def refresh_session(session: Session, refresh_token: str) -> Token:
     if not jti:
         raise AuthorizationException("Token de refresco inválido")
 
-    stored_token = crud.get_refresh_token_by_jti(session, jti)
-    if not stored_token:
-        raise AuthorizationException("Token de refresco no reconocido")
-
-    if stored_token.revoked:
+    if revoked_jti_cache.get(jti):
         raise AuthorizationException("Token de refresco revocado")
 
-    if stored_token.expires_at < datetime.utcnow():
-        raise AuthorizationException("Token de refresco expirado")
+    try:
+        user_id = UUID(payload.get("sub"))
+    except (TypeError, ValueError) as exc:
+        raise AuthorizationException("Token de refresco inválido") from exc
 
-    if str(stored_token.user_id) != payload.get("sub"):
+    user = get_cached_user(session, user_id)
+    if not user:
         raise AuthorizationException("Token de refresco no coincide con el usuario")
 
-    crud.revoke_refresh_token(session, stored_token)
-    return _build_tokens(session, UUID(payload["sub"]))
+    new_jti, new_expires = _new_refresh_jti()
+    if not crud.rotate_refresh_token(session, jti, user_id, new_jti, new_expires):
+        _raise_refresh_error(session, jti, payload)
+
+    _remember_revoked(payload)
+    return _issue_tokens(user, new_jti)
 
 
 def revoke_token(session: Session, refresh_token: str) -> None:
@@ -85,3 +153,25 @@ def revoke_token(session: Session, refresh_token: str) -> None:
     if str(stored_token.user_id) != payload.get("sub"):
         return
     crud.revoke_refresh_token(session, stored_token)
+    _remember_revoked(payload)
+
+
+def logout_everywhere(session: Session, user_id: UUID) -> None:
+    """Revoca todos los refresh tokens y deja sin efecto los access tokens emitidos."""
+    user = crud.get_user(session, user_id)
+    if not user:
+        raise AuthorizationException("No se pudieron validar las credenciales")
+    crud.revoke_all_refresh_tokens(session, user.id)
+    crud.bump_token_version(session, user)
+
+
+async def refresh_session_async(session: AsyncSession, refresh_token: str) -> Token:
+    return await session.run_sync(refresh_session, refresh_token)
+
+
+async def revoke_token_async(session: AsyncSession, refresh_token: str) -> None:
+    await session.run_sync(revoke_token, refresh_token)
+
+
+async def logout_everywhere_async(session: AsyncSession, user_id: UUID) -> None:
+    await session.run_sync(logout_everywhere, user_id)
@@ -0,0 +1,125 @@
+"""Tareas de mantenimiento periódicas de la base de datos.
+
+La purga de ``refresh_tokens`` elimina filas expiradas o revocadas en lotes
+pequeños, confirmando cada lote por separado para no mantener bloqueos largos
+sobre la tabla. Se ejecuta en un hilo de fondo cada
+``REFRESH_TOKEN_PURGE_INTERVAL_SECONDS`` (``0`` la desactiva) o bajo demanda::
+
+    python -m app.services.maintenance
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Any, Optional
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = float(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+REFRESH_TOKEN_PURGE_BATCH_SIZE = int(os.getenv("REFRESH_TOKEN_PURGE_BATCH_SIZE", "500"))
+
+
+def purge_refresh_tokens(
+    session: Session,
+    *,
+    batch_size: int = REFRESH_TOKEN_PURGE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """Elimina refresh tokens expirados o revocados y devuelve cuántos se borraron."""
+
+    cutoff = now or datetime.utcnow()
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        removed = crud.delete_stale_refresh_tokens(session, cutoff, batch_size)
+        deleted += removed
+        batches += 1
+        if removed < batch_size:
+            break
+    return deleted
+
+
+class RefreshTokenPurger:
+    """Ejecuta ``purge_refresh_tokens`` periódicamente en un hilo de fondo."""
+
+    def __init__(self, interval_seconds: float, batch_size: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        self.runs = 0
+        self.failures = 0
+        self.last_deleted = 0
+        self.total_deleted = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration_seconds = 0.0
+
+    def run_once(self) -> int:
+        started = time.perf_counter()
+        with Session(engine) as session:
+            deleted = purge_refresh_tokens(session, batch_size=self.batch_size)
+        with self._lock:
+            self.runs += 1
+            self.last_deleted = deleted
+            self.total_deleted += deleted
+            self.last_run_at = datetime.utcnow()
+            self.last_duration_seconds = time.perf_counter() - started
+        logger.info("Purga de refresh tokens: %d filas eliminadas", deleted)
+        return deleted
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:  # noqa: BLE001 - el hilo debe sobrevivir a fallos puntuales
+                with self._lock:
+                    self.failures += 1
+                logger.exception("Error purgando refresh tokens")
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._loop, name="refresh-token-purge", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "interval_seconds": self.interval_seconds,
+                "batch_size": self.batch_size,
+                "runs": self.runs,
+                "failures": self.failures,
+                "last_deleted": self.last_deleted,
+                "total_deleted": self.total_deleted,
+                "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+                "last_duration_seconds": round(self.last_duration_seconds, 6),
+            }
+
+
+refresh_token_purger = RefreshTokenPurger(REFRESH_TOKEN_PURGE_INTERVAL_SECONDS, REFRESH_TOKEN_PURGE_BATCH_SIZE)
+
+
+def main() -> None:
+    deleted = refresh_token_purger.run_once()
+    print(f"Refresh tokens eliminados: {deleted}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from fastapi import status
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
 from app.core.errors import AuthorizationException, BusinessRuleException, NotFoundException
@@ -40,14 +41,7 @@ def _ensure_project_access(session: Session, project_id: UUID, current_user: Use
         raise AuthorizationException("No perteneces a este proyecto", status_code=status.HTTP_403_FORBIDDEN)
 
 
-def get_user_hours_report(
-    session: Session, period_start: date, period_end: date, current_user: User
-) -> list[UserHoursReport]:
-    _validate_period(period_start, period_end)
-
-    user_filter = None if current_user.role == "admin" else current_user.id
-    rows = crud.aggregate_hours_by_user(session, period_start, period_end, user_filter)
-
+def _user_hours_rows(rows, period_start: date, period_end: date) -> list[UserHoursReport]:
     if not rows:
         raise NotFoundException("No se encontraron horas en el período indicado")
 
@@ -63,15 +57,7 @@ def get_user_hours_report(
     ]
 
 
-def get_project_hours_report(
-    session: Session, project_id: UUID, period_start: date, period_end: date, current_user: User
-) -> list[ProjectHoursReport]:
-    _validate_period(period_start, period_end)
-    _ensure_project_access(session, project_id, current_user)
-
-    user_filter = None if current_user.role == "admin" else current_user.id
-    rows = crud.aggregate_hours_by_project(session, project_id, period_start, period_end, user_filter)
-
+def _project_hours_rows(rows, period_start: date, period_end: date) -> list[ProjectHoursReport]:
     if not rows:
         raise NotFoundException("No se encontraron horas para este proyecto")
 
@@ -87,17 +73,7 @@ def get_project_hours_report(
     ]
 
 
-def get_user_projects_report(
-    session: Session, target_user_id: UUID, period_start: date, period_end: date, current_user: User
-) -> list[UserProjectHoursReport]:
-    _validate_period(period_start, period_end)
-    _ensure_admin_or_self(target_user_id, current_user)
-
-    user = crud.get_user(session, target_user_id)
-    if not user:
-        raise NotFoundException("Usuario no encontrado")
-
-    rows = crud.aggregate_user_projects(session, target_user_id, period_start, period_end)
+def _user_projects_rows(rows, period_start: date, period_end: date) -> list[UserProjectHoursReport]:
     if not rows:
         raise NotFoundException("No se encontraron horas para este usuario")
 
@@ -114,17 +90,14 @@ def get_user_projects_report(
     ]
 
 
-def get_status_summary(
-    session: Session, period_start: date, period_end: date, current_user: User
-) -> SummaryReport:
-    _validate_period(period_start, period_end)
-
+def _ensure_summary_access(current_user: User) -> None:
     if current_user.role != "admin":
         raise AuthorizationException(
             "Solo los administradores pueden ver el resumen", status_code=status.HTTP_403_FORBIDDEN
         )
 
-    rows = crud.summarize_hours_by_status(session, period_start, period_end)
+
+def _status_summary_rows(rows) -> SummaryReport:
     if not rows:
         raise NotFoundException("No hay datos para este período")
 
@@ -137,3 +110,93 @@ def get_status_summary(
     ]
 
     return SummaryReport(totals_by_status=totals)
+
+
+def get_user_hours_report(
+    session: Session, period_start: date, period_end: date, current_user: User
+) -> list[UserHoursReport]:
+    _validate_period(period_start, period_end)
+
+    user_filter = None if current_user.role == "admin" else current_user.id
+    rows = crud.aggregate_hours_by_user(session, period_start, period_end, user_filter)
+    return _user_hours_rows(rows, period_start, period_end)
+
+
+async def get_user_hours_report_async(
+    session: AsyncSession, period_start: date, period_end: date, current_user: User
+) -> list[UserHoursReport]:
+    _validate_period(period_start, period_end)
+
+    user_filter = None if current_user.role == "admin" else current_user.id
+    rows = await crud.aggregate_hours_by_user_async(session, period_start, period_end, user_filter)
+    return _user_hours_rows(rows, period_start, period_end)
+
+
+def get_project_hours_report(
+    session: Session, project_id: UUID, period_start: date, period_end: date, current_user: User
+) -> list[ProjectHoursReport]:
+    _validate_period(period_start, period_end)
+    _ensure_project_access(session, project_id, current_user)
+
+    user_filter = None if current_user.role == "admin" else current_user.id
+    rows = crud.aggregate_hours_by_project(session, project_id, period_start, period_end, user_filter)
+    return _project_hours_rows(rows, period_start, period_end)
+
+
+async def get_project_hours_report_async(
+    session: AsyncSession, project_id: UUID, period_start: date, period_end: date, current_user: User
+) -> list[ProjectHoursReport]:
+    _validate_period(period_start, period_end)
+    await session.run_sync(_ensure_project_access, project_id, current_user)
+
+    user_filter = None if current_user.role == "admin" else current_user.id
+    rows = await crud.aggregate_hours_by_project_async(session, project_id, period_start, period_end, user_filter)
+    return _project_hours_rows(rows, period_start, period_end)
+
+
+def get_user_projects_report(
+    session: Session, target_user_id: UUID, period_start: date, period_end: date, current_user: User
+) -> list[UserProjectHoursReport]:
+    _validate_period(period_start, period_end)
+    _ensure_admin_or_self(target_user_id, current_user)
+
+    user = crud.get_user(session, target_user_id)
+    if not user:
+        raise NotFoundException("Usuario no encontrado")
+
+    rows = crud.aggregate_user_projects(session, target_user_id, period_start, period_end)
+    return _user_projects_rows(rows, period_start, period_end)
+
+
+async def get_user_projects_report_async(
+    session: AsyncSession, target_user_id: UUID, period_start: date, period_end: date, current_user: User
+) -> list[UserProjectHoursReport]:
+    _validate_period(period_start, period_end)
+    _ensure_admin_or_self(target_user_id, current_user)
+
+    user = await crud.get_user_async(session, target_user_id)
+    if not user:
+        raise NotFoundException("Usuario no encontrado")
+
+    rows = await crud.aggregate_user_projects_async(session, target_user_id, period_start, period_end)
+    return _user_projects_rows(rows, period_start, period_end)
+
+
+def get_status_summary(
+    session: Session, period_start: date, period_end: date, current_user: User
+) -> SummaryReport:
+    _validate_period(period_start, period_end)
+    _ensure_summary_access(current_user)
+
+    rows = crud.summarize_hours_by_status(session, period_start, period_end)
+    return _status_summary_rows(rows)
+
+
+async def get_status_summary_async(
+    session: AsyncSession, period_start: date, period_end: date, current_user: User
+) -> SummaryReport:
+    _validate_period(period_start, period_end)
+    _ensure_summary_access(current_user)
+
+    rows = await crud.summarize_hours_by_status_async(session, period_start, period_end)
+    return _status_summary_rows(rows)
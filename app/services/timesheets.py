@@ -1,10 +1,15 @@
 import logging
-from datetime import date
-from uuid import UUID
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Iterable, NamedTuple, Optional
+from uuid import UUID, uuid4
 
 from fastapi import status
-from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
 from app.core.errors import AuthorizationException, BusinessRuleException, NotFoundException
@@ -12,27 +17,67 @@ from app.models import TimesheetHeader, TimesheetItem, User
 from app.models.timesheet import TimesheetStatus
 from app.schemas import (
     TimesheetActionResponse,
+    TimesheetBulkSkipped,
+    TimesheetBulkTransition,
+    TimesheetBulkTransitionResponse,
     TimesheetCreate,
     TimesheetDetail,
+    TimesheetGrid,
+    TimesheetGridResponse,
+    TimesheetItemBatch,
+    TimesheetItemBatchResponse,
     TimesheetItemCreate,
+    TimesheetItemListFilters,
+    TimesheetItemOperationResult,
+    TimesheetItemRead,
     TimesheetItemUpdate,
+    TimesheetListFilters,
+    TimesheetListRead,
+    TimesheetTotals,
     TimesheetUpdate,
 )
+from app.utils.cursor import decode_date_cursor, encode_cursor
 
 
 logger = logging.getLogger(__name__)
 
+# Alta de ítems validada e insertada en una sola sentencia (ver
+# ``crud.create_item_validated``). "false" vuelve a las consultas separadas.
+TIMESHEET_ITEM_FAST_INSERT = os.getenv("TIMESHEET_ITEM_FAST_INSERT", "true").lower() in {"1", "true", "yes"}
+# Cómo se serializan las escrituras concurrentes de un mismo parte y día para
+# que el total diario no supere 24 h: advisory | header | off.
+TIMESHEET_DAILY_LOCK = os.getenv("TIMESHEET_DAILY_LOCK", "advisory").lower()
+# Tamaño de página por defecto y máximo de los listados paginados por cursor.
+TIMESHEET_PAGE_SIZE = int(os.getenv("TIMESHEET_PAGE_SIZE", "100"))
+TIMESHEET_MAX_PAGE_SIZE = int(os.getenv("TIMESHEET_MAX_PAGE_SIZE", "500"))
+
 
 def _validate_period(period_start, period_end) -> None:
     if period_start and period_end and period_start > period_end:
         raise BusinessRuleException("El periodo no es válido", status_code=status.HTTP_400_BAD_REQUEST)
 
 
-def _build_action_response(timesheet: TimesheetHeader) -> TimesheetActionResponse:
-    return TimesheetActionResponse(
-        success=True,
-        timesheet=TimesheetDetail.model_validate(timesheet),
+def _raise_if_overlap(session: Session, exc: IntegrityError, message: str) -> None:
+    if crud.is_overlap_violation(exc):
+        session.rollback()
+        raise BusinessRuleException(message, status_code=status.HTTP_400_BAD_REQUEST) from exc
+
+
+def _build_action_response(
+    timesheet: TimesheetHeader, items: Iterable[TimesheetItem] = ()
+) -> TimesheetActionResponse:
+    # Sin pasar por ``timesheet.items``: la relación dispararía una consulta.
+    detail = TimesheetDetail(
+        id=timesheet.id,
+        user_id=timesheet.user_id,
+        status=timesheet.status,
+        period_start=timesheet.period_start,
+        period_end=timesheet.period_end,
+        items=[TimesheetItemRead.model_validate(item) for item in items],
+        created_at=timesheet.created_at,
+        updated_at=timesheet.updated_at,
     )
+    return TimesheetActionResponse(success=True, timesheet=detail)
 
 
 def _ensure_owner_or_admin(timesheet: TimesheetHeader, current_user: User) -> None:
@@ -79,15 +124,12 @@ def _validate_hours_value(hours: float) -> None:
 def _validate_daily_total(
     session: Session, timesheet: TimesheetHeader, item_date: date, hours: float, exclude_id: UUID | None = None
 ) -> None:
-    statement = (
-        select(func.coalesce(func.sum(TimesheetItem.hours), 0))
-        .where(TimesheetItem.header_id == timesheet.id)
-        .where(TimesheetItem.date == item_date)
-    )
-    if exclude_id:
-        statement = statement.where(TimesheetItem.id != exclude_id)
+    crud.lock_daily_total(session, timesheet.id, item_date, TIMESHEET_DAILY_LOCK)
+    current_total = crud.daily_item_hours(session, timesheet.id, item_date, exclude_id)
+    _ensure_daily_total(current_total, hours)
+
 
-    current_total = float(session.exec(statement).first() or 0)
+def _ensure_daily_total(current_total: float, hours: float) -> None:
     if current_total + hours > 24:
         raise BusinessRuleException(
             "El total de horas por día no puede exceder 24",
@@ -98,21 +140,97 @@ def _validate_daily_total(
 def create_timesheet(session: Session, current_user: User, timesheet_in: TimesheetCreate) -> TimesheetHeader:
     _validate_period(timesheet_in.period_start, timesheet_in.period_end)
 
-    overlapping = crud.find_overlapping_timesheet(
-        session, current_user.id, timesheet_in.period_start, timesheet_in.period_end
-    )
-    if overlapping:
-        raise BusinessRuleException(
-            "Ya existe un parte de horas para ese periodo",
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
+    # El solape lo rechaza la base de datos (exclusión GiST en Postgres,
+    # trigger en SQLite): sin SELECT previo y sin carreras entre altas concurrentes.
+    try:
+        return crud.create_timesheet(session, current_user.id, timesheet_in)
+    except IntegrityError as exc:
+        _raise_if_overlap(session, exc, "Ya existe un parte de horas para ese periodo")
+        raise
+
 
-    return crud.create_timesheet(session, current_user.id, timesheet_in)
+def _page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or TIMESHEET_PAGE_SIZE, TIMESHEET_MAX_PAGE_SIZE))
 
 
-def list_timesheets(session: Session, current_user: User) -> list[TimesheetHeader]:
-    user_id = None if current_user.role == "admin" else current_user.id
-    return crud.list_timesheets(session, user_id=user_id)
+def _split_page(rows: list[Any], limit: int, kind: str, key: str) -> tuple[list[Any], Optional[str]]:
+    # Se pide una fila de más: si llega, hay página siguiente y empieza tras la última devuelta.
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(kind, getattr(rows[-1], key), rows[-1].id)
+
+
+def _timesheet_list_filters(
+    filters: Optional[TimesheetListFilters], current_user: User, cursor: Optional[str], limit: int
+) -> dict[str, Any]:
+    filters = filters or TimesheetListFilters()
+    user_id = filters.user_id
+    if current_user.role != "admin":
+        if user_id and user_id != current_user.id:
+            raise AuthorizationException(
+                "Solo un admin puede listar partes de otros usuarios", status_code=status.HTTP_403_FORBIDDEN
+            )
+        user_id = current_user.id
+    return {
+        **filters.model_dump(exclude={"user_id"}),
+        "user_id": user_id,
+        "after": decode_date_cursor("timesheets", cursor) if cursor else None,
+        "limit": limit + 1,
+    }
+
+
+def page_timesheets(
+    session: Session,
+    current_user: User,
+    filters: Optional[TimesheetListFilters] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[TimesheetHeader], Optional[str]]:
+    """Una página de partes por ``(period_start, id)`` y el cursor de la siguiente (o ``None``)."""
+    limit = _page_size(limit)
+    rows = crud.list_timesheets(session, **_timesheet_list_filters(filters, current_user, cursor, limit))
+    return _split_page(rows, limit, "timesheets", "period_start")
+
+
+def _summaries(rows: Iterable[Row]) -> list[TimesheetListRead]:
+    """Pliega las filas (parte, día, proyecto, horas, ítems) en un resumen por parte."""
+    summaries: dict[UUID, TimesheetListRead] = {}
+    for header, day, project_id, hours, items in rows:
+        summary = summaries.get(header.id)
+        if summary is None:
+            summary = summaries[header.id] = TimesheetListRead.model_validate(header)
+            summary.totals = TimesheetTotals()
+        if day is None:
+            continue
+        totals = summary.totals
+        hours = float(hours)
+        totals.total_hours = round(totals.total_hours + hours, 2)
+        totals.item_count += items
+        totals.daily_totals[day] = round(totals.daily_totals.get(day, 0) + hours, 2)
+        if project_id not in totals.project_ids:
+            totals.project_ids.append(project_id)
+    return list(summaries.values())
+
+
+def page_timesheet_summaries(
+    session: Session,
+    current_user: User,
+    filters: Optional[TimesheetListFilters] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[TimesheetListRead], Optional[str]]:
+    """Como :func:`page_timesheets`, con horas, ítems, totales por día y proyectos de cada parte.
+
+    Todo sale de una única consulta; no se consultan los ítems de cada parte.
+    """
+    limit = _page_size(limit)
+    rows = crud.list_timesheets_with_totals(session, **_timesheet_list_filters(filters, current_user, cursor, limit))
+    return _split_page(_summaries(rows), limit, "timesheets", "period_start")
+
+
+def list_timesheets(session: Session, current_user: User, **kwargs: Any) -> list[TimesheetHeader]:
+    return page_timesheets(session, current_user, **kwargs)[0]
 
 
 def get_timesheet(session: Session, timesheet_id: UUID, current_user: User) -> TimesheetHeader:
@@ -143,18 +261,12 @@ def update_timesheet(
     new_period_end = timesheet_in.period_end or timesheet.period_end
     _validate_period(new_period_start, new_period_end)
 
-    overlapping = crud.find_overlapping_timesheet(
-        session, timesheet.user_id, new_period_start, new_period_end, exclude_id=timesheet.id
-    )
-    if overlapping:
-        raise BusinessRuleException(
-            "El periodo se solapa con otro parte de horas",
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
-
     update_data = timesheet_in.model_dump(exclude_unset=True)
-    updated_timesheet = crud.update_timesheet(session, timesheet, TimesheetUpdate(**update_data))
-    return updated_timesheet
+    try:
+        return crud.update_timesheet(session, timesheet, TimesheetUpdate(**update_data))
+    except IntegrityError as exc:
+        _raise_if_overlap(session, exc, "El periodo se solapa con otro parte de horas")
+        raise
 
 
 def delete_timesheet(session: Session, timesheet_id: UUID, current_user: User) -> None:
@@ -166,84 +278,150 @@ def delete_timesheet(session: Session, timesheet_id: UUID, current_user: User) -
     crud.delete_timesheet(session, timesheet)
 
 
-def submit_timesheet(
-    session: Session, timesheet_id: UUID, current_user: User
+class TimesheetTransition(NamedTuple):
+    source: TimesheetStatus
+    target: TimesheetStatus
+    # Rol exigido antes de tocar la base de datos (``None``: cualquiera).
+    role: Optional[str]
+    # Solo el dueño del parte puede aplicarla, aunque sea admin.
+    owner_only: bool
+    forbidden: str
+    conflict: str
+    log: str
+
+
+# Flujo de estados del parte. Cada transición es un UPDATE condicionado al
+# estado de origen (y al dueño) que devuelve la fila nueva: sin lectura previa
+# ni carrera entre la comprobación y la escritura.
+TIMESHEET_TRANSITIONS: dict[str, TimesheetTransition] = {
+    "submit": TimesheetTransition(
+        TimesheetStatus.DRAFT,
+        TimesheetStatus.SUBMITTED,
+        role=None,
+        owner_only=True,
+        forbidden="Solo el dueño puede enviar este parte de horas",
+        conflict="Solo los partes en Draft pueden enviarse",
+        log="enviado por usuario",
+    ),
+    "approve": TimesheetTransition(
+        TimesheetStatus.SUBMITTED,
+        TimesheetStatus.APPROVED,
+        role="admin",
+        owner_only=False,
+        forbidden="Solo un admin puede aprobar partes de horas",
+        conflict="Solo puedes aprobar partes en estado Submitted",
+        log="aprobado por admin",
+    ),
+    "reject": TimesheetTransition(
+        TimesheetStatus.SUBMITTED,
+        TimesheetStatus.REJECTED,
+        role="admin",
+        owner_only=False,
+        forbidden="Solo un admin puede rechazar partes de horas",
+        conflict="Solo puedes rechazar partes en estado Submitted",
+        log="rechazado por admin",
+    ),
+}
+
+
+def transition_timesheet(
+    session: Session, action: str, timesheet_id: UUID, current_user: User, include_items: bool = False
 ) -> TimesheetActionResponse:
-    timesheet = crud.get_timesheet(session, timesheet_id)
-    if not timesheet:
-        raise NotFoundException("Parte de horas no encontrado")
-
-    if timesheet.user_id != current_user.id:
-        raise AuthorizationException(
-            "Solo el dueño puede enviar este parte de horas", status_code=status.HTTP_403_FORBIDDEN
-        )
+    """Aplica una transición de :data:`TIMESHEET_TRANSITIONS` en un solo viaje a la base de datos.
+
+    Si el UPDATE no afecta a ninguna fila se lee la cabecera para explicar
+    por qué (404, 403 o 409). Los ítems solo se consultan con ``include_items``.
+    """
+    transition = TIMESHEET_TRANSITIONS[action]
+    if transition.role and current_user.role != transition.role:
+        raise AuthorizationException(transition.forbidden, status_code=status.HTTP_403_FORBIDDEN)
+
+    owner_id = current_user.id if transition.owner_only else None
+    timesheet = crud.transition_timesheet(session, timesheet_id, transition.source, transition.target, owner_id)
+    if timesheet is None:
+        current = crud.get_timesheet_header(session, timesheet_id)
+        if not current:
+            raise NotFoundException("Parte de horas no encontrado")
+        if transition.owner_only and current.user_id != current_user.id:
+            raise AuthorizationException(transition.forbidden, status_code=status.HTTP_403_FORBIDDEN)
+        raise BusinessRuleException(transition.conflict, status_code=status.HTTP_409_CONFLICT)
+
+    logger.info("Timesheet %s %s %s", timesheet.id, transition.log, current_user.id)
+    items = crud.list_items(session, header_id=timesheet.id) if include_items else []
+    return _build_action_response(timesheet, items)
 
-    if timesheet.status != TimesheetStatus.DRAFT:
-        raise BusinessRuleException(
-            "Solo los partes en Draft pueden enviarse", status_code=status.HTTP_409_CONFLICT
-        )
 
-    updated = crud.update_timesheet(
-        session, timesheet, TimesheetUpdate(status=TimesheetStatus.SUBMITTED)
-    )
-    logger.info("Timesheet %s enviado por usuario %s", timesheet.id, current_user.id)
-    refreshed = crud.get_timesheet(session, updated.id) or updated
-    return _build_action_response(refreshed)
+def submit_timesheet(
+    session: Session, timesheet_id: UUID, current_user: User, include_items: bool = False
+) -> TimesheetActionResponse:
+    return transition_timesheet(session, "submit", timesheet_id, current_user, include_items)
 
 
 def approve_timesheet(
-    session: Session, timesheet_id: UUID, current_user: User
+    session: Session, timesheet_id: UUID, current_user: User, include_items: bool = False
 ) -> TimesheetActionResponse:
-    if current_user.role != "admin":
-        raise AuthorizationException(
-            "Solo un admin puede aprobar partes de horas", status_code=status.HTTP_403_FORBIDDEN
-        )
+    return transition_timesheet(session, "approve", timesheet_id, current_user, include_items)
 
-    timesheet = crud.get_timesheet(session, timesheet_id)
-    if not timesheet:
-        raise NotFoundException("Parte de horas no encontrado")
 
-    if timesheet.status != TimesheetStatus.SUBMITTED:
-        raise BusinessRuleException(
-            "Solo puedes aprobar partes en estado Submitted", status_code=status.HTTP_409_CONFLICT
-        )
+def reject_timesheet(
+    session: Session, timesheet_id: UUID, current_user: User, include_items: bool = False
+) -> TimesheetActionResponse:
+    return transition_timesheet(session, "reject", timesheet_id, current_user, include_items)
 
-    updated = crud.update_timesheet(
-        session, timesheet, TimesheetUpdate(status=TimesheetStatus.APPROVED)
-    )
-    logger.info("Timesheet %s aprobado por admin %s", timesheet.id, current_user.id)
-    refreshed = crud.get_timesheet(session, updated.id) or updated
-    return _build_action_response(refreshed)
 
+def bulk_transition_timesheets(
+    session: Session, request: TimesheetBulkTransition, current_user: User
+) -> TimesheetBulkTransitionResponse:
+    """Aprueba o rechaza de una vez todos los partes Submitted que cumplen los criterios.
 
-def reject_timesheet(
-    session: Session, timesheet_id: UUID, current_user: User
-) -> TimesheetActionResponse:
+    Un único ``UPDATE ... RETURNING id``; si se pasaron ids, una consulta más
+    explica por qué se omitió cada uno de los que no cambiaron.
+    """
     if current_user.role != "admin":
         raise AuthorizationException(
-            "Solo un admin puede rechazar partes de horas", status_code=status.HTTP_403_FORBIDDEN
+            "Solo un admin puede aprobar o rechazar partes de horas", status_code=status.HTTP_403_FORBIDDEN
         )
 
-    timesheet = crud.get_timesheet(session, timesheet_id)
-    if not timesheet:
-        raise NotFoundException("Parte de horas no encontrado")
-
-    if timesheet.status != TimesheetStatus.SUBMITTED:
-        raise BusinessRuleException(
-            "Solo puedes rechazar partes en estado Submitted", status_code=status.HTTP_409_CONFLICT
-        )
+    transition = TIMESHEET_TRANSITIONS[request.action]
+    target = transition.target
+    transitioned = crud.transition_timesheets(
+        session,
+        transition.source,
+        target,
+        timesheet_ids=request.timesheet_ids,
+        user_id=request.user_id,
+        project_id=request.project_id,
+        period_start=request.period_start,
+        period_end=request.period_end,
+    )
 
-    updated = crud.update_timesheet(
-        session, timesheet, TimesheetUpdate(status=TimesheetStatus.REJECTED)
+    skipped: list[TimesheetBulkSkipped] = []
+    if request.timesheet_ids:
+        done = set(transitioned)
+        pending = [timesheet_id for timesheet_id in dict.fromkeys(request.timesheet_ids) if timesheet_id not in done]
+        statuses = crud.get_timesheet_statuses(session, pending) if pending else {}
+        for timesheet_id in pending:
+            current = statuses.get(timesheet_id)
+            if current is None:
+                reason = "not_found"
+            elif current == transition.source:
+                reason = "filtered_out"
+            else:
+                reason = "not_submitted"
+            skipped.append(TimesheetBulkSkipped(id=timesheet_id, reason=reason, status=current))
+
+    logger.info(
+        "%d partes pasan a %s por admin %s (%d omitidos)", len(transitioned), target.value, current_user.id, len(skipped)
     )
-    logger.info("Timesheet %s rechazado por admin %s", timesheet.id, current_user.id)
-    refreshed = crud.get_timesheet(session, updated.id) or updated
-    return _build_action_response(refreshed)
+    return TimesheetBulkTransitionResponse(status=target, transitioned=transitioned, skipped=skipped)
 
 
 def create_timesheet_item(
     session: Session, timesheet_id: UUID, item_in: TimesheetItemCreate, current_user: User
 ) -> TimesheetItem:
+    if TIMESHEET_ITEM_FAST_INSERT:
+        return _create_timesheet_item_validated(session, timesheet_id, item_in, current_user)
+
     timesheet = get_timesheet(session, timesheet_id, current_user)
     _ensure_header_modifiable(timesheet)
 
@@ -258,9 +436,71 @@ def create_timesheet_item(
     return crud.create_item(session, timesheet.id, item_in)
 
 
-def list_timesheet_items(session: Session, timesheet_id: UUID, current_user: User) -> list[TimesheetItem]:
-    timesheet = get_timesheet(session, timesheet_id, current_user)
-    return crud.list_items(session, header_id=timesheet.id)
+def _create_timesheet_item_validated(
+    session: Session, timesheet_id: UUID, item_in: TimesheetItemCreate, current_user: User
+) -> TimesheetItem:
+    is_admin = current_user.role == "admin"
+    # El bloqueo precede a la validación: sin ser admin, solo sobre partes propios.
+    owner_id = None if is_admin else current_user.id
+    crud.lock_daily_total(session, timesheet_id, item_in.date, TIMESHEET_DAILY_LOCK, owner_id)
+    item, checks = crud.create_item_validated(session, timesheet_id, current_user.id, is_admin, item_in)
+    if item is not None:
+        return item
+
+    # Mismas reglas, en el mismo orden y con los mismos errores que el camino ORM.
+    if checks.found_header_id is None:
+        raise NotFoundException("Parte de horas no encontrado")
+    timesheet = TimesheetHeader(
+        id=checks.found_header_id,
+        user_id=checks.owner_id,
+        status=checks.header_status,
+        period_start=checks.period_start,
+        period_end=checks.period_end,
+    )
+    _ensure_owner_or_admin(timesheet, current_user)
+    _ensure_header_modifiable(timesheet)
+    if not checks.project_found:
+        raise NotFoundException("Proyecto no encontrado")
+    if not is_admin and not checks.is_member:
+        raise AuthorizationException("No perteneces al proyecto asignado", status_code=status.HTTP_403_FORBIDDEN)
+    _ensure_date_in_period(timesheet, item_in.date)
+    _validate_hours_value(item_in.hours)
+    _ensure_daily_total(float(checks.day_total or 0), item_in.hours)
+    raise BusinessRuleException("No se pudo registrar el ítem", status_code=status.HTTP_409_CONFLICT)
+
+
+def _item_list_filters(
+    filters: Optional[TimesheetItemListFilters], cursor: Optional[str], limit: int
+) -> dict[str, Any]:
+    return {
+        **(filters or TimesheetItemListFilters()).model_dump(),
+        "after": decode_date_cursor("items", cursor) if cursor else None,
+        "limit": limit + 1,
+    }
+
+
+def page_timesheet_items(
+    session: Session,
+    timesheet_id: UUID,
+    current_user: User,
+    filters: Optional[TimesheetItemListFilters] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[TimesheetItem], Optional[str]]:
+    """Una página de ítems del parte por ``(date, id)`` y el cursor de la siguiente."""
+    limit = _page_size(limit)
+    timesheet = crud.get_timesheet_header(session, timesheet_id)
+    if not timesheet:
+        raise NotFoundException("Parte de horas no encontrado")
+    _ensure_owner_or_admin(timesheet, current_user)
+    rows = crud.list_items(session, header_id=timesheet.id, **_item_list_filters(filters, cursor, limit))
+    return _split_page(rows, limit, "items", "date")
+
+
+def list_timesheet_items(
+    session: Session, timesheet_id: UUID, current_user: User, **kwargs: Any
+) -> list[TimesheetItem]:
+    return page_timesheet_items(session, timesheet_id, current_user, **kwargs)[0]
 
 
 def get_timesheet_item(
@@ -309,3 +549,392 @@ def delete_timesheet_item(session: Session, timesheet_id: UUID, item_id: UUID, c
         raise NotFoundException("Ítem no encontrado")
 
     crud.delete_item(session, item)
+
+
+# Escrituras por lotes. Se bloquean los totales diarios de todo el periodo, se
+# leen los ítems una vez y el resultado se valida en memoria sobre el estado
+# final; solo se escribe la diferencia con lo almacenado.
+
+_ITEM_FIELDS = ("project_id", "date", "description", "hours")
+
+
+def _load_items_for_write(
+    session: Session, timesheet_id: UUID, current_user: User
+) -> tuple[TimesheetHeader, list[TimesheetItem]]:
+    timesheet = crud.get_timesheet_header(session, timesheet_id)
+    if not timesheet:
+        raise NotFoundException("Parte de horas no encontrado")
+    _ensure_owner_or_admin(timesheet, current_user)
+    _ensure_header_modifiable(timesheet)
+
+    period_days = (timesheet.period_end - timesheet.period_start).days + 1
+    days = [timesheet.period_start + timedelta(days=offset) for offset in range(period_days)]
+    crud.lock_daily_totals(session, timesheet.id, days, TIMESHEET_DAILY_LOCK)
+    return timesheet, crud.list_items(session, header_id=timesheet.id)
+
+
+def _item_values(item: TimesheetItem) -> dict[str, Any]:
+    return {
+        "id": item.id,
+        "project_id": item.project_id,
+        "date": item.date,
+        "description": item.description,
+        "hours": float(item.hours),
+    }
+
+
+def _ensure_project_access(projects: dict[UUID, bool], project_id: UUID, current_user: User) -> None:
+    if project_id not in projects:
+        raise NotFoundException("Proyecto no encontrado")
+    if current_user.role != "admin" and not projects[project_id]:
+        raise AuthorizationException("No perteneces al proyecto asignado", status_code=status.HTTP_403_FORBIDDEN)
+
+
+def _validate_item_values(
+    timesheet: TimesheetHeader, projects: dict[UUID, bool], values: dict[str, Any], current_user: User
+) -> None:
+    _ensure_project_access(projects, values["project_id"], current_user)
+    _ensure_date_in_period(timesheet, values["date"])
+    _validate_hours_value(values["hours"])
+
+
+def _days_over_cap(items: Iterable[dict[str, Any]]) -> set[date]:
+    totals: defaultdict[date, float] = defaultdict(float)
+    for values in items:
+        totals[values["date"]] += values["hours"]
+    return {day for day, total in totals.items() if total > 24}
+
+
+def _diff_items(
+    current: dict[UUID, dict[str, Any]], final: dict[UUID, dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[UUID]]:
+    creates = [values for item_id, values in final.items() if item_id not in current]
+    updates = [values for item_id, values in final.items() if item_id in current and values != current[item_id]]
+    deletes = [item_id for item_id in current if item_id not in final]
+    return creates, updates, deletes
+
+
+def _batch_error(errors: dict[int, BusinessRuleException], operations: list[Any]) -> BusinessRuleException:
+    return BusinessRuleException(
+        "El lote no se aplicó: hay operaciones inválidas",
+        status_code=status.HTTP_400_BAD_REQUEST,
+        details=[
+            {"index": index, "op": operations[index].op, "status_code": exc.status_code, "message": exc.message}
+            for index, exc in sorted(errors.items())
+        ],
+    )
+
+
+def apply_timesheet_item_batch(
+    session: Session, timesheet_id: UUID, batch: TimesheetItemBatch, current_user: User
+) -> TimesheetItemBatchResponse:
+    """Aplica altas, modificaciones y bajas de ítems de un parte en una transacción.
+
+    Todo o nada: si alguna operación incumple una regla no se escribe nada y
+    el error lista, por índice, el motivo de cada operación rechazada.
+    """
+    operations = batch.operations
+    timesheet, items = _load_items_for_write(session, timesheet_id, current_user)
+    current = {item.id: _item_values(item) for item in items}
+    # Las modificaciones sin project_id revalidan el proyecto actual, como el endpoint individual.
+    project_ids = {op.project_id for op in operations if op.project_id}
+    project_ids |= {current[op.item_id]["project_id"] for op in operations if op.item_id in current}
+    projects = crud.project_memberships(session, current_user.id, project_ids)
+
+    final = dict(current)
+    targets: list[UUID] = []
+    errors: dict[int, BusinessRuleException] = {}
+    for index, operation in enumerate(operations):
+        item_id = operation.item_id or uuid4()
+        targets.append(item_id)
+        try:
+            if operation.op != "create" and item_id not in final:
+                raise NotFoundException("Ítem no encontrado")
+            if operation.op == "delete":
+                del final[item_id]
+                continue
+            changes = operation.model_dump(include=set(_ITEM_FIELDS), exclude_none=True)
+            values = {**final.get(item_id, {"id": item_id}), **changes}
+            values["hours"] = round(float(values["hours"]), 2)
+            _validate_item_values(timesheet, projects, values, current_user)
+            final[item_id] = values
+        except BusinessRuleException as exc:
+            errors[index] = exc
+
+    over_cap = _days_over_cap(final.values())
+    for index, operation in enumerate(operations):
+        if index not in errors and operation.op != "delete" and final.get(targets[index], {}).get("date") in over_cap:
+            errors[index] = BusinessRuleException("El total de horas por día no puede exceder 24")
+    if errors:
+        raise _batch_error(errors, operations)
+    if over_cap:
+        raise BusinessRuleException("El total de horas por día no puede exceder 24")
+
+    created, updated = crud.apply_item_changes(session, timesheet.id, *_diff_items(current, final))
+    by_id = {item.id: item for item in [*items, *created, *updated]}
+    results = [
+        TimesheetItemOperationResult(
+            index=index,
+            op=operation.op,
+            item_id=item_id,
+            item=TimesheetItemRead.model_validate(by_id[item_id]) if item_id in final else None,
+        )
+        for index, (operation, item_id) in enumerate(zip(operations, targets))
+    ]
+    return TimesheetItemBatchResponse(success=True, results=results)
+
+
+def _grid_items(items: Iterable[TimesheetItem], grid: TimesheetGrid) -> dict[UUID, dict[str, Any]]:
+    """Estado final de los ítems que describe la cuadrícula.
+
+    Cada celda (proyecto, día) reutiliza los ítems guardados en ella: si ya
+    suman las horas pedidas se dejan tal cual; si no, el primero pasa a
+    llevar el total de la celda y el resto se borra.
+    """
+    stored: defaultdict[tuple[UUID, date], list[dict[str, Any]]] = defaultdict(list)
+    for item in items:
+        stored[(item.project_id, item.date)].append(_item_values(item))
+
+    final: dict[UUID, dict[str, Any]] = {}
+    for row in grid.rows:
+        for day, hours in row.hours.items():
+            if hours == 0:
+                continue
+            hours = round(float(hours), 2)
+            cell = stored.get((row.project_id, day), [])
+            described = row.description is None or all(values["description"] == row.description for values in cell)
+            if cell and described and round(sum(values["hours"] for values in cell), 2) == hours:
+                final.update((values["id"], values) for values in cell)
+                continue
+            values = dict(cell[0]) if cell else {
+                "id": uuid4(),
+                "project_id": row.project_id,
+                "date": day,
+                "description": row.description or "",
+            }
+            values["hours"] = hours
+            if row.description is not None:
+                values["description"] = row.description
+            final[values["id"]] = values
+    return final
+
+
+def _grid_response_items(items: Iterable[TimesheetItem]) -> list[TimesheetItemRead]:
+    ordered = sorted(items, key=lambda item: (item.date, str(item.project_id)))
+    return [TimesheetItemRead.model_validate(item) for item in ordered]
+
+
+def save_timesheet_grid(
+    session: Session, timesheet_id: UUID, grid: TimesheetGrid, current_user: User
+) -> TimesheetGridResponse:
+    """Sustituye los ítems del parte por la cuadrícula proyecto × día.
+
+    La cabecera y los ítems se leen en una consulta y la diferencia se
+    calcula en memoria: una cuadrícula sin cambios no escribe nada. Si hay
+    cambios se bloquean los totales del periodo, se vuelve a calcular la
+    diferencia sobre los ítems releídos y se aplica en una transacción.
+    """
+    timesheet = crud.get_timesheet_with_items(session, timesheet_id)
+    if not timesheet:
+        raise NotFoundException("Parte de horas no encontrado")
+    _ensure_owner_or_admin(timesheet, current_user)
+    _ensure_header_modifiable(timesheet)
+
+    items = list(timesheet.items)
+    current = {item.id: _item_values(item) for item in items}
+    final = _grid_items(items, grid)
+    if not any(_diff_items(current, final)):
+        return TimesheetGridResponse(created=0, updated=0, deleted=0, items=_grid_response_items(items))
+
+    # Lo leído puede haber cambiado antes del bloqueo: se caduca y se relee.
+    for instance in [timesheet, *items]:
+        session.expire(instance)
+    timesheet, items = _load_items_for_write(session, timesheet_id, current_user)
+    current = {item.id: _item_values(item) for item in items}
+    final = _grid_items(items, grid)
+    creates, updates, deletes = _diff_items(current, final)
+
+    changed = [*creates, *updates]
+    projects = crud.project_memberships(session, current_user.id, {values["project_id"] for values in changed})
+    errors: list[dict[str, Any]] = []
+    for values in changed:
+        try:
+            _validate_item_values(timesheet, projects, values, current_user)
+        except BusinessRuleException as exc:
+            errors.append(
+                {
+                    "project_id": str(values["project_id"]),
+                    "date": values["date"].isoformat(),
+                    "status_code": exc.status_code,
+                    "message": exc.message,
+                }
+            )
+    for day in sorted(_days_over_cap(final.values())):
+        errors.append(
+            {
+                "date": day.isoformat(),
+                "status_code": status.HTTP_400_BAD_REQUEST,
+                "message": "El total de horas por día no puede exceder 24",
+            }
+        )
+    if errors:
+        raise BusinessRuleException(
+            "La cuadrícula no se guardó: hay celdas inválidas", status_code=status.HTTP_400_BAD_REQUEST, details=errors
+        )
+
+    created, updated = crud.apply_item_changes(session, timesheet.id, creates, updates, deletes)
+    by_id = {item.id: item for item in [*items, *created, *updated]}
+    return TimesheetGridResponse(
+        created=len(created),
+        updated=len(updated),
+        deleted=len(deletes),
+        items=_grid_response_items(by_id[item_id] for item_id in final),
+    )
+
+
+# Variantes asíncronas (DB_ASYNC). Las lecturas consultan con ``AsyncSession``;
+# las escrituras reutilizan las reglas síncronas vía ``run_sync``, que ejecuta
+# el mismo código sobre la conexión asíncrona sin ocupar un hilo del pool.
+
+
+async def page_timesheets_async(
+    session: AsyncSession,
+    current_user: User,
+    filters: Optional[TimesheetListFilters] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[TimesheetHeader], Optional[str]]:
+    limit = _page_size(limit)
+    rows = await crud.list_timesheets_async(session, **_timesheet_list_filters(filters, current_user, cursor, limit))
+    return _split_page(rows, limit, "timesheets", "period_start")
+
+
+async def page_timesheet_summaries_async(
+    session: AsyncSession,
+    current_user: User,
+    filters: Optional[TimesheetListFilters] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[TimesheetListRead], Optional[str]]:
+    limit = _page_size(limit)
+    rows = await crud.list_timesheets_with_totals_async(
+        session, **_timesheet_list_filters(filters, current_user, cursor, limit)
+    )
+    return _split_page(_summaries(rows), limit, "timesheets", "period_start")
+
+
+async def list_timesheets_async(session: AsyncSession, current_user: User, **kwargs: Any) -> list[TimesheetHeader]:
+    return (await page_timesheets_async(session, current_user, **kwargs))[0]
+
+
+async def get_timesheet_async(session: AsyncSession, timesheet_id: UUID, current_user: User) -> TimesheetHeader:
+    timesheet = await crud.get_timesheet_async(session, timesheet_id)
+    if not timesheet:
+        raise NotFoundException("Parte de horas no encontrado")
+    _ensure_owner_or_admin(timesheet, current_user)
+    return timesheet
+
+
+async def page_timesheet_items_async(
+    session: AsyncSession,
+    timesheet_id: UUID,
+    current_user: User,
+    filters: Optional[TimesheetItemListFilters] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[TimesheetItem], Optional[str]]:
+    limit = _page_size(limit)
+    timesheet = await crud.get_timesheet_header_async(session, timesheet_id)
+    if not timesheet:
+        raise NotFoundException("Parte de horas no encontrado")
+    _ensure_owner_or_admin(timesheet, current_user)
+    rows = await crud.list_items_async(session, header_id=timesheet.id, **_item_list_filters(filters, cursor, limit))
+    return _split_page(rows, limit, "items", "date")
+
+
+async def list_timesheet_items_async(
+    session: AsyncSession, timesheet_id: UUID, current_user: User, **kwargs: Any
+) -> list[TimesheetItem]:
+    return (await page_timesheet_items_async(session, timesheet_id, current_user, **kwargs))[0]
+
+
+async def get_timesheet_item_async(
+    session: AsyncSession, timesheet_id: UUID, item_id: UUID, current_user: User
+) -> TimesheetItem:
+    timesheet = await get_timesheet_async(session, timesheet_id, current_user)
+
+    item = await crud.get_item_async(session, item_id)
+    if not item or item.header_id != timesheet.id:
+        raise NotFoundException("Ítem no encontrado")
+
+    return item
+
+
+async def create_timesheet_async(
+    session: AsyncSession, current_user: User, timesheet_in: TimesheetCreate
+) -> TimesheetHeader:
+    return await session.run_sync(create_timesheet, current_user, timesheet_in)
+
+
+async def update_timesheet_async(
+    session: AsyncSession, timesheet_id: UUID, timesheet_in: TimesheetUpdate, current_user: User
+) -> TimesheetHeader:
+    return await session.run_sync(update_timesheet, timesheet_id, timesheet_in, current_user)
+
+
+async def delete_timesheet_async(session: AsyncSession, timesheet_id: UUID, current_user: User) -> None:
+    await session.run_sync(delete_timesheet, timesheet_id, current_user)
+
+
+async def submit_timesheet_async(
+    session: AsyncSession, timesheet_id: UUID, current_user: User, include_items: bool = False
+) -> TimesheetActionResponse:
+    return await session.run_sync(submit_timesheet, timesheet_id, current_user, include_items)
+
+
+async def bulk_transition_timesheets_async(
+    session: AsyncSession, request: TimesheetBulkTransition, current_user: User
+) -> TimesheetBulkTransitionResponse:
+    return await session.run_sync(bulk_transition_timesheets, request, current_user)
+
+
+async def approve_timesheet_async(
+    session: AsyncSession, timesheet_id: UUID, current_user: User, include_items: bool = False
+) -> TimesheetActionResponse:
+    return await session.run_sync(approve_timesheet, timesheet_id, current_user, include_items)
+
+
+async def reject_timesheet_async(
+    session: AsyncSession, timesheet_id: UUID, current_user: User, include_items: bool = False
+) -> TimesheetActionResponse:
+    return await session.run_sync(reject_timesheet, timesheet_id, current_user, include_items)
+
+
+async def create_timesheet_item_async(
+    session: AsyncSession, timesheet_id: UUID, item_in: TimesheetItemCreate, current_user: User
+) -> TimesheetItem:
+    return await session.run_sync(create_timesheet_item, timesheet_id, item_in, current_user)
+
+
+async def update_timesheet_item_async(
+    session: AsyncSession, timesheet_id: UUID, item_id: UUID, item_in: TimesheetItemUpdate, current_user: User
+) -> TimesheetItem:
+    return await session.run_sync(update_timesheet_item, timesheet_id, item_id, item_in, current_user)
+
+
+async def delete_timesheet_item_async(
+    session: AsyncSession, timesheet_id: UUID, item_id: UUID, current_user: User
+) -> None:
+    await session.run_sync(delete_timesheet_item, timesheet_id, item_id, current_user)
+
+
+async def apply_timesheet_item_batch_async(
+    session: AsyncSession, timesheet_id: UUID, batch: TimesheetItemBatch, current_user: User
+) -> TimesheetItemBatchResponse:
+    return await session.run_sync(apply_timesheet_item_batch, timesheet_id, batch, current_user)
+
+
+async def save_timesheet_grid_async(
+    session: AsyncSession, timesheet_id: UUID, grid: TimesheetGrid, current_user: User
+) -> TimesheetGridResponse:
+    return await session.run_sync(save_timesheet_grid, timesheet_id, grid, current_user)
@@ -0,0 +1,36 @@
+"""Cursores opacos para la paginación por clave (keyset).
+
+Un cursor codifica, en base64 URL-safe, la clave de orden de la última fila
+de una página junto con el nombre del listado, para que no se pueda reutilizar
+en otro. El cliente lo devuelve tal cual; la siguiente página filtra por
+``(clave) > (cursor)`` y cuesta lo mismo que la primera, sin ``OFFSET``.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from app.core.errors import BusinessRuleException
+
+
+def encode_cursor(kind: str, *values: Any) -> str:
+    payload = [kind, *(value.isoformat() if isinstance(value, date) else str(value) for value in values)]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_date_cursor(kind: str, cursor: str) -> tuple[date, UUID]:
+    """Devuelve la clave ``(fecha, id)`` de un cursor emitido por :func:`encode_cursor`."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload_kind, day, row_id = json.loads(raw)
+        if payload_kind != kind:
+            raise ValueError(payload_kind)
+        return date.fromisoformat(day), UUID(row_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise BusinessRuleException("Cursor de paginación inválido") from exc
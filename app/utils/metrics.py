@@ -0,0 +1,50 @@
+"""Métricas simples en memoria para observar latencias internas."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Sequence
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LatencyHistogram:
+    """Histograma acumulado de duraciones en segundos.
+
+    Los buckets son límites superiores inclusivos; las observaciones que los
+    superan se cuentan en ``+Inf``.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            labels = [str(bound) for bound in self.buckets] + ["+Inf"]
+            return {
+                "count": self.count,
+                "total_seconds": round(self.total, 6),
+                "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+                "max_seconds": round(self.max, 6),
+                "buckets": dict(zip(labels, self._counts)),
+            }
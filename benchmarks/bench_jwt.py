@@ -0,0 +1,51 @@
+"""Microbenchmark de emisión y verificación de tokens JWT.
+
+Uso::
+
+    python -m benchmarks.bench_jwt --number 20000
+
+Compara ``decode_token`` en frío (caché vacía: firma HMAC + base64 + JSON) con
+la ruta rápida (token ya verificado, acierto en la LRU).
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from datetime import timedelta
+from uuid import uuid4
+
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<28} {seconds / number * 1_000_000:8.2f} µs/op  ({number} ops)")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args(argv)
+    number = args.number
+
+    subject = str(uuid4())
+    token = create_access_token(subject, expires_delta=timedelta(minutes=15))
+
+    _report("create_token", timeit.timeit(lambda: create_access_token(subject), number=number), number)
+
+    def _cold() -> None:
+        token_cache.clear()
+        decode_token(token, expected_type="access")
+
+    _report("decode_token (sin caché)", timeit.timeit(_cold, number=number), number)
+
+    token_cache.clear()
+    decode_token(token, expected_type="access")
+    _report(
+        "decode_token (caché)",
+        timeit.timeit(lambda: decode_token(token, expected_type="access"), number=number),
+        number,
+    )
+
+
+if __name__ == "__main__":
+    main()
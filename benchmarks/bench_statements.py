@@ -0,0 +1,186 @@
+"""Microbenchmark de las consultas calientes: ``select(...)`` por llamada vs registro de sentencias.
+
+Uso::
+
+    python -m benchmarks.bench_statements --number 5000
+    python -m benchmarks.bench_statements --url postgresql+psycopg://u:p@localhost/bench
+
+Para cada consulta mide por separado:
+
+* construcción: obtener la sentencia y su clave de caché (coste Python que se
+  paga en cada petición antes de tocar la base de datos);
+* ejecución: la llamada completa con ``Session`` (sentencia + caché de
+  compilación + ida y vuelta al driver).
+
+``get_membership`` incluye también ``session.get``, que el CRUD usaba antes:
+el identity map guarda referencias débiles, así que una membresía que nadie
+retiene vuelve a consultarse en cada llamada.
+
+``--url`` debe apuntar a una base desechable y migrada (``alembic upgrade
+head``, que crea los estados de usuario y proyecto): se insertan datos de
+prueba. Con psycopg 3 la ejecución incluye además el efecto de las sentencias
+preparadas; compárese con ``DB_PREPARE_THRESHOLD=none``.
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from datetime import date
+from typing import Callable
+from uuid import uuid4
+
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.database import engine_options
+from app.crud import statements
+from app.models import Project, TimesheetHeader, TimesheetItem, User, UserProjectMembership
+from app.models.timesheet import TimesheetStatus
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<40} {seconds / number * 1_000_000:8.2f} µs/op  ({number} ops)")
+
+
+# Versiones previas: la sentencia se reconstruye en cada llamada.
+
+def _timesheet_by_id(timesheet_id):
+    return select(TimesheetHeader).where(TimesheetHeader.id == timesheet_id).options(selectinload(TimesheetHeader.items))
+
+
+def _overlapping_timesheet(user_id, period_start, period_end, exclude_id=None):
+    statement = select(TimesheetHeader).where(
+        TimesheetHeader.user_id == user_id,
+        TimesheetHeader.period_start <= period_end,
+        TimesheetHeader.period_end >= period_start,
+    )
+    if exclude_id:
+        statement = statement.where(TimesheetHeader.id != exclude_id)
+    return statement
+
+
+def _membership(project_id, user_id):
+    return select(UserProjectMembership).where(
+        UserProjectMembership.user_id == user_id, UserProjectMembership.project_id == project_id
+    )
+
+
+def _user_by_email(email):
+    return select(User).where(User.email == email)
+
+
+def _daily_item_hours(header_id, item_date, exclude_id=None):
+    statement = select(func.coalesce(func.sum(TimesheetItem.hours), 0)).where(
+        TimesheetItem.header_id == header_id, TimesheetItem.date == item_date
+    )
+    if exclude_id:
+        statement = statement.where(TimesheetItem.id != exclude_id)
+    return statement
+
+
+def _seed(session: Session) -> dict:
+    user = User(
+        user_id=f"bench-{uuid4().hex[:16]}",
+        name="Bench",
+        email=f"bench-{uuid4().hex}@example.com",
+        hashed_password="x",
+        role="USER",
+    )
+    project = Project(code=f"B-{uuid4().hex[:8]}", name="Bench")
+    session.add_all([user, project])
+    session.flush()
+    header = TimesheetHeader(
+        user_id=user.id, period_start=date(2024, 1, 1), period_end=date(2024, 1, 7), status=TimesheetStatus.DRAFT
+    )
+    session.add_all([header, UserProjectMembership(user_id=user.id, project_id=project.id)])
+    session.flush()
+    for day in range(1, 8):
+        session.add(
+            TimesheetItem(header_id=header.id, project_id=project.id, date=date(2024, 1, day), description="b", hours=4)
+        )
+    session.commit()
+    return {"user": user.id, "email": user.email, "project": project.id, "header": header.id}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5_000)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args(argv)
+    number = args.number
+
+    engine = create_engine(args.url, **engine_options(args.url, pooled=False))
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        ids = _seed(session)
+
+    start, end, day = date(2024, 1, 5), date(2024, 1, 9), date(2024, 1, 2)
+    overlap = {"user_id": ids["user"], "period_start": start, "period_end": end, "exclude_id": ids["header"]}
+    day_items = {"header_id": ids["header"], "item_date": day, "exclude_id": uuid4()}
+    # (nombre, [(etiqueta, sentencia por llamada, parámetros)])
+    cases: list[tuple[str, list[tuple[str, Callable, dict]]]] = [
+        (
+            "get_timesheet",
+            [
+                ("select()", lambda: _timesheet_by_id(ids["header"]), {}),
+                ("registro", lambda: statements.TIMESHEET_BY_ID, {"timesheet_id": ids["header"]}),
+            ],
+        ),
+        (
+            "find_overlapping_timesheet",
+            [
+                ("select()", lambda: _overlapping_timesheet(ids["user"], start, end, ids["header"]), {}),
+                ("registro", lambda: statements.OVERLAPPING_TIMESHEET_EXCLUDING, overlap),
+            ],
+        ),
+        (
+            "get_membership",
+            [
+                ("select()", lambda: _membership(ids["project"], ids["user"]), {}),
+                ("registro", lambda: statements.MEMBERSHIP, {"user_id": ids["user"], "project_id": ids["project"]}),
+            ],
+        ),
+        (
+            "get_by_email",
+            [
+                ("select()", lambda: _user_by_email(ids["email"]), {}),
+                ("registro", lambda: statements.USER_BY_EMAIL, {"email": ids["email"]}),
+            ],
+        ),
+        (
+            "daily_item_hours",
+            [
+                ("select()", lambda: _daily_item_hours(ids["header"], day, day_items["exclude_id"]), {}),
+                ("registro", lambda: statements.DAILY_ITEM_HOURS_EXCLUDING, day_items),
+            ],
+        ),
+    ]
+
+    with Session(engine) as session:
+        for name, variants in cases:
+            for label, build, params in variants:
+                session.exec(build(), params=params).first()  # calienta la caché de compilación
+                _report(
+                    f"{name} construcción [{label}]",
+                    timeit.timeit(lambda: build()._generate_cache_key(), number=number),
+                    number,
+                )
+                _report(
+                    f"{name} ejecución    [{label}]",
+                    timeit.timeit(lambda: session.exec(build(), params=params).first(), number=number),
+                    number,
+                )
+                session.expunge_all()
+
+        membership_key = (ids["user"], ids["project"])
+        _report(
+            "get_membership ejecución    [session.get]",
+            timeit.timeit(lambda: session.get(UserProjectMembership, membership_key), number=number),
+            number,
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
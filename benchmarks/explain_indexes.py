@@ -0,0 +1,200 @@
+"""Planes de ejecución de las consultas calientes antes y después de los índices compuestos.
+
+Uso::
+
+    python -m benchmarks.explain_indexes --users 1000 --weeks 52
+    python -m benchmarks.explain_indexes --url postgresql+psycopg://u:p@localhost/bench
+
+Genera un dataset sintético (``users`` × ``weeks`` partes con cinco ítems
+cada uno), elimina los índices de la revisión ``5b58b5a902b5``, muestra el
+``EXPLAIN`` y el tiempo medio de cada consulta, crea los índices y repite.
+Las consultas son las mismas sentencias que ejecutan ``app.crud`` y los
+reportes. ``--url`` debe apuntar a una base desechable.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import Index, create_engine, insert, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlmodel import SQLModel
+
+from app.crud import statements
+from app.crud.reports import (
+    _hours_by_project_statement,
+    _hours_by_status_statement,
+    _hours_by_user_statement,
+    _user_projects_statement,
+)
+from app.crud.timesheets import _list_items_statement, _list_timesheets_statement
+from app.models import Project, TimesheetHeader, TimesheetItem, User, UserProjectMembership
+from app.models.timesheet import TimesheetStatus
+
+NEW_INDEXES = {
+    "ix_timesheet_header_user_period",
+    "ix_timesheet_header_submitted",
+    "ix_timesheet_item_header_date",
+    "ix_timesheet_item_project_date",
+    "ix_timesheet_item_date",
+    "ix_user_project_membership_project_id",
+}
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Any) -> None:
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if compiler.dialect.name == "sqlite" else "EXPLAIN "
+    return prefix + compiler.process(element.statement, **kw)
+
+
+def _indexes() -> list[Index]:
+    tables = [TimesheetHeader.__table__, TimesheetItem.__table__, UserProjectMembership.__table__]
+    return [index for table in tables for index in table.indexes if index.name in NEW_INDEXES]
+
+
+def _seed(connection: Any, users: int, weeks: int) -> dict[str, Any]:
+    rng = random.Random(42)
+    user_ids = [uuid4() for _ in range(users)]
+    project_ids = [uuid4() for _ in range(max(10, users // 10))]
+    connection.execute(
+        insert(User.__table__),
+        [
+            {"id": uid, "user_id": f"u{n}", "email": f"u{n}@example.com", "hashed_password": "x", "name": f"U{n}"}
+            for n, uid in enumerate(user_ids)
+        ],
+    )
+    connection.execute(
+        insert(Project.__table__),
+        [{"id": pid, "code": f"P{n}", "name": f"Proyecto {n}"} for n, pid in enumerate(project_ids)],
+    )
+    memberships = {(uid, rng.choice(project_ids)) for uid in user_ids for _ in range(3)}
+    connection.execute(
+        insert(UserProjectMembership.__table__),
+        [{"user_id": uid, "project_id": pid} for uid, pid in memberships],
+    )
+
+    statuses = list(TimesheetStatus)
+    start = date(2023, 1, 2)
+    for uid in user_ids:
+        headers, items = [], []
+        for week in range(weeks):
+            header_id, period_start = uuid4(), start + timedelta(weeks=week)
+            headers.append(
+                {
+                    "id": header_id,
+                    "user_id": uid,
+                    "period_start": period_start,
+                    "period_end": period_start + timedelta(days=6),
+                    "status": rng.choice(statuses).value,
+                }
+            )
+            for day in range(5):
+                items.append(
+                    {
+                        "id": uuid4(),
+                        "header_id": header_id,
+                        "project_id": rng.choice(project_ids),
+                        "date": period_start + timedelta(days=day),
+                        "description": "trabajo",
+                        "hours": 8,
+                    }
+                )
+        connection.execute(insert(TimesheetHeader.__table__), headers)
+        connection.execute(insert(TimesheetItem.__table__), items)
+
+    sample = connection.execute(
+        select(TimesheetHeader.id, TimesheetHeader.user_id, TimesheetHeader.period_start).limit(1)
+    ).one()
+    return {"header": sample.id, "user": sample.user_id, "day": sample.period_start, "project": project_ids[0]}
+
+
+def _queries(ids: dict[str, Any]) -> list[tuple[str, Any, dict[str, Any]]]:
+    month = (date(2023, 3, 1), date(2023, 3, 31))
+    return [
+        ("daily_total", statements.DAILY_ITEM_HOURS, {"header_id": ids["header"], "item_date": ids["day"]}),
+        (
+            "find_overlapping_timesheet",
+            statements.OVERLAPPING_TIMESHEET,
+            {"user_id": ids["user"], "period_start": ids["day"], "period_end": ids["day"] + timedelta(days=6)},
+        ),
+        ("list_timesheets(user)", _list_timesheets_statement(ids["user"]), {}),
+        ("list_items(header)", _list_items_statement(ids["header"]), {}),
+        (
+            "members(project)",
+            select(UserProjectMembership).where(UserProjectMembership.project_id == ids["project"]),
+            {},
+        ),
+        ("get_by_email", statements.USER_BY_EMAIL, {"email": "u1@example.com"}),
+        ("report user-hours", _hours_by_user_statement(*month), {}),
+        ("report project-hours", _hours_by_project_statement(ids["project"], *month), {}),
+        ("report user-projects", _user_projects_statement(ids["user"], *month), {}),
+        ("report summary", _hours_by_status_statement(*month), {}),
+        (
+            "submitted queue",
+            select(TimesheetHeader.id)
+            .where(TimesheetHeader.status == TimesheetStatus.SUBMITTED.value)
+            .order_by(TimesheetHeader.period_start)
+            .limit(50),
+            {},
+        ),
+    ]
+
+
+def _explain(connection: Any, label: str, queries: list[tuple[str, Any, dict[str, Any]]], repeat: int) -> None:
+    print(f"\n=== {label} ===")
+    for name, statement, params in queries:
+        # Las filas del plan no tienen las columnas de la consulta: se leen del cursor DBAPI.
+        plan = connection.execute(Explain(statement), params).cursor.fetchall()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            connection.execute(statement, params).all()
+        elapsed = (time.perf_counter() - started) / repeat * 1000
+        print(f"\n-- {name}: {elapsed:.2f} ms")
+        for row in plan:
+            print("   ", row[-1])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.url)
+    SQLModel.metadata.create_all(engine)
+    indexes = _indexes()
+    with engine.begin() as connection:
+        for index in indexes:
+            index.drop(connection, checkfirst=True)
+        ids = _seed(connection, args.users, args.weeks)
+        connection.exec_driver_sql("ANALYZE")
+    print(f"{args.users} usuarios, {args.users * args.weeks} partes, {args.users * args.weeks * 5} ítems")
+
+    queries = _queries(ids)
+    with engine.connect() as connection:
+        _explain(connection, "sin índices compuestos", queries, args.repeat)
+    with engine.begin() as connection:
+        for index in indexes:
+            index.create(connection)
+        connection.exec_driver_sql("ANALYZE")
+    with engine.connect() as connection:
+        _explain(connection, "con índices compuestos", queries, args.repeat)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Prueba de carga del alta concurrente de ítems sobre un mismo parte.
+
+Uso::
+
+    python -m benchmarks.stress_daily_total --threads 16 --attempts 50
+    python -m benchmarks.stress_daily_total --url postgresql+psycopg://u:p@localhost/bench --days 5
+
+Varios hilos dan de alta ítems de ``--hours`` horas en el mismo parte,
+repartidos en ``--days`` días, con cada combinación de camino (``fast``:
+INSERT validado en una sentencia; ``orm``: consultas separadas) y modo de
+bloqueo (``TIMESHEET_DAILY_LOCK``). Para cada una muestra altas aceptadas y
+rechazadas, errores, el mayor total diario (nunca debe pasar de 24) y el
+rendimiento en escrituras por segundo.
+
+Con ``--days`` > 1 se ve la diferencia entre ``advisory`` (bloquea por parte
+y día) y ``header`` (bloquea todo el parte) en Postgres; en SQLite todos los
+modos comparten el único bloqueo de escritura de la base. ``--url`` debe
+apuntar a una base desechable y migrada.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app import crud
+from app.core import unit_of_work
+from app.core.database import engine_options
+from app.core.errors import BusinessRuleException
+from app.models import Project, TimesheetHeader, TimesheetItem, User, UserProjectMembership
+from app.schemas import TimesheetItemCreate
+from app.services import timesheets as timesheet_service
+
+START = date(2024, 1, 1)
+
+
+def _seed(engine: Any) -> dict[str, Any]:
+    with Session(engine) as session:
+        user = User(user_id=f"s{uuid4().hex[:8]}", email=f"{uuid4().hex}@example.com", hashed_password="x", name="Stress")
+        project = Project(code=uuid4().hex[:8], name="Stress")
+        session.add_all([user, project])
+        session.commit()
+        header = TimesheetHeader(user_id=user.id, period_start=START, period_end=START + timedelta(days=6))
+        session.add_all([UserProjectMembership(user_id=user.id, project_id=project.id), header])
+        session.commit()
+        return {"user": user.id, "project": project.id, "timesheet": header.id}
+
+
+def _hammer(engine: Any, ids: dict[str, Any], worker: int, attempts: int, days: int, hours: float) -> dict[str, int]:
+    counts = {"accepted": 0, "rejected": 0, "errors": 0}
+    item_in = TimesheetItemCreate(
+        project_id=ids["project"], date=START + timedelta(days=worker % days), description="stress", hours=hours
+    )
+    for _ in range(attempts):
+        with Session(engine) as session:
+            unit_of_work.begin(session)
+            try:
+                user = crud.get_user(session, ids["user"])
+                timesheet_service.create_timesheet_item(session, ids["timesheet"], item_in, user)
+                unit_of_work.complete(session)
+                counts["accepted"] += 1
+            except BusinessRuleException:
+                counts["rejected"] += 1
+            except Exception:  # noqa: BLE001 - bloqueos de SQLite, deadlocks...
+                counts["errors"] += 1
+    return counts
+
+
+def run(engine: Any, *, fast: bool, lock: str, threads: int, attempts: int, days: int, hours: float) -> dict[str, Any]:
+    timesheet_service.TIMESHEET_ITEM_FAST_INSERT = fast
+    timesheet_service.TIMESHEET_DAILY_LOCK = lock
+    ids = _seed(engine)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(lambda worker: _hammer(engine, ids, worker, attempts, days, hours), range(threads)))
+    elapsed = time.perf_counter() - started
+
+    with Session(engine) as session:
+        totals = session.exec(
+            select(func.sum(TimesheetItem.hours))
+            .where(TimesheetItem.header_id == ids["timesheet"])
+            .group_by(TimesheetItem.date)
+        ).all()
+        session.execute(delete(TimesheetItem).where(TimesheetItem.header_id == ids["timesheet"]))
+        session.commit()
+
+    summary = {key: sum(result[key] for result in results) for key in ("accepted", "rejected", "errors")}
+    summary["max_daily_total"] = float(max(totals, default=0) or 0)
+    summary["writes_per_second"] = round((summary["accepted"] + summary["rejected"]) / elapsed, 1)
+    return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="por defecto, SQLite en un fichero temporal")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=20)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--hours", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/stress.db"
+    engine = create_engine(url, **engine_options(url))
+    if args.url is None:
+        SQLModel.metadata.create_all(engine)
+
+    print(f"{args.threads} hilos x {args.attempts} altas de {args.hours} h en {args.days} día(s)")
+    print(f"{'camino':<6} {'bloqueo':<9} {'aceptadas':>9} {'rechazadas':>10} {'errores':>7} {'máx/día':>8} {'escr/s':>8}")
+    for fast in (True, False):
+        for lock in ("advisory", "header", "off"):
+            summary = run(
+                engine,
+                fast=fast,
+                lock=lock,
+                threads=args.threads,
+                attempts=args.attempts,
+                days=args.days,
+                hours=args.hours,
+            )
+            print(
+                f"{'fast' if fast else 'orm':<6} {lock:<9} {summary['accepted']:>9} {summary['rejected']:>10} "
+                f"{summary['errors']:>7} {summary['max_daily_total']:>8.1f} {summary['writes_per_second']:>8.1f}"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
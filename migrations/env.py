@@ -4,10 +4,10 @@ import os
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import create_engine, pool
 from sqlmodel import SQLModel
 
-from app.core.database import DATABASE_URL
+from app.core.database import DATABASE_URL, engine_options
 import app.models  # noqa: F401
 
 config = context.config
@@ -34,11 +34,8 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    url = config.get_main_option("sqlalchemy.url")
+    connectable = create_engine(url, poolclass=pool.NullPool, **engine_options(url, pooled=False))
 
     with connectable.connect() as connection:
         context.configure(connection=connection, target_metadata=target_metadata)
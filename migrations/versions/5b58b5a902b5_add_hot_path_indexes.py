@@ -0,0 +1,86 @@
+"""add composite and partial indexes for timesheet and membership hot paths
+
+Revision ID: 5b58b5a902b5
+Revises: a0635cec761d
+Create Date: 2026-10-18 00:00:00.000000
+
+En Postgres los índices se crean con ``CREATE INDEX CONCURRENTLY`` fuera de la
+transacción de la migración, para no bloquear escrituras sobre tablas grandes.
+En SQLite se crean dentro de un ``batch_alter_table``. Ver docs/indexes_doc.md.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5b58b5a902b5"
+down_revision = "a0635cec761d"
+branch_labels = None
+depends_on = None
+
+
+SUBMITTED = sa.text("status = 'Submitted'")
+
+# (tabla, nombre, columnas, opciones de dialecto)
+INDEXES = [
+    ("timesheet_header", "ix_timesheet_header_user_period", ["user_id", "period_start", "period_end"], {}),
+    (
+        "timesheet_header",
+        "ix_timesheet_header_submitted",
+        ["period_start", "user_id"],
+        {"postgresql_where": SUBMITTED, "sqlite_where": SUBMITTED},
+    ),
+    ("timesheet_item", "ix_timesheet_item_header_date", ["header_id", "date"], {"postgresql_include": ["hours"]}),
+    (
+        "timesheet_item",
+        "ix_timesheet_item_project_date",
+        ["project_id", "date"],
+        {"postgresql_include": ["header_id", "hours"]},
+    ),
+    ("timesheet_item", "ix_timesheet_item_date", ["date"], {"postgresql_include": ["header_id", "hours"]}),
+    ("user_project_membership", "ix_user_project_membership_project_id", ["project_id", "user_id"], {}),
+]
+
+
+def _existing_indexes() -> dict[str, set[str]]:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    return {
+        table: {index["name"] for index in inspector.get_indexes(table)}
+        for table in {table for table, *_ in INDEXES}
+        if table in tables
+    }
+
+
+def upgrade() -> None:
+    existing = _existing_indexes()
+    pending = [entry for entry in INDEXES if entry[0] in existing and entry[1] not in existing[entry[0]]]
+
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for table, name, columns, options in pending:
+                op.create_index(name, table, columns, postgresql_concurrently=True, **options)
+        return
+
+    for table in dict.fromkeys(table for table, *_ in pending):
+        with op.batch_alter_table(table) as batch_op:
+            for _, name, columns, options in (entry for entry in pending if entry[0] == table):
+                batch_op.create_index(name, columns, **options)
+
+
+def downgrade() -> None:
+    existing = _existing_indexes()
+    present = [entry for entry in reversed(INDEXES) if entry[1] in existing.get(entry[0], set())]
+
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for table, name, _, _ in present:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        return
+
+    for table in dict.fromkeys(table for table, *_ in present):
+        with op.batch_alter_table(table) as batch_op:
+            for _, name, _, _ in (entry for entry in present if entry[0] == table):
+                batch_op.drop_index(name)
@@ -0,0 +1,72 @@
+"""index refresh tokens by user, expiry and revocation
+
+Revision ID: 60a1ebc2f393
+Revises: a35906ccd648
+Create Date: 2026-10-18 00:00:00.000000
+
+En Postgres los índices se crean con ``CREATE INDEX CONCURRENTLY`` fuera de la
+transacción de la migración, para no bloquear los logins durante la creación.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "60a1ebc2f393"
+down_revision = "a35906ccd648"
+branch_labels = None
+depends_on = None
+
+
+# (nombre, columnas, opciones de dialecto); el parcial sirve la purga de revocados.
+INDEXES = [
+    ("ix_refresh_tokens_user_id", ["user_id"], {}),
+    ("ix_refresh_tokens_expires_at", ["expires_at"], {}),
+    (
+        "ix_refresh_tokens_revoked",
+        ["expires_at"],
+        {"postgresql_where": sa.text("revoked"), "sqlite_where": sa.text("revoked = 1")},
+    ),
+]
+
+
+def _existing_indexes() -> set[str] | None:
+    inspector = sa.inspect(op.get_bind())
+    if "refresh_tokens" not in inspector.get_table_names():
+        return None
+    return {index["name"] for index in inspector.get_indexes("refresh_tokens")}
+
+
+def upgrade() -> None:
+    existing = _existing_indexes()
+    if existing is None:
+        return
+
+    pending = [entry for entry in INDEXES if entry[0] not in existing]
+    if op.get_bind().dialect.name == "postgresql":
+        # Cada login inserta en refresh_tokens: sin CONCURRENTLY se bloquearían.
+        with op.get_context().autocommit_block():
+            for name, columns, options in pending:
+                op.create_index(name, "refresh_tokens", columns, postgresql_concurrently=True, **options)
+        return
+
+    for name, columns, options in pending:
+        op.create_index(name, "refresh_tokens", columns, **options)
+
+
+def downgrade() -> None:
+    existing = _existing_indexes()
+    if existing is None:
+        return
+
+    present = [name for name, _, _ in reversed(INDEXES) if name in existing]
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name in present:
+                op.drop_index(name, table_name="refresh_tokens", postgresql_concurrently=True)
+        return
+
+    for name in present:
+        op.drop_index(name, table_name="refresh_tokens")
@@ -0,0 +1,73 @@
+"""enforce non-overlapping timesheet periods per user in the database
+
+Revision ID: 8d858c3bdfc3
+Revises: 5b58b5a902b5
+Create Date: 2026-10-18 00:00:00.000000
+
+Postgres: restricción de exclusión GiST sobre ``(user_id, daterange(period_start,
+period_end, '[]'))`` (requiere ``btree_gist``). Añadirla valida las filas
+existentes bajo un bloqueo exclusivo de ``timesheet_header``, y falla si ya
+hay periodos solapados: deben corregirse antes de migrar. SQLite: triggers
+equivalentes a los que declara ``app.models.timesheet``.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8d858c3bdfc3"
+down_revision = "5b58b5a902b5"
+branch_labels = None
+depends_on = None
+
+
+CONSTRAINT = "ex_timesheet_header_no_overlap"
+
+SQLITE_TRIGGERS = {
+    "tr_timesheet_header_no_overlap_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS tr_timesheet_header_no_overlap_insert
+        BEFORE INSERT ON timesheet_header
+        WHEN EXISTS (
+            SELECT 1 FROM timesheet_header
+            WHERE user_id = NEW.user_id AND period_start <= NEW.period_end AND period_end >= NEW.period_start
+        )
+        BEGIN SELECT RAISE(ABORT, '{CONSTRAINT}'); END
+    """,
+    "tr_timesheet_header_no_overlap_update": f"""
+        CREATE TRIGGER IF NOT EXISTS tr_timesheet_header_no_overlap_update
+        BEFORE UPDATE OF user_id, period_start, period_end ON timesheet_header
+        WHEN EXISTS (
+            SELECT 1 FROM timesheet_header
+            WHERE id != OLD.id AND user_id = NEW.user_id
+              AND period_start <= NEW.period_end AND period_end >= NEW.period_start
+        )
+        BEGIN SELECT RAISE(ABORT, '{CONSTRAINT}'); END
+    """,
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.create_exclude_constraint(
+            CONSTRAINT,
+            "timesheet_header",
+            ("user_id", "="),
+            (sa.text("daterange(period_start, period_end, '[]')"), "&&"),
+            using="gist",
+        )
+        return
+
+    for trigger in SQLITE_TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint(CONSTRAINT, "timesheet_header")
+        return
+
+    for trigger in SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
@@ -0,0 +1,30 @@
+"""add login throttle buckets
+
+Revision ID: a0635cec761d
+Revises: 60a1ebc2f393
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a0635cec761d"
+down_revision = "60a1ebc2f393"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "login_throttle_buckets",
+        sa.Column("key", sa.String(length=400), primary_key=True),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.Float(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("login_throttle_buckets")
@@ -0,0 +1,54 @@
+"""add (period_start, id) index for keyset pagination of timesheet headers
+
+Revision ID: b21389496c59
+Revises: 8d858c3bdfc3
+Create Date: 2026-10-18 00:00:00.000000
+
+``GET /timesheets/`` pagina por ``(period_start, id)``. Para los admins (sin
+filtro de usuario) este índice permite empezar cada página en la clave del
+cursor en lugar de ordenar toda la tabla. Se crea como los de ``5b58b5a902b5``:
+``CONCURRENTLY`` en Postgres, ``batch_alter_table`` en SQLite.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b21389496c59"
+down_revision = "8d858c3bdfc3"
+branch_labels = None
+depends_on = None
+
+
+TABLE = "timesheet_header"
+INDEX = "ix_timesheet_header_period_id"
+COLUMNS = ["period_start", "id"]
+
+
+def _index_exists() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return INDEX in {index["name"] for index in inspector.get_indexes(TABLE)}
+
+
+def upgrade() -> None:
+    if _index_exists():
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(INDEX, TABLE, COLUMNS, postgresql_concurrently=True)
+        return
+    with op.batch_alter_table(TABLE) as batch_op:
+        batch_op.create_index(INDEX, COLUMNS)
+
+
+def downgrade() -> None:
+    if not _index_exists():
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX, table_name=TABLE, postgresql_concurrently=True)
+        return
+    with op.batch_alter_table(TABLE) as batch_op:
+        batch_op.drop_index(INDEX)
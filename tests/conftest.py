@@ -1,17 +1,40 @@
+import os
+
+os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
-from app.core.dependencies import get_session
+from app.core import replicas, unit_of_work
+from app.core.cache import principal_cache
+from app.core.database import DB_ASYNC
+from app.core.dependencies import get_async_session, get_session
 from app.core.security import get_password_hash
+from app.core.throttling import login_throttle
 from app.main import app
-from app.schemas import UserCreate
-import app.models  # noqa: F401 - registra metadatos
+from app.models import Project, TimesheetItem, UserProjectMembership
+from app.schemas import TimesheetCreate, TimesheetUpdate, UserCreate
+from app import models  # noqa: F401 - registra metadatos
+
+# Con DB_ASYNC el engine síncrono (fixtures) y el asíncrono (app) deben ver la
+# misma base, por lo que se usa un fichero temporal en lugar de ``:memory:``.
+TEST_DB_PATH = f"{tempfile.mkdtemp()}/test.db"
 
 
 def create_test_engine():
-    return create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    if DB_ASYNC:
+        return create_engine(f"sqlite:///{TEST_DB_PATH}", connect_args={"check_same_thread": False})
+    return create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
 
 
 @pytest.fixture(scope="session")
@@ -23,15 +46,37 @@ def engine():
 
 
 @pytest.fixture
-def client(engine):
+def client(engine, monkeypatch):
     SQLModel.metadata.drop_all(engine)
     SQLModel.metadata.create_all(engine)
+    principal_cache.clear()
+    login_throttle.reset()
 
     def get_session_override():
         with Session(engine) as session:
+            unit_of_work.begin(session)
+            yield session
+            unit_of_work.complete(session)
+
+    # NullPool: cada TestClient corre su propio event loop.
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DB_PATH}", poolclass=NullPool)
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            unit_of_work.begin(session.sync_session)
             yield session
+            await unit_of_work.complete_async(session)
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    # Lecturas contra la misma base de pruebas; test_read_replicas añade réplicas.
+    monkeypatch.setattr(
+        replicas,
+        "replica_router",
+        replicas.ReplicaRouter(
+            engine, [], max_lag_seconds=5, read_your_writes_seconds=5, async_primary=lambda: async_engine
+        ),
+    )
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -63,10 +108,10 @@ def user_payload():
 
 @pytest.fixture
 def create_user(client, engine):
-    def _create_user(payload: dict):
+    def _create_user(payload: dict, bind=None):
         user_in = UserCreate(**payload)
         hashed = get_password_hash(payload["password"])
-        with Session(engine) as session:
+        with Session(bind or engine) as session:
             return crud.create_user(session, user_in, hashed)
 
     return _create_user
@@ -102,3 +147,96 @@ def user_token(client, create_user, user_payload):
 @pytest.fixture
 def user_headers(user_token):
     return {"Authorization": f"Bearer {user_token}"}
+
+
+@pytest.fixture
+def login_headers(client, create_user):
+    """Crea un usuario adicional y devuelve sus cabeceras de autenticación."""
+
+    def _login_headers(payload: dict):
+        create_user(payload)
+        response = client.post("/auth/login", data={"username": payload["email"], "password": payload["password"]})
+        assert response.status_code == 200
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return _login_headers
+
+
+@pytest.fixture
+def owner(engine, user_headers, user_payload):
+    """Id del usuario de ``user_headers``, propietario de los partes de prueba."""
+    with Session(engine) as session:
+        return crud.get_by_email(session, user_payload["email"]).id
+
+
+@pytest.fixture
+def make_project(engine):
+    def _make_project(code: str, *, members=(), bind=None, **fields):
+        with Session(bind or engine) as session:
+            project = Project(code=code, name=fields.pop("name", f"Proyecto {code}"), **fields)
+            session.add(project)
+            session.commit()
+            session.add_all(UserProjectMembership(user_id=user_id, project_id=project.id) for user_id in members)
+            session.commit()
+            return project.id
+
+    return _make_project
+
+
+@pytest.fixture
+def make_timesheet(engine):
+    """Crea un parte semanal con estado e ítems ``(project_id, date, hours)`` opcionales."""
+
+    def _make_timesheet(user_id, period_start: date = date(2024, 1, 1), *, status=None, items=(), bind=None):
+        with Session(bind or engine) as session:
+            timesheet = crud.create_timesheet(
+                session,
+                user_id,
+                TimesheetCreate(period_start=period_start, period_end=period_start + timedelta(days=6)),
+            )
+            if status:
+                crud.update_timesheet(session, timesheet, TimesheetUpdate(status=status))
+            session.add_all(
+                TimesheetItem(header_id=timesheet.id, project_id=project_id, date=day, description="trabajo", hours=hours)
+                for project_id, day, hours in items
+            )
+            session.commit()
+            return timesheet.id
+
+    return _make_timesheet
+
+
+@pytest.fixture
+def draft_timesheet(owner, make_project, make_timesheet):
+    """Parte en Draft del 1 al 7 de enero de 2024 con un proyecto del que el propietario es miembro."""
+    project = make_project("P1", members=[owner])
+    return {"owner": owner, "project": project, "timesheet": make_timesheet(owner)}
+
+
+class StatementLog(list):
+    """Sentencias SQL ejecutadas; ``verbs`` devuelve solo su primera palabra."""
+
+    @property
+    def verbs(self) -> list[str]:
+        return [statement.split()[0].upper() for statement in self]
+
+
+@pytest.fixture
+def count_statements(engine):
+    """Context manager que registra las sentencias ejecutadas por el engine de pruebas."""
+
+    @contextmanager
+    def _count_statements(bind=None):
+        executed = StatementLog()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        target = bind or engine
+        event.listen(target, "before_cursor_execute", record)
+        try:
+            yield executed
+        finally:
+            event.remove(target, "before_cursor_execute", record)
+
+    return _count_statements
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.database import async_database_url
+from app.core.errors import AuthorizationException, NotFoundException
+from app.core.hashing import HashingPool, check_password, hash_password
+from app.core.security import decode_token, get_password_hash
+from app.schemas import TimesheetCreate, UserCreate
+from app.services import auth as auth_service
+from app.services import reports as report_service
+from app.services import timesheets as timesheet_service
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    yield url
+    engine.dispose()
+
+
+def test_async_database_url_selects_async_drivers():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert async_database_url("postgresql+psycopg://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+
+
+def test_async_services_share_the_sync_business_rules(database_url, user_payload):
+    with Session(create_engine(database_url)) as session:
+        user = crud.create_user(session, UserCreate(**user_payload), get_password_hash(user_payload["password"]))
+        user_id = user.id
+
+    async def scenario():
+        engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            token = await auth_service.login_async(session, user_payload["email"], user_payload["password"])
+            assert decode_token(token.access_token, expected_type="access")["sub"] == str(user_id)
+
+            with pytest.raises(AuthorizationException):
+                await auth_service.login_async(session, user_payload["email"], "wrong-password")
+
+            current_user = await crud.get_user_async(session, user_id)
+            period = TimesheetCreate(period_start=date(2024, 1, 1), period_end=date(2024, 1, 7))
+            created = await timesheet_service.create_timesheet_async(session, current_user, period)
+
+            listed = await timesheet_service.list_timesheets_async(session, current_user)
+            assert [timesheet.id for timesheet in listed] == [created.id]
+            fetched = await timesheet_service.get_timesheet_async(session, created.id, current_user)
+            assert fetched.items == []
+
+            with pytest.raises(NotFoundException):
+                await report_service.get_user_hours_report_async(
+                    session, date(2024, 1, 1), date(2024, 1, 7), current_user
+                )
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_hashing_pool_runs_async_without_blocking_the_loop():
+    pool = HashingPool("thread", workers=1, max_queue=1)
+
+    async def scenario():
+        hashed = await pool.run_async("hash", hash_password, "secret", 1000)
+        return await pool.run_async("verify", check_password, "secret", hashed)
+
+    try:
+        assert asyncio.run(scenario()) is True
+        assert pool.stats()["latency"]["verify"]["count"] == 1
+    finally:
+        pool.shutdown()
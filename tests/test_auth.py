@@ -1,3 +1,17 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core import security
+from app.core.cache import revoked_jti_cache
+from app.core.errors import AuthorizationException
+from app.services.maintenance import purge_refresh_tokens
+
 
 def test_login_returns_token(client, create_user, user_payload):
     create_user(user_payload)
@@ -16,3 +30,89 @@ def test_auth_me_returns_current_user(client, auth_headers, admin_payload):
     body = response.json()
     assert body["email"] == admin_payload["email"]
     assert body["user_id"] == admin_payload["user_id"]
+
+
+def test_cached_token_is_rejected_after_expiry(monkeypatch):
+    token = security.create_access_token("subject", expires_delta=timedelta(seconds=30))
+    assert security.decode_token(token, expected_type="access")["sub"] == "subject"
+    hits_before = security.token_cache.stats()["hits"]
+    assert security.decode_token(token, expected_type="access")["sub"] == "subject"
+    assert security.token_cache.stats()["hits"] == hits_before + 1
+
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: time.time() + 60))
+    with pytest.raises(AuthorizationException):
+        security.decode_token(token, expected_type="access")
+
+
+def test_tampered_token_is_rejected_even_if_original_is_cached():
+    token = security.create_access_token("subject")
+    security.decode_token(token)
+    header, payload, signature = token.split(".")
+    with pytest.raises(AuthorizationException):
+        security.decode_token(f"{header}.{payload}.{signature[:-2]}AA")
+
+
+def _login_tokens(client, create_user, user_payload):
+    create_user(user_payload)
+    response = client.post(
+        "/auth/login", data={"username": user_payload["email"], "password": user_payload["password"]}
+    )
+    return response.json()
+
+
+def test_refresh_rotates_and_rejects_replay(client, create_user, user_payload):
+    tokens = _login_tokens(client, create_user, user_payload)
+
+    rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert rotated.status_code == 200
+    new_tokens = rotated.json()
+    assert new_tokens["refresh_token"] != tokens["refresh_token"]
+
+    replay = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert replay.json()["message"] == "Token de refresco revocado"
+
+    again = client.post("/auth/refresh", json={"refresh_token": new_tokens["refresh_token"]})
+    assert again.status_code == 200
+
+
+def test_replayed_refresh_token_is_rejected_from_db_without_filter(client, create_user, user_payload):
+    tokens = _login_tokens(client, create_user, user_payload)
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+
+    revoked_jti_cache.clear()
+    replay = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert replay.json()["message"] == "Token de refresco revocado"
+
+
+def test_rotation_runs_in_a_single_transaction(client, engine, create_user, user_payload):
+    user = create_user(user_payload)
+    with Session(engine) as session:
+        crud.create_refresh_token(session, user.id, "old-jti", datetime(2999, 1, 1))
+
+    with Session(engine) as session:
+        new = crud.rotate_refresh_token(session, "old-jti", user.id, "new-jti", datetime(2999, 1, 1))
+        assert new is not None
+        assert crud.rotate_refresh_token(session, "old-jti", user.id, uuid4().hex, datetime(2999, 1, 1)) is None
+
+    with Session(engine) as session:
+        assert crud.get_refresh_token_by_jti(session, "old-jti").revoked is True
+        assert crud.get_refresh_token_by_jti(session, "new-jti").revoked is False
+
+
+def test_purge_removes_expired_and_revoked_tokens_in_batches(client, engine, create_user, user_payload):
+    user = create_user(user_payload)
+    with Session(engine) as session:
+        crud.create_refresh_token(session, user.id, "expired-1", datetime(2000, 1, 1))
+        crud.create_refresh_token(session, user.id, "expired-2", datetime(2000, 1, 1))
+        revoked = crud.create_refresh_token(session, user.id, "revoked", datetime(2999, 1, 1))
+        crud.revoke_refresh_token(session, revoked)
+        crud.create_refresh_token(session, user.id, "active", datetime(2999, 1, 1))
+
+    with Session(engine) as session:
+        assert purge_refresh_tokens(session, batch_size=2, max_batches=1) == 2
+        assert purge_refresh_tokens(session, batch_size=2) == 1
+        assert purge_refresh_tokens(session, batch_size=2) == 0
+        assert crud.get_refresh_token_by_jti(session, "active") is not None
+        assert crud.get_refresh_token_by_jti(session, "revoked") is None
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.schemas import TimesheetBulkTransition
+from app.services import timesheets as timesheet_service
+
+
+@pytest.fixture
+def setup(auth_headers, owner, make_project, make_timesheet):
+    project = make_project("P1")
+    items = {2: [(project, date(2024, 1, 15), 8)]}
+    timesheets = [
+        make_timesheet(owner, date(2024, 1, 1) + timedelta(weeks=week), status=status, items=items.get(week, ()))
+        for week, status in enumerate(["Submitted", "Submitted", "Submitted", "Draft"])
+    ]
+    return {"owner": owner, "project": project, "timesheets": timesheets}
+
+
+def _transition(client, headers, **criteria):
+    return client.post("/timesheets/bulk-transition", json=criteria, headers=headers)
+
+
+def _statuses(engine, setup):
+    with Session(engine) as session:
+        return [crud.get_timesheet(session, timesheet_id).status for timesheet_id in setup["timesheets"]]
+
+
+def test_ids_are_transitioned_in_one_update(engine, setup, admin_payload, count_statements):
+    first, second, _, draft = setup["timesheets"]
+    criteria = TimesheetBulkTransition(action="approve", timesheet_ids=[first, second, draft], user_id=setup["owner"])
+    with Session(engine) as session:
+        admin = crud.get_by_email(session, admin_payload["email"])
+        with count_statements() as executed:
+            response = timesheet_service.bulk_transition_timesheets(session, criteria, admin)
+
+    assert set(response.transitioned) == {first, second}
+    assert executed.verbs.count("UPDATE") == 1
+    assert _statuses(engine, setup) == ["Approved", "Approved", "Submitted", "Draft"]
+
+
+def test_skipped_ids_are_explained(client, setup, auth_headers):
+    first, second, _, draft = [str(timesheet_id) for timesheet_id in setup["timesheets"]]
+    missing = str(uuid4())
+    response = _transition(
+        client,
+        auth_headers,
+        action="approve",
+        timesheet_ids=[first, second, draft, missing],
+        user_id=str(setup["owner"]),
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] == "Approved"
+    assert set(body["transitioned"]) == {first, second}
+    assert {(skip["id"], skip["reason"], skip["status"]) for skip in body["skipped"]} == {
+        (draft, "not_submitted", "Draft"),
+        (missing, "not_found", None),
+    }
+
+
+def test_filters_select_submitted_timesheets(client, engine, setup, auth_headers):
+    timesheets = [str(timesheet_id) for timesheet_id in setup["timesheets"]]
+    response = _transition(client, auth_headers, action="reject", project_id=str(setup["project"]))
+    assert response.json()["transitioned"] == [timesheets[2]]
+
+    response = _transition(client, auth_headers, action="approve", period_start="2024-01-01", period_end="2024-01-07")
+    assert response.json()["transitioned"] == [timesheets[0]]
+    assert _statuses(engine, setup) == ["Approved", "Submitted", "Rejected", "Draft"]
+
+    # Los ids omitidos se explican con su estado actual.
+    response = _transition(
+        client, auth_headers, action="reject", timesheet_ids=timesheets[:2], period_end="2024-01-07"
+    )
+    body = response.json()
+    assert body["transitioned"] == []
+    assert [(skip["reason"], skip["status"]) for skip in body["skipped"]] == [
+        ("not_submitted", "Approved"),
+        ("filtered_out", "Submitted"),
+    ]
+
+
+def test_bulk_transition_requires_admin_and_criteria(client, setup, auth_headers, user_headers):
+    response = _transition(client, user_headers, action="approve", user_id=str(setup["owner"]))
+    assert response.status_code == 403
+
+    response = _transition(client, auth_headers, action="approve")
+    assert response.status_code == 422
+
+    response = _transition(client, auth_headers, action="approve", user_id=str(setup["owner"]))
+    assert response.status_code == 200
+    assert len(response.json()["transitioned"]) == 3
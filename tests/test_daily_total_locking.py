@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from app import crud
+from app.core import unit_of_work
+from app.core.errors import BusinessRuleException
+from app.schemas import TimesheetItemCreate
+from app.services import timesheets as timesheet_service
+
+THREADS = 8
+ATTEMPTS_PER_THREAD = 6
+
+
+@pytest.fixture
+def shared_engine(tmp_path, user_payload, create_user, make_project, make_timesheet):
+    # Fichero, no ``:memory:``: cada hilo necesita su propia conexión.
+    engine = create_engine(f"sqlite:///{tmp_path / 'stress.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    user_id = create_user(user_payload, bind=engine).id
+    ids = {
+        "user": user_id,
+        "project": make_project("P1", members=[user_id], bind=engine),
+        "timesheet": make_timesheet(user_id, bind=engine),
+    }
+    yield engine, ids
+    engine.dispose()
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_concurrent_item_writes_never_exceed_the_daily_cap(shared_engine, monkeypatch, fast):
+    monkeypatch.setattr(timesheet_service, "TIMESHEET_ITEM_FAST_INSERT", fast)
+    engine, ids = shared_engine
+    item_in = TimesheetItemCreate(project_id=ids["project"], date=date(2024, 1, 2), description="retry", hours=1)
+
+    def hammer(_):
+        accepted = rejected = 0
+        for _ in range(ATTEMPTS_PER_THREAD):
+            with Session(engine) as session:
+                unit_of_work.begin(session)
+                user = crud.get_user(session, ids["user"])
+                try:
+                    timesheet_service.create_timesheet_item(session, ids["timesheet"], item_in, user)
+                except BusinessRuleException as exc:
+                    assert exc.message == "El total de horas por día no puede exceder 24"
+                    rejected += 1
+                    continue
+                unit_of_work.complete(session)
+                accepted += 1
+        return accepted, rejected
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(hammer, range(THREADS)))
+
+    assert sum(accepted for accepted, _ in results) == 24
+    assert sum(rejected for _, rejected in results) == THREADS * ATTEMPTS_PER_THREAD - 24
+    with Session(engine) as session:
+        assert crud.daily_item_hours(session, ids["timesheet"], date(2024, 1, 2)) == 24
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.database import InstrumentedQueuePool, engine_options, pool_monitor
+
+
+def test_engine_options_share_pool_settings():
+    pooled = engine_options("postgresql+psycopg://user:secret@db/app")
+    assert pooled["poolclass"] is InstrumentedQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= pooled.keys()
+
+    migrations = engine_options("postgresql+psycopg://user:secret@db/app", pooled=False)
+    assert "pool_size" not in migrations
+    assert migrations["pool_pre_ping"] == pooled["pool_pre_ping"]
+
+
+def test_pool_stats_report_checkouts_and_acquire_waits(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    pool_monitor.attach(engine)
+    timeouts = pool_monitor.timeouts
+    waits = pool_monitor.acquire_wait.count
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_monitor.stats(engine)
+        assert stats["checked_out"] == 1
+        assert stats["idle"] == 0
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_monitor.stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert pool_monitor.timeouts == timeouts + 1
+    assert stats["acquire_wait"]["count"] == waits + 2
+    engine.dispose()
+
+
+def test_pool_metrics_are_exposed(client, auth_headers):
+    response = client.get("/metrics/", headers=auth_headers)
+    assert response.status_code == 200
+    assert "acquire_wait" in response.json()["database_pool"]
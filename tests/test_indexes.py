@@ -0,0 +1,43 @@
+from sqlalchemy import inspect
+
+
+def _plan(engine, sql: str, params: tuple) -> str:
+    with engine.connect() as connection:
+        return " ".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def test_hot_path_indexes_exist(client, engine):
+    inspector = inspect(engine)
+    item_indexes = {index["name"] for index in inspector.get_indexes("timesheet_item")}
+    header_indexes = {index["name"] for index in inspector.get_indexes("timesheet_header")}
+    membership_indexes = {index["name"] for index in inspector.get_indexes("user_project_membership")}
+
+    assert {"ix_timesheet_item_header_date", "ix_timesheet_item_project_date", "ix_timesheet_item_date"} <= item_indexes
+    assert {"ix_timesheet_header_user_period", "ix_timesheet_header_submitted"} <= header_indexes
+    assert "ix_user_project_membership_project_id" in membership_indexes
+
+
+def test_daily_total_and_overlap_use_composite_indexes(client, engine):
+    daily = _plan(
+        engine,
+        "SELECT coalesce(sum(hours), 0) FROM timesheet_item WHERE header_id = ? AND date = ?",
+        ("x", "2024-01-01"),
+    )
+    assert "ix_timesheet_item_header_date" in daily
+
+    overlap = _plan(
+        engine,
+        "SELECT id FROM timesheet_header WHERE user_id = ? AND period_start <= ? AND period_end >= ? LIMIT 1",
+        ("x", "2024-01-07", "2024-01-01"),
+    )
+    assert "ix_timesheet_header_user_period" in overlap
+
+
+def test_refresh_token_purge_passes_use_their_indexes(client, engine):
+    expired = _plan(engine, "SELECT id FROM refresh_tokens WHERE expires_at < ? LIMIT 500", ("2024-01-01",))
+    assert "ix_refresh_tokens_expires_at" in expired
+
+    revoked = _plan(
+        engine, "SELECT id FROM refresh_tokens WHERE revoked = 1 AND expires_at >= ? LIMIT 500", ("2024-01-01",)
+    )
+    assert "ix_refresh_tokens_revoked" in revoked
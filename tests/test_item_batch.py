@@ -0,0 +1,137 @@
+import pytest
+from sqlmodel import Session, select
+
+from app import crud
+from app.core import unit_of_work
+from app.models import TimesheetItem
+from app.schemas import TimesheetItemBatch
+from app.services import timesheets as timesheet_service
+
+
+@pytest.fixture
+def setup(draft_timesheet, make_project):
+    owner = draft_timesheet["owner"]
+    projects = [draft_timesheet["project"], *(make_project(f"P{n}", members=[owner]) for n in range(2, 5))]
+    return {**draft_timesheet, "projects": projects, "outsider": make_project("X1")}
+
+
+def _batch(client, setup, headers, operations):
+    return client.post(f"/timesheets/{setup['timesheet']}/items/batch", json={"operations": operations}, headers=headers)
+
+
+def _items(engine, setup):
+    with Session(engine) as session:
+        return {
+            str(item.id): item
+            for item in session.exec(select(TimesheetItem).where(TimesheetItem.header_id == setup["timesheet"]))
+        }
+
+
+def _create_op(project_id, day, hours=2.0, description="trabajo"):
+    return {
+        "op": "create",
+        "project_id": str(project_id),
+        "date": f"2024-01-{day:02d}",
+        "description": description,
+        "hours": hours,
+    }
+
+
+def test_weekly_fill_uses_a_constant_number_of_statements(engine, setup, count_statements):
+    operations = [
+        _create_op(project_id, day, hours=1.5)
+        for day in range(1, 6)
+        for project_id in setup["projects"]
+        for _ in range(2)
+    ]
+    assert len(operations) == 40
+
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, setup["owner"])
+        with count_statements() as executed:
+            response = timesheet_service.apply_timesheet_item_batch(
+                session, setup["timesheet"], TimesheetItemBatch(operations=operations), user
+            )
+        unit_of_work.complete(session)
+
+    assert response.success
+    assert [result.index for result in response.results] == list(range(40))
+    assert all(result.item and result.item.hours == 1.5 for result in response.results)
+    assert len(_items(engine, setup)) == 40
+    # Usuario, parte, bloqueo, ítems, proyectos e INSERT: no crece con el tamaño del lote.
+    assert executed.verbs.count("INSERT") == 1
+    assert len(executed) <= 8
+
+
+def test_mixed_batch_reports_results_per_operation(client, engine, setup, user_headers):
+    first, second = setup["projects"][:2]
+    created = _batch(client, setup, user_headers, [_create_op(first, 2, 4.0), _create_op(first, 3, 4.0)])
+    assert created.status_code == 200, created.text
+    keep_id, drop_id = (result["item_id"] for result in created.json()["results"])
+
+    response = _batch(
+        client,
+        setup,
+        user_headers,
+        [
+            {"op": "update", "item_id": keep_id, "hours": 6.0, "project_id": str(second)},
+            {"op": "delete", "item_id": drop_id},
+            _create_op(second, 4, 3.0),
+        ],
+    )
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["op"] for result in results] == ["update", "delete", "create"]
+    assert results[0]["item"]["hours"] == 6.0
+    assert results[0]["item"]["project_id"] == str(second)
+    assert results[1]["item"] is None
+    items = _items(engine, setup)
+    assert set(items) == {keep_id, results[2]["item_id"]}
+    assert items[keep_id].hours == 6.0
+
+
+def test_invalid_operation_rejects_the_whole_batch(client, engine, setup, user_headers):
+    project_id = setup["projects"][0]
+    response = _batch(
+        client,
+        setup,
+        user_headers,
+        [
+            _create_op(project_id, 2),
+            _create_op(setup["outsider"], 2),
+            _create_op(project_id, 9),
+            {"op": "delete", "item_id": str(setup["timesheet"])},
+        ],
+    )
+
+    assert response.status_code == 400
+    details = response.json()["details"]
+    assert [(detail["index"], detail["status_code"]) for detail in details] == [(1, 403), (2, 400), (3, 404)]
+    assert _items(engine, setup) == {}
+
+
+def test_daily_cap_is_checked_on_the_final_state(client, engine, setup, user_headers):
+    project_id = setup["projects"][0]
+    existing = client.post(
+        f"/timesheets/{setup['timesheet']}/items",
+        json={"project_id": str(project_id), "date": "2024-01-02", "description": "trabajo", "hours": 20},
+        headers=user_headers,
+    )
+    assert existing.status_code == 201
+
+    # Mover 20 h a otro día deja sitio a 10 h nuevas el mismo día del lote.
+    response = _batch(
+        client,
+        setup,
+        user_headers,
+        [_create_op(project_id, 2, 10.0), {"op": "update", "item_id": existing.json()["id"], "date": "2024-01-03"}],
+    )
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+    response = _batch(client, setup, user_headers, [_create_op(project_id, 3, 5.0)])
+    assert response.status_code == 400
+    assert response.json()["details"][0]["message"] == "El total de horas por día no puede exceder 24"
+    assert sum(item.hours for item in _items(engine, setup).values()) == 30
@@ -0,0 +1,94 @@
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core import unit_of_work
+from app.core.errors import AuthorizationException
+from app.schemas import TimesheetItemCreate
+from app.services import timesheets as timesheet_service
+
+
+def _item(project_id, day=2, hours=8.0):
+    return {"project_id": str(project_id), "date": f"2024-01-{day:02d}", "description": "trabajo", "hours": hours}
+
+
+def test_valid_item_is_inserted_in_a_single_statement(engine, draft_timesheet, count_statements, monkeypatch):
+    # Solo el alta; el bloqueo del total diario se prueba en test_daily_total_locking.
+    monkeypatch.setattr(timesheet_service, "TIMESHEET_DAILY_LOCK", "off")
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, draft_timesheet["owner"])
+        with count_statements() as executed:
+            item = timesheet_service.create_timesheet_item(
+                session, draft_timesheet["timesheet"], TimesheetItemCreate(**_item(draft_timesheet["project"])), user
+            )
+        unit_of_work.complete(session)
+        assert item.header_id == draft_timesheet["timesheet"]
+        assert float(item.hours) == 8.0
+        assert item.created_at is not None
+
+    assert executed.verbs == ["INSERT"]
+    with Session(engine) as session:
+        assert [i.id for i in crud.list_items(session, draft_timesheet["timesheet"])] == [item.id]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+@pytest.mark.parametrize(
+    "case, status_code, message",
+    [
+        ("missing_header", 404, "Parte de horas no encontrado"),
+        ("not_owner", 403, "Solo el propietario o un admin puede acceder a este parte de horas"),
+        ("not_draft", 400, "Solo puedes modificar ítems cuando el parte está en Draft"),
+        ("missing_project", 404, "Proyecto no encontrado"),
+        ("not_member", 403, "No perteneces al proyecto asignado"),
+        ("out_of_period", 400, "La fecha del ítem debe estar dentro del período del parte"),
+        ("daily_cap", 400, "El total de horas por día no puede exceder 24"),
+    ],
+)
+def test_rejections_match_the_orm_path(
+    client, draft_timesheet, user_headers, user_payload, login_headers, make_project, monkeypatch,
+    fast, case, status_code, message,
+):
+    monkeypatch.setattr(timesheet_service, "TIMESHEET_ITEM_FAST_INSERT", fast)
+    timesheet_id = draft_timesheet["timesheet"]
+    payload, headers = _item(draft_timesheet["project"]), user_headers
+    if case == "missing_header":
+        timesheet_id = uuid4()
+    elif case == "not_owner":
+        headers = login_headers({**user_payload, "user_id": "u002", "email": "other@example.com"})
+    elif case == "not_draft":
+        assert client.post(f"/timesheets/{timesheet_id}/submit", headers=user_headers).status_code == 200
+    elif case == "missing_project":
+        payload = _item(uuid4())
+    elif case == "not_member":
+        payload = _item(make_project("P2"))
+    elif case == "out_of_period":
+        payload = _item(draft_timesheet["project"], day=9)
+    elif case == "daily_cap":
+        response = client.post(
+            f"/timesheets/{timesheet_id}/items", json=_item(draft_timesheet["project"], hours=20), headers=user_headers
+        )
+        assert response.status_code == 201
+        payload = _item(draft_timesheet["project"], hours=5)
+
+    response = client.post(f"/timesheets/{timesheet_id}/items", json=payload, headers=headers)
+    assert response.status_code == status_code
+    assert response.json()["message"] == message
+
+
+def test_lock_is_only_taken_on_own_timesheets(
+    engine, draft_timesheet, user_payload, create_user, count_statements, monkeypatch
+):
+    monkeypatch.setattr(timesheet_service, "TIMESHEET_ITEM_FAST_INSERT", True)
+    other = create_user({**user_payload, "user_id": "u002", "email": "other@example.com"}).id
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, other)
+        item_in = TimesheetItemCreate(**_item(draft_timesheet["project"]))
+        with count_statements() as executed, pytest.raises(AuthorizationException):
+            timesheet_service.create_timesheet_item(session, draft_timesheet["timesheet"], item_in, user)
+
+    lock = executed[0]
+    assert lock.startswith("UPDATE timesheet_header") and "user_id" in lock
@@ -0,0 +1,92 @@
+import pytest
+from sqlmodel import Session, SQLModel, select
+
+from app import crud
+from app.core.errors import TooManyRequestsException
+from app.core.throttling import (
+    BucketRule,
+    DatabaseBucketStore,
+    LoginThrottle,
+    MemoryBucketStore,
+    login_throttle,
+)
+from app.models import LoginThrottleBucket
+
+
+def _login(client, email, password="wrong-password"):
+    return client.post("/auth/login", data={"username": email, "password": password})
+
+
+def test_excess_attempts_for_an_email_are_rejected_before_db_work(client, create_user, user_payload, monkeypatch):
+    create_user(user_payload)
+    burst = int(login_throttle.email_rule.capacity)
+    for _ in range(burst):
+        assert _login(client, user_payload["email"]).status_code == 401
+
+    def fail_lookup(*args, **kwargs):  # pragma: no cover - no debe ejecutarse
+        raise AssertionError("La base de datos no debe consultarse")
+
+    monkeypatch.setattr(crud, "get_by_email", fail_lookup)
+    response = _login(client, user_payload["email"].upper(), user_payload["password"])
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert login_throttle.stats()["rejected"]["email"] == 1
+
+
+def test_ip_bucket_limits_attempts_across_emails(client):
+    burst = int(login_throttle.ip_rule.capacity)
+    statuses = [_login(client, f"user{index}@example.com").status_code for index in range(burst + 1)]
+    assert statuses[:burst] == [401] * burst
+    assert statuses[-1] == 429
+    assert login_throttle.stats()["rejected"]["ip"] == 1
+
+
+def test_throttle_metrics_are_exposed(client, auth_headers):
+    response = client.get("/metrics/", headers=auth_headers)
+    assert response.status_code == 200
+    stats = response.json()["login_throttle"]
+    assert stats["store"] == "memory"
+    assert stats["allowed"] >= 1
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.core.throttling.time.monotonic", lambda: clock[0])
+    store = MemoryBucketStore(max_keys=10)
+    rule = BucketRule(capacity=2, per_minute=60)
+
+    assert store.consume("k", rule)[0]
+    assert store.consume("k", rule)[0]
+    allowed, retry_after = store.consume("k", rule)
+    assert not allowed
+    assert retry_after == 1.0
+
+    clock[0] += 1
+    assert store.consume("k", rule)[0]
+
+
+def test_database_store_shares_state_between_throttles(engine):
+    SQLModel.metadata.create_all(engine)
+    store = DatabaseBucketStore(engine)
+    store.clear()
+    rule = BucketRule(capacity=1, per_minute=1)
+    first = LoginThrottle(store, email_rule=rule, ip_rule=rule)
+    second = LoginThrottle(DatabaseBucketStore(engine), email_rule=rule, ip_rule=rule)
+
+    first.check("shared@example.com", None)
+    with pytest.raises(TooManyRequestsException):
+        second.check("Shared@example.com", None)
+    store.clear()
+
+
+def test_long_usernames_use_a_bounded_bucket_key(client, engine):
+    store = DatabaseBucketStore(engine)
+    throttle = LoginThrottle(store, email_rule=BucketRule(capacity=5, per_minute=5), ip_rule=BucketRule(5, 5))
+    throttle.check("x" * 5000 + "@example.com", None)
+
+    with Session(engine) as session:
+        keys = session.exec(select(LoginThrottleBucket.key)).all()
+    assert [len(key) for key in keys] == [len("email:") + 64]
+
+    response = _login(client, "y" * 5000 + "@example.com")
+    assert response.status_code == 401
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from app.models import Account
+
+
+@pytest.fixture
+def setup(engine, owner, user_payload, create_user, make_project, make_timesheet):
+    other = create_user({**user_payload, "user_id": "u002", "email": "other@example.com"}).id
+    with Session(engine) as session:
+        account = Account(account_id="ACC1", name="Cliente")
+        session.add(account)
+        session.commit()
+        account_id = account.id
+    project = make_project("P1", account_uuid=account_id)
+
+    items = [(project, date(2024, 1, 1 + day % 7), 1) for day in range(9)]
+    timesheets = [
+        make_timesheet(
+            owner,
+            date(2024, 1, 1) + timedelta(weeks=week),
+            status="Submitted" if week % 3 == 0 else None,
+            items=items if week == 0 else (),
+        )
+        for week in range(12)
+    ]
+    make_timesheet(other)
+    return {"owner": owner, "other": other, "account": account_id, "project": project, "timesheets": timesheets}
+
+
+def _pages(client, url, headers, **params):
+    pages, cursor = [], None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        assert 'rel="next"' in response.headers["Link"]
+
+
+def test_timesheets_are_paged_by_period_start_and_id(client, setup, user_headers, auth_headers):
+    pages = _pages(client, "/timesheets/", user_headers, limit=5)
+
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert [row_id for page in pages for row_id in page] == [str(row_id) for row_id in setup["timesheets"]]
+    assert [len(page) for page in _pages(client, "/timesheets/", auth_headers, limit=10)] == [10, 3]
+
+
+def test_timesheet_filters(client, setup, user_headers):
+    def listed(**filters):
+        response = client.get("/timesheets/", params=filters, headers=user_headers)
+        assert response.status_code == 200, response.text
+        return [row["id"] for row in response.json()]
+
+    timesheets = [str(row_id) for row_id in setup["timesheets"]]
+    assert listed(status="Submitted") == timesheets[0::3]
+    assert listed(period_from="2024-01-10", period_to="2024-01-20") == timesheets[1:3]
+    assert listed(project_id=str(setup["project"])) == [timesheets[0]]
+    assert listed(account_id=str(setup["account"])) == [timesheets[0]]
+
+    response = client.get("/timesheets/", params={"user_id": str(setup["other"])}, headers=user_headers)
+    assert response.status_code == 403
+
+
+def test_items_are_paged_by_date_and_id(client, setup, user_headers):
+    url = f"/timesheets/{setup['timesheets'][0]}/items"
+    pages = _pages(client, url, user_headers, limit=4)
+    filtered = client.get(url, params={"date_from": "2024-01-03"}, headers=user_headers).json()
+
+    assert [len(page) for page in pages] == [4, 4, 1]
+    assert len({row_id for page in pages for row_id in page}) == 9
+    assert [item["date"] for item in filtered] == [f"2024-01-0{day}" for day in range(3, 8)]
+
+
+def test_invalid_or_foreign_cursor_is_rejected(client, setup, user_headers):
+    items = client.get(f"/timesheets/{setup['timesheets'][0]}/items", params={"limit": 1}, headers=user_headers)
+    for cursor in ("no-es-un-cursor", items.headers["X-Next-Cursor"]):
+        response = client.get("/timesheets/", params={"cursor": cursor}, headers=user_headers)
+        assert response.status_code == 400
+
+
+def test_deep_pages_seek_on_the_index(client, engine):
+    with engine.connect() as connection:
+        plan = " ".join(
+            row[-1]
+            for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT id FROM timesheet_header "
+                "WHERE (period_start, id) > (?, ?) ORDER BY period_start, id LIMIT 101",
+                ("2024-06-01", "x"),
+            )
+        )
+    assert "ix_timesheet_header_period_id" in plan
+    assert "TEMP B-TREE" not in plan
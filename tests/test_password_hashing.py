@@ -0,0 +1,92 @@
+import hashlib
+import threading
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core import hashing, security
+from app.core.errors import ServiceUnavailableException
+from app.core.hashing import HashingPool, check_password, hash_password, needs_rehash
+from app.schemas import UserCreate
+
+
+def test_hash_roundtrip_through_pool():
+    pool = HashingPool("thread", workers=1, max_queue=1)
+    hashed = pool.run("hash", hash_password, "secret123")
+    assert pool.run("verify", check_password, "secret123", hashed) is True
+    assert pool.run("verify", check_password, "wrong", hashed) is False
+
+    stats = pool.stats()
+    assert stats["latency"]["hash"]["count"] == 1
+    assert stats["latency"]["verify"]["count"] == 2
+    pool.shutdown()
+
+
+def test_saturated_pool_rejects_without_queueing():
+    pool = HashingPool("thread", workers=1, max_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def _blocking() -> bool:
+        started.set()
+        release.wait(timeout=5)
+        return True
+
+    worker = threading.Thread(target=pool.run, args=("verify", _blocking))
+    worker.start()
+    assert started.wait(timeout=5)
+
+    with pytest.raises(ServiceUnavailableException):
+        pool.run("verify", check_password, "secret123", "salt$hash")
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+    worker.join()
+    pool.shutdown()
+
+
+def test_login_returns_503_when_hashing_is_saturated(client, create_user, user_payload, monkeypatch):
+    create_user(user_payload)
+    saturated = HashingPool("thread", workers=0, max_queue=0)
+    saturated._slots.acquire()
+    monkeypatch.setattr(security, "hashing_pool", saturated)
+
+    response = client.post(
+        "/auth/login", data={"username": user_payload["email"], "password": user_payload["password"]}
+    )
+    assert response.status_code == 503
+
+
+def test_versioned_hash_records_algorithm_and_cost():
+    hashed = hash_password("secret123", iterations=2000)
+    algorithm, iterations, _salt, _digest = hashed.split("$")
+    assert (algorithm, iterations) == ("pbkdf2_sha256", "2000")
+    assert check_password("secret123", hashed)
+    assert needs_rehash(hashed) is (hashing.PASSWORD_HASH_ITERATIONS != 2000)
+
+
+def test_legacy_hash_is_verified_and_upgraded_on_login(client, engine, user_payload):
+    salt = "legacysalt"
+    digest = hashlib.pbkdf2_hmac("sha256", user_payload["password"].encode(), salt.encode(), 100_000)
+    legacy_hash = f"{salt}${hashing._b64encode(digest)}"
+    assert check_password(user_payload["password"], legacy_hash)
+    assert needs_rehash(legacy_hash)
+
+    with Session(engine) as session:
+        user = crud.create_user(session, UserCreate(**user_payload), legacy_hash)
+        user_id = user.id
+
+    response = client.post(
+        "/auth/login", data={"username": user_payload["email"], "password": user_payload["password"]}
+    )
+    assert response.status_code == 200
+
+    with Session(engine) as session:
+        stored = crud.get_user(session, user_id).hashed_password
+    assert stored.startswith(f"pbkdf2_sha256${hashing.PASSWORD_HASH_ITERATIONS}$")
+    assert not needs_rehash(stored)
+
+
+def test_calibration_returns_a_usable_iteration_count():
+    iterations = hashing.calibrate_iterations(0.001, sample_iterations=1000)
+    assert iterations >= hashing.MIN_ITERATIONS
@@ -0,0 +1,87 @@
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.core.cache import PrincipalCache, TTLCache, principal_cache
+from app.models import UserStatus
+
+
+def test_repeated_requests_hit_principal_cache(client, auth_headers):
+    first = client.get("/auth/me", headers=auth_headers)
+    assert first.status_code == 200
+    misses_after_first = principal_cache.stats()["misses"]
+
+    for _ in range(3):
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == first.json()
+
+    stats = principal_cache.stats()
+    assert stats["misses"] == misses_after_first
+    assert stats["hits"] >= 3
+
+
+def test_role_change_evicts_cached_principal(client, auth_headers, user_headers, user_payload):
+    assert client.get("/accounts/", headers=user_headers).status_code == 403
+
+    users = client.get("/users/", headers=auth_headers).json()
+    user_id = next(user["id"] for user in users if user["email"] == user_payload["email"])
+    update_resp = client.patch(f"/users/{user_id}", json={"role": "admin"}, headers=auth_headers)
+    assert update_resp.status_code == 200
+
+    # El cambio de rol invalida los tokens emitidos; el nuevo login ya refleja el rol.
+    assert client.get("/accounts/", headers=user_headers).status_code == 401
+    token = client.post(
+        "/auth/login", data={"username": user_payload["email"], "password": user_payload["password"]}
+    ).json()["access_token"]
+    assert client.get("/accounts/", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+
+def test_invalidation_discards_stale_concurrent_reads():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    user_id = uuid4()
+    version = cache.version(user_id)
+    cache.invalidate(user_id)
+    cache.set(user_id, {"role": "user"}, version)
+    assert cache.get(user_id) is None
+
+    cache.set(user_id, {"role": "admin"}, cache.version(user_id))
+    assert cache.get(user_id) == {"role": "admin"}
+
+
+def test_metrics_expose_principal_cache_counters(client, auth_headers):
+    client.get("/auth/me", headers=auth_headers)
+    response = client.get("/metrics/", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()["principal_cache"]
+    assert {"hits", "misses", "size", "hit_ratio"} <= body.keys()
+
+
+def test_ttl_cache_expires_and_bounds_entries():
+    now = [0.0]
+    cache = TTLCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+    now[0] = 11
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cached_principal_keeps_user_status(client, engine, create_user, user_payload):
+    with Session(engine) as session:
+        session.add(UserStatus(id=1, status_name="Active"))
+        session.commit()
+    create_user(user_payload)
+    token = client.post(
+        "/auth/login", data={"username": user_payload["email"], "password": user_payload["password"]}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/auth/me", headers=headers).json()
+    cached = client.get("/auth/me", headers=headers).json()
+    assert first["status"] == {"id": 1, "status_name": "Active"}
+    assert cached == first
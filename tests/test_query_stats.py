@@ -0,0 +1,35 @@
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.core import query_stats
+from app.core.query_stats import RequestQueryStats, query_stats_monitor
+from app.crud import statements
+
+
+def test_responses_report_query_count_and_db_time(client, auth_headers):
+    query_stats_monitor.reset()
+    response = client.get("/users/", headers=auth_headers)
+    assert response.status_code == 200
+
+    assert int(response.headers["X-DB-Queries"]) > 0
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+    assert response.headers["X-DB-N-Plus-One"] == "0"
+    assert query_stats_monitor.stats()["requests"] == 1
+
+
+def test_repeated_statement_is_flagged_as_n_plus_one(client, engine):
+    stats = RequestQueryStats()
+    token = query_stats._current.set(stats)
+    try:
+        with Session(engine) as session:
+            for n in range(3):
+                session.exec(statements.USER_BY_EMAIL, params={"email": f"u{n}@example.com"}).first()
+            session.exec(statements.TIMESHEET_BY_ID, params={"timesheet_id": uuid4()}).first()
+    finally:
+        query_stats._current.reset(token)
+
+    assert stats.count == 4
+    candidates = stats.n_plus_one(threshold=3)
+    assert len(candidates) == 1
+    assert "FROM user" in candidates[0][0] and candidates[0][1] == 3
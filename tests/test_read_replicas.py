@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from sqlmodel import SQLModel, create_engine
+
+from app.core import replicas
+
+
+@pytest.fixture
+def replica_router(client, tmp_path, monkeypatch):
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(replica_engine)
+    current = replicas.replica_router
+    router = replicas.ReplicaRouter(
+        current.primary,
+        [replica_engine],
+        max_lag_seconds=5,
+        read_your_writes_seconds=0.3,
+        async_primary=current.async_primary,
+    )
+    router.refresh()
+    monkeypatch.setattr(replicas, "replica_router", router)
+    yield router
+    replica_engine.dispose()
+
+
+def _list_timesheets(client, headers):
+    response = client.get("/timesheets/", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create_timesheet(client, headers):
+    payload = {"period_start": "2024-01-01", "period_end": "2024-01-07"}
+    response = client.post("/timesheets/", json=payload, headers=headers)
+    assert response.status_code == 201
+    assert replicas.PRIMARY_COOKIE in response.cookies
+
+
+def test_reads_go_to_primary_right_after_a_write_then_to_the_replica(client, user_headers, replica_router):
+    _create_timesheet(client, user_headers)
+    assert len(_list_timesheets(client, user_headers)) == 1
+
+    time.sleep(0.35)
+    client.cookies.clear()
+    # La réplica (vacía) no tiene aún el parte recién creado.
+    assert _list_timesheets(client, user_headers) == []
+    assert replica_router.stats()["routed"]["replica"] == 1
+
+
+def test_lagging_or_unhealthy_replica_falls_back_to_primary(client, user_headers, replica_router):
+    _create_timesheet(client, user_headers)
+    time.sleep(0.35)
+    client.cookies.clear()
+
+    replica_router.lag_probe = lambda connection: 60.0
+    replica_router.refresh()
+    assert len(_list_timesheets(client, user_headers)) == 1
+
+    def broken(connection):
+        raise RuntimeError("replica down")
+
+    replica_router.lag_probe = broken
+    replica_router.refresh()
+    assert len(_list_timesheets(client, user_headers)) == 1
+    assert replica_router.stats()["replicas"][0]["healthy"] is False
+
+
+def test_read_only_session_refuses_commit(engine):
+    with replicas.ReadOnlySession(engine) as session:
+        with pytest.raises(RuntimeError):
+            session.commit()
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.database import SlowQueryLog, normalize_sql, parameter_shapes
+
+
+def test_normalize_sql_collapses_whitespace_and_in_lists():
+    statement = "SELECT id\n  FROM user\n WHERE id IN (?, ?, ?) AND email = :email"
+    assert normalize_sql(statement) == "SELECT id FROM user WHERE id IN (?...) AND email = :email"
+    assert parameter_shapes({"email": "user@example.com", "limit": 5}) == {"email": "str", "limit": "int"}
+    assert parameter_shapes([(1, "a"), (2, "b")], executemany=True) == {"rows": 2, "row": ["int", "str"]}
+
+
+def test_slow_statements_are_logged_with_their_crud_caller(caplog):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    slow_log = SlowQueryLog(threshold_ms=0, explain=True)
+    slow_log.attach(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"), Session(engine) as session:
+        crud.get_by_email(session, "user@example.com")
+
+    record = caplog.records[-1].slow_query
+    assert record["caller"] == "app.crud.users.get_by_email"
+    assert record["parameters"] == ["str"]
+    assert "\n" not in record["statement"]
+    # EXPLAIN ANALYZE solo existe en Postgres.
+    assert slow_log.stats()["slow"] == 1 and slow_log.stats()["explained"] == 0
+
+
+def test_async_callers_are_resolved_across_the_greenlet(tmp_path, caplog):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}"
+    SQLModel.metadata.create_all(create_engine(f"sqlite:///{tmp_path / 'slow.db'}"))
+    async_engine = create_async_engine(url, poolclass=NullPool)
+    slow_log = SlowQueryLog(threshold_ms=0)
+    slow_log.attach(async_engine.sync_engine)
+
+    async def lookup():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            await crud.get_by_email_async(session, "user@example.com")
+        await async_engine.dispose()
+
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        asyncio.run(lookup())
+
+    assert caplog.records[-1].slow_query["caller"] == "app.crud.users.get_by_email_async"
+
+
+def test_failed_statements_do_not_leave_a_stale_start_time():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    slow_log = SlowQueryLog(threshold_ms=0)
+    slow_log.attach(engine)
+
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info["slow_query_start"] == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["slow_query_start"] == []
+
+
+class _RecordingCursor:
+    def __init__(self, executed, fail_on):
+        self.executed = executed
+        self.fail_on = fail_on
+        self.connection = self
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement.split(" (")[0])
+        if statement.startswith(self.fail_on):
+            raise RuntimeError("canceling statement due to statement timeout")
+
+    def fetchall(self):
+        return [("Seq Scan on timesheet_header",)]
+
+    def close(self):
+        pass
+
+
+def test_explain_failures_are_rolled_back_to_a_savepoint(tmp_path):
+    slow_log = SlowQueryLog(threshold_ms=0, plan_file=str(tmp_path / "plans.log"))
+    fields = {"duration_ms": 1.0, "caller": "?", "statement": "SELECT 1"}
+
+    executed: list[str] = []
+    slow_log._explain(_RecordingCursor(executed, fail_on="EXPLAIN"), "SELECT 1", {}, fields)
+    assert executed == [
+        "SAVEPOINT slow_query_explain",
+        "EXPLAIN",
+        "ROLLBACK TO SAVEPOINT slow_query_explain",
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+    assert slow_log.stats()["explain_errors"] == 1
+
+    executed.clear()
+    slow_log._explain(_RecordingCursor(executed, fail_on="-"), "SELECT 1", {}, fields)
+    assert executed == ["SAVEPOINT slow_query_explain", "EXPLAIN", "RELEASE SAVEPOINT slow_query_explain"]
+    assert slow_log.stats()["explained"] == 1
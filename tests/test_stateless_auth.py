@@ -0,0 +1,74 @@
+import pytest
+
+from app.core import security
+from app.core.cache import principal_cache
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(security, "STATELESS_AUTH", True)
+
+
+def _login(client, payload):
+    response = client.post("/auth/login", data={"username": payload["email"], "password": payload["password"]})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_access_token_carries_authorization_claims(client, create_user, user_payload):
+    user = create_user(user_payload)
+    payload = security.decode_token(_login(client, user_payload)["access_token"])
+    assert payload["role"] == "user"
+    assert payload["ver"] == 0
+    assert payload["sub"] == str(user.id)
+
+
+def test_stateless_guard_authorizes_from_cached_version(client, stateless, user_headers, monkeypatch):
+    assert client.get("/timesheets/", headers=user_headers).status_code == 200
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("la guardia no debería cargar el usuario")
+
+    monkeypatch.setattr(security, "_restore_principal", _fail)
+    monkeypatch.setattr(security.crud, "get_user", _fail)
+    assert client.get("/timesheets/", headers=user_headers).status_code == 200
+    assert client.get("/accounts/", headers=user_headers).status_code == 403
+
+
+def test_logout_everywhere_invalidates_access_and_refresh_tokens(client, stateless, create_user, user_payload):
+    create_user(user_payload)
+    tokens = _login(client, user_payload)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/timesheets/", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout-all", headers=headers).status_code == 204
+
+    assert client.get("/timesheets/", headers=headers).status_code == 401
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    refresh = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refresh.status_code == 401
+
+    fresh = _login(client, user_payload)
+    assert security.decode_token(fresh["access_token"])["ver"] == 1
+    assert client.get("/timesheets/", headers={"Authorization": f"Bearer {fresh['access_token']}"}).status_code == 200
+
+
+def test_stateless_guard_checks_version_after_cache_expiry(client, stateless, user_headers):
+    principal_cache.clear()
+    assert client.get("/timesheets/", headers=user_headers).status_code == 200
+
+
+def test_moving_a_user_to_another_account_revokes_its_tokens(client, stateless, create_user, user_payload, auth_headers):
+    user = create_user(user_payload)
+    headers = {"Authorization": f"Bearer {_login(client, user_payload)['access_token']}"}
+    assert client.get("/timesheets/", headers=headers).status_code == 200
+
+    account = client.post("/accounts/", json={"account_id": "ACC2", "name": "Otra cuenta"}, headers=auth_headers)
+    assert account.status_code == 201, account.text
+    response = client.patch(f"/users/{user.id}", json={"account_uuid": account.json()["id"]}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    assert client.get("/timesheets/", headers=headers).status_code == 401
+    fresh = security.decode_token(_login(client, user_payload)["access_token"])
+    assert fresh["acc"] == account.json()["id"]
+    assert fresh["ver"] == 1
@@ -0,0 +1,53 @@
+from datetime import date
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.database import engine_options
+from app.core.security import get_password_hash
+from app.crud import statements
+from app.models import TimesheetItem, UserProjectMembership
+from app.schemas import TimesheetCreate, UserCreate
+
+
+def test_registry_statements_are_built_once_and_keep_their_cache_key():
+    key = statements.TIMESHEET_BY_ID._generate_cache_key()
+    assert statements.TIMESHEET_BY_ID._generate_cache_key() is key
+    assert statements.DAILY_ITEM_HOURS._generate_cache_key() != statements.DAILY_ITEM_HOURS_EXCLUDING._generate_cache_key()
+
+
+def test_cached_statements_bind_current_values(client, engine, user_payload):
+    with Session(engine) as session:
+        user = crud.create_user(session, UserCreate(**user_payload), get_password_hash(user_payload["password"]))
+        assert crud.get_by_email(session, user_payload["email"]).id == user.id
+        assert crud.get_by_email(session, "nobody@example.com") is None
+
+        week = crud.create_timesheet(
+            session, user.id, TimesheetCreate(period_start=date(2024, 1, 1), period_end=date(2024, 1, 7))
+        )
+        assert crud.get_timesheet(session, week.id).id == week.id
+        assert crud.get_timesheet(session, uuid4()) is None
+        assert crud.find_overlapping_timesheet(session, user.id, date(2024, 1, 5), date(2024, 1, 9)).id == week.id
+        assert crud.find_overlapping_timesheet(session, user.id, date(2024, 1, 5), date(2024, 1, 9), week.id) is None
+
+        project_id = uuid4()
+        first, second = (
+            TimesheetItem(header_id=week.id, project_id=project_id, date=date(2024, 1, 2), description="a", hours=3),
+            TimesheetItem(header_id=week.id, project_id=project_id, date=date(2024, 1, 2), description="b", hours=4.5),
+        )
+        session.add_all([first, second, UserProjectMembership(user_id=user.id, project_id=project_id)])
+        session.commit()
+        assert crud.get_membership(session, project_id, user.id).user_id == user.id
+        assert crud.get_membership(session, uuid4(), user.id) is None
+        assert crud.daily_item_hours(session, week.id, date(2024, 1, 2)) == 7.5
+        assert crud.daily_item_hours(session, week.id, date(2024, 1, 2), exclude_id=second.id) == 3
+        assert crud.daily_item_hours(session, week.id, date(2024, 1, 3)) == 0
+
+
+def test_prepare_threshold_only_applies_to_psycopg(monkeypatch):
+    from app.core import database
+
+    monkeypatch.setattr(database, "DB_PREPARE_THRESHOLD", 2)
+    assert engine_options("postgresql+psycopg://u:p@db/app")["connect_args"] == {"prepare_threshold": 2}
+    assert "prepare_threshold" not in engine_options("sqlite:///./app.db")["connect_args"]
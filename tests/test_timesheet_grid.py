@@ -0,0 +1,111 @@
+import pytest
+from sqlmodel import Session, select
+
+from app import crud
+from app.core import unit_of_work
+from app.models import TimesheetItem
+from app.schemas import TimesheetGrid
+from app.services import timesheets as timesheet_service
+
+
+@pytest.fixture
+def setup(draft_timesheet, make_project):
+    owner = draft_timesheet["owner"]
+    projects = [draft_timesheet["project"], make_project("P2", members=[owner]), make_project("P3", members=[owner])]
+    return {**draft_timesheet, "projects": projects, "outsider": make_project("X1")}
+
+
+def _grid(rows):
+    return {
+        "rows": [
+            {
+                "project_id": str(project_id),
+                "description": "trabajo",
+                "hours": {f"2024-01-{day:02d}": hours for day, hours in cells.items()},
+            }
+            for project_id, cells in rows.items()
+        ]
+    }
+
+
+def _put(client, setup, headers, grid):
+    return client.put(f"/timesheets/{setup['timesheet']}/grid", json=grid, headers=headers)
+
+
+def _counts(response):
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return body["created"], body["updated"], body["deleted"]
+
+
+def _cells(engine, setup):
+    with Session(engine) as session:
+        items = session.exec(select(TimesheetItem).where(TimesheetItem.header_id == setup["timesheet"]))
+        return sorted((item.project_id, item.date.day, item.hours) for item in items)
+
+
+def test_unchanged_grid_costs_one_read_and_no_writes(client, engine, setup, user_headers, count_statements):
+    first, second, _ = setup["projects"]
+    grid = _grid({first: {1: 8, 2: 8, 3: 4}, second: {3: 4, 4: 8}})
+    assert _counts(_put(client, setup, user_headers, grid)) == (5, 0, 0)
+
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, setup["owner"])
+        with count_statements() as executed:
+            response = timesheet_service.save_timesheet_grid(
+                session, setup["timesheet"], TimesheetGrid(**grid), user
+            )
+        unit_of_work.complete(session)
+
+    assert (response.created, response.updated, response.deleted) == (0, 0, 0)
+    assert len(response.items) == 5
+    assert executed.verbs == ["SELECT"]
+
+
+def test_changed_grid_applies_only_the_difference(client, engine, setup, user_headers):
+    first, second, third = setup["projects"]
+    _put(client, setup, user_headers, _grid({first: {1: 8, 2: 8}, second: {3: 4}}))
+
+    response = _put(client, setup, user_headers, _grid({first: {1: 8, 2: 6}, third: {5: 2}}))
+
+    assert _counts(response) == (1, 1, 1)
+    assert len(response.json()["items"]) == 3
+    assert _cells(engine, setup) == sorted([(first, 1, 8), (first, 2, 6), (third, 5, 2)])
+
+
+def test_cell_with_several_items_is_kept_or_collapsed(client, engine, setup, user_headers):
+    project_id = setup["projects"][0]
+    for hours in (3, 5):
+        response = client.post(
+            f"/timesheets/{setup['timesheet']}/items",
+            json={"project_id": str(project_id), "date": "2024-01-02", "description": "trabajo", "hours": hours},
+            headers=user_headers,
+        )
+        assert response.status_code == 201
+
+    assert _counts(_put(client, setup, user_headers, _grid({project_id: {2: 8}}))) == (0, 0, 0)
+
+    assert _counts(_put(client, setup, user_headers, _grid({project_id: {2: 6}})))[1:] == (1, 1)
+    assert _cells(engine, setup) == [(project_id, 2, 6)]
+
+
+def test_invalid_cells_reject_the_whole_grid(client, engine, setup, user_headers):
+    project_id = setup["projects"][0]
+    response = _put(client, setup, user_headers, _grid({project_id: {1: 20, 9: 2}, setup["outsider"]: {1: 8}}))
+
+    assert response.status_code == 400
+    details = response.json()["details"]
+    assert sorted(detail["status_code"] for detail in details) == [400, 400, 403]
+    assert {"date": "2024-01-01", "status_code": 400, "message": "El total de horas por día no puede exceder 24"} in details
+    assert _cells(engine, setup) == []
+
+
+@pytest.mark.parametrize("cells", [None, {2: 4}], ids=["unchanged", "changed"])
+def test_grid_on_a_submitted_timesheet_is_rejected_even_without_changes(client, setup, user_headers, cells):
+    assert client.post(f"/timesheets/{setup['timesheet']}/submit", headers=user_headers).status_code == 200
+
+    rows = {setup["projects"][0]: cells} if cells else {}
+    response = _put(client, setup, user_headers, _grid(rows))
+    assert response.status_code == 400
+    assert response.json()["message"] == "Solo puedes modificar ítems cuando el parte está en Draft"
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app import crud
+from app.core import unit_of_work
+from app.core.errors import BusinessRuleException
+from app.schemas import TimesheetCreate
+from app.services import timesheets as timesheet_service
+
+
+def _week(start_day: int, end_day: int) -> dict:
+    return {"period_start": f"2024-01-{start_day:02d}", "period_end": f"2024-01-{end_day:02d}"}
+
+
+def test_database_rejects_overlapping_periods(engine, owner):
+    with Session(engine) as session:
+        crud.create_timesheet(session, owner, TimesheetCreate(**_week(1, 7)))
+        with pytest.raises(IntegrityError) as exc_info:
+            crud.create_timesheet(session, owner, TimesheetCreate(**_week(7, 13)))
+        assert crud.is_overlap_violation(exc_info.value)
+
+
+def test_create_detects_overlap_without_a_select(engine, owner, count_statements):
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, owner)
+        timesheet_service.create_timesheet(session, user, TimesheetCreate(**_week(1, 7)))
+
+        with count_statements() as executed, pytest.raises(BusinessRuleException):
+            timesheet_service.create_timesheet(session, user, TimesheetCreate(**_week(3, 9)))
+
+    assert "SELECT" not in executed.verbs
+
+
+def test_overlapping_create_returns_business_rule_error(client, user_headers):
+    assert client.post("/timesheets/", json=_week(1, 7), headers=user_headers).status_code == 201
+
+    response = client.post("/timesheets/", json=_week(3, 9), headers=user_headers)
+    assert response.status_code == 400
+    assert response.json()["message"] == "Ya existe un parte de horas para ese periodo"
+
+
+def test_update_maps_overlap_and_allows_status_changes(client, user_headers):
+    first = client.post("/timesheets/", json=_week(1, 7), headers=user_headers).json()
+    second = client.post("/timesheets/", json=_week(8, 14), headers=user_headers).json()
+
+    response = client.put(f"/timesheets/{second['id']}", json={"period_start": "2024-01-06"}, headers=user_headers)
+    assert response.status_code == 400
+    assert response.json()["message"] == "El periodo se solapa con otro parte de horas"
+
+    response = client.put(f"/timesheets/{second['id']}", json={"period_start": "2024-01-09"}, headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["period_start"] == "2024-01-09"
+
+    response = client.post(f"/timesheets/{first['id']}/submit", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["timesheet"]["status"] == "Submitted"
@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.services import timesheets as timesheet_service
+
+
+@pytest.fixture
+def setup(owner, make_project, make_timesheet):
+    first, second = make_project("P1"), make_project("P2")
+    cells = [(first, 1, 4), (first, 1, 2.5), (second, 1, 1.5), (second, 2, 8), (first, 3, 7.25)]
+    timesheets = [
+        make_timesheet(owner, items=[(project, date(2024, 1, day), hours) for project, day, hours in cells]),
+        make_timesheet(owner, date(2024, 1, 8)),
+        make_timesheet(owner, date(2024, 1, 15), items=[(second, date(2024, 1, 15), 3)]),
+    ]
+    return {"owner": owner, "projects": [first, second], "timesheets": timesheets}
+
+
+def _list(client, headers, **params):
+    response = client.get("/timesheets/", params={"include_totals": True, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_totals_come_from_a_single_query(engine, setup, count_statements):
+    with Session(engine) as session:
+        owner = crud.get_user(session, setup["owner"])
+        with count_statements() as executed:
+            summaries, cursor = timesheet_service.page_timesheet_summaries(session, owner)
+
+    assert len(executed) == 1
+    assert "LEFT OUTER JOIN timesheet_item" in executed[0]
+    assert cursor is None
+    assert [summary.id for summary in summaries] == setup["timesheets"]
+
+
+def test_list_endpoint_includes_totals_on_request(client, setup, user_headers):
+    plain = client.get("/timesheets/", headers=user_headers).json()
+    assert all(timesheet["totals"] is None for timesheet in plain)
+
+    summaries = _list(client, user_headers).json()
+    assert [summary["id"] for summary in summaries] == [str(row_id) for row_id in setup["timesheets"]]
+
+    first, second = (str(project_id) for project_id in setup["projects"])
+    totals = summaries[0]["totals"]
+    assert totals["total_hours"] == 23.25
+    assert totals["item_count"] == 5
+    assert totals["daily_totals"] == {"2024-01-01": 8, "2024-01-02": 8, "2024-01-03": 7.25}
+    assert set(totals["project_ids"]) == {first, second}
+
+    assert summaries[1]["totals"]["item_count"] == 0
+    assert summaries[1]["totals"]["daily_totals"] == {}
+    assert summaries[2]["totals"]["project_ids"] == [second]
+
+
+def test_page_limit_counts_timesheets_not_joined_rows(client, setup, user_headers):
+    page = _list(client, user_headers, limit=2)
+    rest = _list(client, user_headers, limit=2, cursor=page.headers["X-Next-Cursor"])
+
+    timesheets = [str(row_id) for row_id in setup["timesheets"]]
+    assert [summary["id"] for summary in page.json()] == timesheets[:2]
+    assert [summary["id"] for summary in rest.json()] == timesheets[2:]
+    assert "X-Next-Cursor" not in rest.headers
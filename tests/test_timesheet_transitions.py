@@ -0,0 +1,90 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core import unit_of_work
+from app.core.errors import AuthorizationException, BusinessRuleException
+from app.services import timesheets as timesheet_service
+
+
+@pytest.fixture
+def setup(auth_headers, owner, make_project, make_timesheet):
+    project = make_project("P1")
+    return {"owner": owner, "timesheet": make_timesheet(owner, items=[(project, date(2024, 1, 2), 8)])}
+
+
+def _run(engine, user_id, action, timesheet_id):
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, user_id)
+        response = timesheet_service.transition_timesheet(session, action, timesheet_id, user)
+        unit_of_work.complete(session)
+        return response
+
+
+def test_transition_is_a_single_conditional_update(engine, setup, count_statements):
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        user = crud.get_user(session, setup["owner"])
+        with count_statements() as executed:
+            response = timesheet_service.transition_timesheet(session, "submit", setup["timesheet"], user)
+        unit_of_work.complete(session)
+
+    assert executed.verbs == ["UPDATE"]
+    assert response.timesheet.status == "Submitted"
+    assert response.timesheet.updated_at is not None
+
+
+def test_items_are_returned_only_on_request(client, setup, user_headers, auth_headers):
+    response = client.post(f"/timesheets/{setup['timesheet']}/submit", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["timesheet"]["items"] == []
+
+    response = client.post(
+        f"/timesheets/{setup['timesheet']}/approve", params={"include_items": True}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["timesheet"]["status"] == "Approved"
+    assert [item["hours"] for item in response.json()["timesheet"]["items"]] == [8]
+
+
+def test_stale_read_cannot_overwrite_a_concurrent_transition(engine, setup, admin_payload):
+    _run(engine, setup["owner"], "submit", setup["timesheet"])
+
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        admin = crud.get_by_email(session, admin_payload["email"])
+        # Esta sesión ya vio el parte en Submitted antes de que otro lo aprobara.
+        assert crud.get_timesheet_header(session, setup["timesheet"]).status == "Submitted"
+        _run(engine, admin.id, "approve", setup["timesheet"])
+
+        with pytest.raises(BusinessRuleException) as exc_info:
+            timesheet_service.reject_timesheet(session, setup["timesheet"], admin)
+        assert exc_info.value.status_code == 409
+
+    with Session(engine) as session:
+        assert crud.get_timesheet_header(session, setup["timesheet"]).status == "Approved"
+
+
+def test_role_check_runs_before_any_statement(engine, setup, count_statements):
+    with Session(engine) as session:
+        user = crud.get_user(session, setup["owner"])
+        with count_statements() as executed, pytest.raises(AuthorizationException):
+            timesheet_service.transition_timesheet(session, "approve", setup["timesheet"], user)
+    assert executed == []
+
+
+def test_failed_transitions_report_the_original_errors(client, setup, user_headers, auth_headers):
+    response = client.post(f"/timesheets/{uuid4()}/submit", headers=user_headers)
+    assert response.status_code == 404
+    response = client.post(f"/timesheets/{setup['timesheet']}/submit", headers=auth_headers)
+    assert response.status_code == 403
+    response = client.post(f"/timesheets/{setup['timesheet']}/approve", headers=user_headers)
+    assert response.status_code == 403
+
+    response = client.post(f"/timesheets/{setup['timesheet']}/approve", headers=auth_headers)
+    assert response.status_code == 409
+    assert response.json()["message"] == "Solo puedes aprobar partes en estado Submitted"
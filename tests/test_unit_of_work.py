@@ -0,0 +1,66 @@
+from datetime import date
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app import crud
+from app.core import unit_of_work
+from app.core.cache import principal_cache
+from app.models import TimesheetHeader
+from app.schemas import TimesheetCreate, UserUpdate
+from app.services import timesheets as timesheet_service
+
+
+def test_submit_flushes_once_and_commits_at_the_boundary(engine, owner, make_timesheet, count_statements):
+    timesheet_id = make_timesheet(owner)
+    commits: list[bool] = []
+
+    def record_commit(conn):
+        commits.append(True)
+
+    event.listen(engine, "commit", record_commit)
+    try:
+        with count_statements() as executed, Session(engine) as session:
+            unit_of_work.begin(session)
+            current_user = crud.get_user(session, owner)
+            response = timesheet_service.submit_timesheet(session, timesheet_id, current_user)
+            assert commits == []
+            unit_of_work.complete(session)
+    finally:
+        event.remove(engine, "commit", record_commit)
+
+    assert response.timesheet.status == "Submitted"
+    assert response.timesheet.updated_at is not None
+    assert commits == [True]
+    # Nada de SELECT tras el UPDATE: updated_at vuelve por RETURNING.
+    assert executed.verbs[-1] == "UPDATE"
+
+
+def test_unit_of_work_discards_changes_when_not_completed(engine, owner):
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        crud.create_timesheet(
+            session, owner, TimesheetCreate(period_start=date(2024, 1, 1), period_end=date(2024, 1, 7))
+        )
+
+    with Session(engine) as session:
+        assert session.exec(select(TimesheetHeader)).all() == []
+
+
+def test_principal_cache_is_invalidated_only_after_commit(engine, owner, monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(principal_cache, "invalidate", invalidated.append)
+
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        crud.update_user(session, crud.get_user(session, owner), UserUpdate(role="admin"))
+        assert invalidated == []
+        unit_of_work.complete(session)
+    assert invalidated == [owner]
+
+    with Session(engine) as session:
+        unit_of_work.begin(session)
+        crud.update_user(session, crud.get_user(session, owner), UserUpdate(role="user"))
+        session.rollback()
+        unit_of_work.complete(session)
+    assert invalidated == [owner]